@@ -7,6 +7,12 @@
      Revision history:
      14 March 2016  |  1.0 - initial release
      15 March 2016  |  1.1 - Added exception handling and fixed logic errors
+     17 October 2026  |  1.2 - REST backend, the default; the SDK is imported only when backend is sdk
+     17 October 2026  |  1.3 - update_LTM modifies only the attributes which differ, nodes reconciles a list of nodes
+     17 October 2026  |  1.4 - REST from ansible.module_utils, the SDK is the default again unless nodes is specified
+     17 October 2026  |  1.5 - fail, writing no node, when an entry of nodes is not a dictionary with a name
+     17 October 2026  |  1.6 - REST is the default backend, the SDK is imported only when backend is sdk
+     17 October 2026  |  1.7 - nodes may specify a partition, created nodes have the default description
 
  
 """
@@ -20,6 +26,13 @@ short_description: Ansible module demonstrating the use of the F5 Python SDK
 description:
     - This module is a intended to be a demonstration and training module to update an F5 appliance configuration
       from Ansible using the F5 Python SDK
+    - Importing the SDK loads its resource tree, which adds seconds to the start of every task. With backend rest the
+      node is read, created and deleted using iControl REST directly, and the SDK is not imported.
+    - When the node exists and state is present, the description and attributes of the node are compared with the
+      node on the BIG_IP, and only those which differ are modified. The address of a node can not be changed.
+    - When nodes is specified, the nodes of each partition are read in one request and each node of the list is
+      compared locally, only the nodes which are missing, differ or are to be deleted are written.
+    - Descriptions and other text are compared exactly, only booleans without regard to case.
 
 
 references:
@@ -28,6 +41,10 @@ references:
  
 requirements:
     - Python SDK for configuration and monitoring of F5 BigIP devices via the iControl REST API. f5-sdk.readthedocs.org
+      when backend is sdk
+    - ansible-f5/module_utils/icontrol_client.py and icontrol_config.py from https://github.com/joelwking,
+      the REST client when backend is rest and, with either backend, the comparison of the node with the
+      attributes specified. Ansible includes them with the module; requests is only imported by the REST client
 
 options:
     host:
@@ -57,19 +74,45 @@ options:
 
     name:
         description:
-            -  F5 node name
-        required: true
+            -  F5 node name, required unless nodes is specified
+        required: false
 
     address:
         description:
             -  IP address of the F5 node
         required: true
 
+    attributes:
+        description:
+            -  other attributes of the node, e.g. connectionLimit, monitor or ratio
+        required: false
+
+    nodes:
+        description:
+            -  list of nodes, each a dictionary of name, address, description and other attributes, which replaces
+               name, address, description and attributes. Uses backend rest
+            -  a node is in partition unless it specifies its own partition
+            -  a node created without a description has the description of the module
+        required: false
+
+    concurrency:
+        description:
+            -  number of nodes written at a time, when nodes is specified
+        required: false
+        default: 4
+
     state:
         description:
             -  either present or absent, add/update or delete
         required: true
 
+    backend:
+        description:
+            -  rest, using iControl REST directly, or sdk, using the F5 Python SDK
+        required: false
+        default: rest
+        choices: ['rest', 'sdk']
+
 '''
 
 EXAMPLES = '''
@@ -85,10 +128,79 @@ EXAMPLES = '''
         username: admin
         password: "{{password}}"
 
+    - name: F5_sdk_LTM_node reconcile the nodes of a partition
+      F5_sdk_LTM_node:
+        partition: Common
+        state: present
+        nodes:
+          - {name: EasternMudTurtle.example.net, address: 192.0.2.35, description: Kinosternon subrubrum}
+          - {name: SnappingTurtle.example.net, address: 192.0.2.36, description: Chelydra serpentina, ratio: 2}
+        host: "{{hostname}}"
+        username: admin
+        password: "{{password}}"
+
 
 '''
 
-from f5.bigip import BigIP
+import re
+import json
+
+PARTITION = re.compile(r"^[\w.-]+$")                       # a partition is named, not a path
+
+
+def sdk_bigip(host, username, password):
+    "Import the SDK, which loads its whole resource tree, only when it is used"
+    from f5.bigip import BigIP
+    return BigIP(host, username, password)
+
+
+def icontrol():
+    "Import icontrol_config of module_utils, the REST client and the comparison of desired and current state"
+    try:
+        from ansible.module_utils import icontrol_config as iControl
+    except ImportError:                                    # outside Ansible, module_utils is in this directory
+        from module_utils import icontrol_config as iControl
+    return iControl
+
+
+def rest_bigip(host, username, password):
+    "A BIG_IP of module_utils/icontrol_config.py, which imports only requests"
+    return icontrol().BIG_IP(host=host, username=username, password=password)
+
+
+def desired_node(address, description, attributes=None):
+    "The attributes of the node as specified"
+    desired = dict(attributes or {})
+    if address:
+        desired["address"] = address
+    if description is not None:
+        desired["description"] = description
+    return desired
+
+
+def invalid_nodes(nodes):
+    "Return a message for each entry of nodes which is not a dictionary with a name, and a partition if any"
+    messages = []
+    for index, node in enumerate(nodes):
+        if not isinstance(node, dict):
+            messages.append("nodes[%s] is not a dictionary: %s" % (index, node))
+        elif not node.get("name"):
+            messages.append("nodes[%s] has no name: %s" % (index, node))
+        elif "partition" in node and not PARTITION.match("%s" % node["partition"]):
+            messages.append("nodes[%s] has an invalid partition: %s" % (index, node))
+    return messages
+
+
+def node_changes(current, desired):
+    """Return the attributes of desired which differ from the current node, or None if the address differs,
+       the address of a node can not be changed"""
+    iControl = icontrol()
+    desired = dict(desired)
+    address = desired.pop("address", None)
+    if address and not iControl.equivalent(address, current.get("address"), key="address"):
+        return None
+    return iControl.differences(desired, current)
+
 
 class LTM(object):
     "Local Traffic Manager"
@@ -130,17 +242,40 @@ class LTM(object):
             self.failed = 1
         return
 
-    def update_LTM(self, description):
-        "Update the LTM node"
-        # Add logic to update the LTM
-        self.response = "Logic not implemented, update_LTM"
-        self.failed = 1
+    def set_changes(self, current, changes):
+        "Set the response describing the changes, returned by node_changes"
+        if changes is None:
+            self.response = "%s address is %s, the address of a node can not be changed" % (self.name, current.get("address"))
+            self.failed = 1
+        elif changes:
+            self.response = "%s updated: %s" % (self.name, ", ".join(sorted(changes)))
+        else:
+            self.response = "%s is up to date" % (self.name)
         return
 
-    def create_LTM(self, address, description):
+    def update_LTM(self, description, address=None, attributes=None):
+        "Update the LTM node, modifying only the attributes which differ"
+        try:
+            ltm = self.bigip.ltm.nodes.node.load(name=self.name, partition=self.partition)
+            current = getattr(ltm, "raw", ltm.__dict__)
+            changes = node_changes(current, desired_node(address, description, attributes))
+            if changes:
+                if hasattr(ltm, "modify"):
+                    ltm.modify(**changes)                  # PATCH
+                else:
+                    ltm.update(**changes)
+                self.set_changed_flag(True)
+            self.set_changes(current, changes)
+        except Exception as e:
+            self.response = "Exception in update_LTM %s" % (e)
+            self.failed = 1
+        return
+
+    def create_LTM(self, address, description, attributes=None):
         "Create the LTM node"
         try:
-            ltm = self.bigip.ltm.nodes.node.create(name=self.name, partition=self.partition, address=address, description=description)
+            ltm = self.bigip.ltm.nodes.node.create(name=self.name, partition=self.partition, address=address, description=description,
+                                                   **(attributes or {}))
             self.set_changed_flag(True)
             self.response = "%s exists: %s" % (self.name, ltm.exists(name=self.name))
         except Exception as e:
@@ -158,18 +293,147 @@ class LTM(object):
             return False
 
 
+class REST_LTM(LTM):
+    "Local Traffic Manager, using iControl REST rather than the SDK, bigip is a BIG_IP of icontrol_install_config"
+
+    URI = "/mgmt/tm/ltm/node/"
+
+    def __init__(self, bigip, name, partition):
+        LTM.__init__(self, bigip, name, partition)
+        self.current = None                                # the node, when node_exists has read it
+
+    def node_uri(self, name, partition):
+        return "%s~%s~%s" % (REST_LTM.URI, partition, name)
+
+    def delete_LTM(self):
+        "Delete the LTM node"
+        if self.bigip.request("DELETE", self.node_uri(self.name, self.partition)) == 200:
+            self.set_changed_flag(True)
+            self.response = "%s deleted: True" % (self.name)
+        else:
+            self.response = "Exception in delete_LTM  %s %s" % (self.bigip.status_code, self.bigip.response)
+            self.failed = 1
+        return
+
+    def update_LTM(self, description, address=None, attributes=None):
+        "Update the LTM node, a PATCH of only the attributes which differ from the node read by node_exists"
+        if self.current is None:
+            if self.bigip.request("GET", self.node_uri(self.name, self.partition)) != 200:
+                self.response = "Exception in update_LTM %s %s" % (self.bigip.status_code, self.bigip.response)
+                self.failed = 1
+                return
+            self.current = self.bigip.response
+        changes = node_changes(self.current, desired_node(address, description, attributes))
+        if changes:
+            if self.bigip.request("PATCH", self.node_uri(self.name, self.partition), json.dumps(changes)) != 200:
+                self.response = "Exception in update_LTM %s %s" % (self.bigip.status_code, self.bigip.response)
+                self.failed = 1
+                return
+            self.set_changed_flag(True)
+        self.set_changes(self.current, changes)
+        return
+
+    def create_LTM(self, address, description, attributes=None):
+        "Create the LTM node"
+        body = json.dumps(dict(attributes or {}, name=self.name, partition=self.partition, address=address, description=description))
+        if self.bigip.request("POST", REST_LTM.URI, body) == 200:
+            self.set_changed_flag(True)
+            self.response = "%s exists: True" % (self.name)
+        else:
+            self.response = "Exception in create_LTM %s %s" % (self.bigip.status_code, self.bigip.response)
+            self.failed = 1
+        return
+
+    def node_exists(self, name, partition):
+        "Check if the node exists and we have a valid username, hostname and password"
+        status = self.bigip.request("GET", self.node_uri(name, partition))
+        if status == 200:
+            self.current = self.bigip.response
+            return True
+        if status != 404:
+            self.response = "Exception in node_exists %s %s" % (self.bigip.status_code, self.bigip.response)
+            self.failed = 1
+        return False
+
+    def reconcile_nodes(self, nodes, state, concurrency=4, description=None):
+        """Read the nodes of each partition in one collection GET and compare each of the nodes specified locally,
+           then create, PATCH or delete only the nodes which differ. Return a list of the result of each node.
+           A node is in the partition of the module unless it specifies its own, a node created without a
+           description has description, as create_LTM does.
+           No node is written if an entry of nodes is not valid, the nodes specified are not modified"""
+        iControl = icontrol()
+        invalid = invalid_nodes(nodes)
+        if invalid:
+            self.response = "Invalid nodes, %s" % "; ".join(invalid)
+            self.failed = 1
+            return []
+        existing = dict()                                  # keyed by (partition, name)
+        for partition in sorted(set(node.get("partition", self.partition) for node in nodes)):
+            if not self.bigip.genericGET(uri="%s?$filter=partition%%20eq%%20%s" % (REST_LTM.URI, partition)):
+                self.response = "Exception in reconcile_nodes %s %s" % (self.bigip.status_code, self.bigip.response)
+                self.failed = 1
+                return []
+            for node in self.bigip.response.get("items", []):
+                existing[(node.get("partition", partition), node.get("name"))] = node
+
+        results = []
+        writes = []                                        # (result, (uri, body, method)) of the nodes to write
+        for node in nodes:
+            desired = dict(node)                           # a copy, name and partition are removed
+            name = desired.pop("name")
+            partition = desired.pop("partition", self.partition)
+            current = existing.get((partition, name))
+            result = dict(name=name, partition=partition, action="none", changed=False, failed=False)
+            results.append(result)
+            if state == "absent":
+                if current is not None:
+                    result["action"] = "delete"
+                    writes.append((result, (self.node_uri(name, partition), None, "DELETE")))
+            elif current is None:
+                result["action"] = "create"
+                body = dict(desired, name=name, partition=partition)
+                if description is not None:
+                    body.setdefault("description", description)
+                writes.append((result, (REST_LTM.URI, json.dumps(body), "POST")))
+            else:
+                changes = node_changes(current, desired)
+                if changes is None:
+                    result.update(failed=True, msg="address is %s, the address of a node can not be changed" % current.get("address"))
+                elif changes:
+                    result.update(action="update", changes=sorted(changes))
+                    writes.append((result, (self.node_uri(name, partition), json.dumps(changes), "PATCH")))
+
+        applied = iControl.apply_items(self.bigip, [item for result, item in writes], concurrency, strategy="optimistic")
+        for (result, item), outcome in zip(writes, applied):
+            result.update(changed=outcome["changed"], failed=outcome["failed"], status_code=outcome.get("status_code"))
+            if outcome["failed"]:
+                result["msg"] = outcome.get("msg") or outcome.get("content")
+
+        self.set_changed_flag(any(result["changed"] for result in results))
+        actions = [result["action"] for result in results]
+        self.response = "%s nodes: %s created, %s updated, %s deleted, %s unchanged, %s failed" % (
+            len(results), actions.count("create"), actions.count("update"), actions.count("delete"),
+            actions.count("none"), len([result for result in results if result["failed"]]))
+        return results
+
+
 def main():
     "   "
+    from ansible.module_utils.basic import AnsibleModule
     module = AnsibleModule(
         argument_spec = dict(
             host = dict(required=True),
             username = dict(required=True),
             password  = dict(required=True),
             address = dict(required=False),
-            name = dict(required=True),
+            name = dict(required=False),
+            attributes = dict(required=False, type='dict'),
+            nodes = dict(required=False, type='list'),
+            concurrency = dict(default=4, required=False, type='int'),
             description = dict(required=False, default="updated by F5_sdk_LTM_node"),
             state = dict(required=True, choices=['present', 'absent']),
-            partition = dict(default='Common', required=False)
+            partition = dict(default='Common', required=False),
+            backend = dict(default='rest', required=False, choices=['rest', 'sdk'])
          ),
         check_invalid_arguments=False
     )
@@ -178,27 +442,48 @@ def main():
     partition = module.params["partition"]
     description = module.params["description"]
     address = module.params["address"]
+    attributes = module.params["attributes"]
+    nodes = module.params["nodes"]
+    backend = module.params["backend"]
     delete_node = False
 
+    if nodes is None and not name:
+        module.fail_json(msg="name or nodes is required")
+    if nodes is not None and backend != "rest":
+        module.fail_json(msg="nodes requires backend rest")
+
     if module.params["state"]  == "absent":
         # Absent indicates a request to delete the node
         delete_node = True
 
-    bigip = BigIP(module.params["host"], module.params["username"], module.params["password"])
-    obj = LTM(bigip, name, partition)
+    try:
+        if backend == "sdk":
+            bigip = sdk_bigip(module.params["host"], module.params["username"], module.params["password"])
+            obj = LTM(bigip, name, partition)
+        else:
+            bigip = rest_bigip(module.params["host"], module.params["username"], module.params["password"])
+            obj = REST_LTM(bigip, name, partition)
+    except ImportError as e:
+        module.fail_json(msg="backend %s: %s" % (backend, e))
+
 
+    if nodes is not None:
+        results = obj.reconcile_nodes(nodes, module.params["state"], module.params["concurrency"], description)
+        if obj.failure() or any(result["failed"] for result in results):
+            module.fail_json(msg=obj.get_response(), nodes=results)
+        module.exit_json(changed=obj.get_changed_flag(), content=obj.get_response(), nodes=results)
 
     if delete_node:
         if obj.node_exists(name, partition):
             obj.delete_LTM()
-        else:
+        elif not obj.failure():
             obj.set_response("Asked to delete a node which does not exist")
     else:
         #  State is present
         if obj.node_exists(name, partition):
-            obj.update_LTM(description)
-        else:
-            obj.create_LTM(address, description)
+            obj.update_LTM(description, address, attributes)
+        elif not obj.failure():
+            obj.create_LTM(address, description, attributes)
 
 
     if obj.failure():
@@ -209,7 +494,6 @@ def main():
     return
 
 
-from ansible.module_utils.basic import *
 
 if __name__ == '__main__':
     main()
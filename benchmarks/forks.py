@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+#
+"""
+     Copyright (c) 2026 World Wide Technology, Inc.
+     All rights reserved.
+
+     Revision history:
+     17 October 2026  |  1.0 - initial release
+
+     Fork benchmark. Ansible runs a task in forks, separate processes, so with forks: 50 and one BIG_IP
+     every fork sends its requests to the same restjavad. Each fork is a process sending --requests GETs using
+     BIG_IP, at the same time as every other fork, to the mock started with --capacity; directly, and with the
+     governor shared by the forks.
+
+       ok        requests which succeeded, after retries
+       failed    requests which failed after retries
+       503       responses which were a 503, each is retried
+       queued    seconds the forks waited for the governor, in total
+       limit     the requests in flight the governor adapted to, when the run ended
+       baseline  the time to the first byte of the mock within its capacity, as estimated by the governor
+
+     usage:
+       ./forks.py --forks 50 --requests 20 --capacity 8 --latency 0.02
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+MODES = ("direct", "governor")
+URI = "/mgmt/tm/cm/device"
+
+
+def child(args):
+    " Run in each fork, print the outcome of its requests as JSON"
+    sys.path.insert(0, os.path.dirname(HERE))
+    import icontrol_install_config as iControl
+    iControl.BIG_IP.TRANSPORT = args.transport
+    governor = None
+    if args.governor:
+        governor = iControl.Governor(args.governor, max_in_flight=args.max_in_flight, max_rate=args.max_rate)
+    F5 = iControl.BIG_IP(host=args.host, username="admin", password="admin", pool_size=1,
+                         metrics=iControl.Metrics(keep=True), retry=iControl.Retry(retries=args.retries),
+                         governor=governor)
+    latencies = []
+    ok = 0
+    for _ in range(args.requests):
+        start = time.time()
+        ok += F5.request("GET", URI) == 200
+        latencies.append(time.time() - start)
+    summary = F5.metrics.summary()
+    print(json.dumps(dict(ok=ok, latencies=latencies, retries=summary["retries"], queued=summary["queued"],
+                          overloaded=sum(entry.get("status") == 503 for entry in summary["entries"]))))
+
+
+def percentile(values, percent):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[int(round(percent / 100.0 * (len(values) - 1)))]
+
+
+def run(args, host, transport, governor):
+    " Start every fork at once, return their results and the elapsed time"
+    command = [sys.executable, os.path.abspath(__file__), "--child", "--host", host, "--transport", transport,
+               "--requests", str(args.requests), "--retries", str(args.retries),
+               "--max-in-flight", str(args.max_in_flight), "--max-rate", str(args.max_rate)]
+    if governor:
+        command += ["--governor", governor]
+    start = time.time()
+    forks = [subprocess.Popen(command, stdout=subprocess.PIPE) for _ in range(args.forks)]
+    results = [json.loads(fork.communicate()[0].decode("utf-8").strip().splitlines()[-1]) for fork in forks]
+    return results, time.time() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="concurrent forks benchmark")
+    parser.add_argument("--forks", default=50, type=int)
+    parser.add_argument("--requests", default=20, type=int, help="requests sent by each fork")
+    parser.add_argument("--capacity", default=8, type=int, help="requests the mock processes at a time")
+    parser.add_argument("--latency", default=0.02, type=float, help="latency of the mock within its capacity")
+    parser.add_argument("--retries", default=3, type=int)
+    parser.add_argument("--max-in-flight", default=10, type=int)
+    parser.add_argument("--max-rate", default=50.0, type=float)
+    parser.add_argument("--modes", default=",".join(MODES))
+    parser.add_argument("--json", help="append the results, one JSON object per line, to this file")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--host", help=argparse.SUPPRESS)
+    parser.add_argument("--transport", default="http://", help=argparse.SUPPRESS)
+    parser.add_argument("--governor", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args)
+        return
+
+    sys.path.insert(0, os.path.dirname(HERE))
+    from module_utils.icontrol_client import Governor
+    print("%-9s %6s %9s %6s %7s %6s %8s %9s %8s %8s %8s %6s %9s" % (
+          "mode", "forks", "requests", "ok", "failed", "503", "retries", "queued s", "wall s", "ok/s",
+          "p99 ms", "limit", "baseline"))
+    for mode in args.modes.split(","):
+        process = subprocess.Popen([sys.executable, os.path.join(HERE, "mock_icontrol.py"), "--port", "0",
+                                    "--capacity", str(args.capacity), "--latency", str(args.latency)],
+                                   stdout=subprocess.PIPE)
+        host = "127.0.0.1:%s" % int(process.stdout.readline())
+        governor = os.path.join(tempfile.mkdtemp(), "governor.json") if mode == "governor" else None
+        try:
+            results, elapsed = run(args, host, "http://", governor)
+        finally:
+            process.terminate()
+            process.wait()
+
+        latencies = [latency for result in results for latency in result["latencies"]]
+        ok = sum(result["ok"] for result in results)
+        result = dict(workload="forks", mode=mode, forks=args.forks, requests=len(latencies), ok=ok,
+                      failed=len(latencies) - ok, overloaded=sum(r["overloaded"] for r in results),
+                      retries=sum(r["retries"] for r in results),
+                      queued=round(sum(r["queued"] for r in results), 3), elapsed=round(elapsed, 3),
+                      ok_per_second=round(ok / elapsed, 1), p99_ms=round(percentile(latencies, 99) * 1000, 1),
+                      limit="", baseline="")
+        if governor:
+            result.update(Governor(governor).summary(host))
+        print("%(mode)-9s %(forks)6d %(requests)9d %(ok)6d %(failed)7d %(overloaded)6d %(retries)8d %(queued)9.1f "
+              "%(elapsed)8.2f %(ok_per_second)8.1f %(p99_ms)8.1f %(limit)6s %(baseline)9s" % result)
+        if args.json:
+            with open(args.json, "a") as output:
+                output.write(json.dumps(dict(result, timestamp=time.time())) + "\n")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,581 @@
+#!/usr/bin/env python
+#
+"""
+     Copyright (c) 2026 World Wide Technology, Inc.
+     All rights reserved.
+
+     Revision history:
+     17 October 2026  |  1.0 - initial release
+     17 October 2026  |  1.1 - service status and a simulated reboot, for the readiness checks of bigip_check
+     17 October 2026  |  1.2 - asynchronous save of the config using the task API
+     17 October 2026  |  1.3 - UCS archives, chunked download and sha256sum using util bash
+     17 October 2026  |  1.4 - chunked upload, in any order, by Content-Range
+     17 October 2026  |  1.5 - tokens are checked and can be revoked, as the connection broker refreshes them
+     17 October 2026  |  1.6 - capacity of restjavad, the latency grows beyond it and requests are rejected
+     17 October 2026  |  1.7 - the names of the services are padded, as in 'show sys service' of a BIG_IP
+     17 October 2026  |  1.8 - the content of a UCS archive differs on each save
+     17 October 2026  |  1.9 - the mock keeps answering for --reboot-delay seconds before the reboot begins
+
+     A local, stateful mock of the iControl REST endpoints used by the modules in this repository,
+     so their performance can be measured without an appliance.
+
+       ltm node, pool (and members), virtual      /mgmt/tm/ltm/...
+       gtm pool (and members), wideip             /mgmt/tm/gtm/...
+       sys config save and reboot                 /mgmt/tm/sys/config
+       sys config save task                       /mgmt/tm/task/sys/config
+       sys service status                         /mgmt/tm/sys/service/stats
+       sys ucs save                               /mgmt/tm/sys/ucs
+       UCS download, by Content-Range             /mgmt/shared/file-transfer/ucs-downloads
+       upload, by Content-Range                   /mgmt/shared/file-transfer/uploads
+       util bash, sha256sum of a file only        /mgmt/tm/util/bash
+       cm device                                  /mgmt/tm/cm/device
+       authentication tokens                      /mgmt/shared/authn/login
+       revoke a token                             /mgmt/shared/authz/tokens/<token>
+       transactions                               /mgmt/tm/transaction
+
+     Collections honor $top, $skip (returning a nextLink), $select and a simple $filter of the
+     form "property eq value". Latency and errors (503, as returned by restjavad under load) can
+     be injected on every request. After a reboot, the mock keeps answering for --reboot-delay seconds, as
+     a BIG_IP does while it shuts down, then restjavad answers 503 for the first half of --boot-time and
+     tmm is down for the second half, then the mock is ready again.
+
+     With --capacity, restjavad processes that many requests at a time at the injected latency. Beyond it the
+     latency grows with the square of the load, and beyond OVERLOAD times the capacity requests are answered
+     with a 503, so the throughput falls when the mock is pushed past its capacity, as restjavad does.
+
+     usage:
+       ./mock_icontrol.py --port 8443 --latency 0.005 --error-rate 0.01 --page-limit 500
+       ./mock_icontrol.py --port 8443 --certfile cert.pem --keyfile key.pem      # HTTPS
+
+     The port is written to stdout on startup, use --port 0 to pick a free port.
+"""
+
+import re
+import ssl
+import sys
+import json
+import time
+import random
+import hashlib
+import argparse
+import threading
+from collections import OrderedDict
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+    from urllib.parse import urlsplit, parse_qs
+except ImportError:                                        # Python 2
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+    from urlparse import urlsplit, parse_qs
+
+COLLECTIONS = ("/mgmt/tm/ltm/node",
+               "/mgmt/tm/ltm/pool",
+               "/mgmt/tm/ltm/virtual",
+               "/mgmt/tm/gtm/pool",
+               "/mgmt/tm/gtm/wideip")
+
+SERVICES = ("alertd", "bigd", "mcpd", "restjavad", "tmm")
+OVERLOAD = 2.0                                             # load, relative to --capacity, beyond which requests get a 503
+
+SUBCOLLECTION = re.compile(r"^(/mgmt/tm/(?:ltm|gtm)/pool)/([^/]+)/members$")
+
+DEVICE = {"kind": "tm:cm:device:devicestate",
+          "name": "bigip1.example.net",
+          "partition": "Common",
+          "fullPath": "/Common/bigip1.example.net",
+          "version": "12.1.2",
+          "build": "0.0.249",
+          "marketingName": "BIG-IP Virtual Edition",
+          "platformId": "Z100",
+          "chassisId": "420a8f9e-0000-0000-000000000000",
+          "timeZone": "America/New_York"}
+
+
+class Raw(object):
+    " A response which is not JSON, e.g. a chunk of a file, with additional headers"
+    def __init__(self, content, headers=None, content_type="application/octet-stream"):
+        self.content = content
+        self.headers = headers or dict()
+        self.content_type = content_type
+
+
+def object_name(segment):
+    " ~Common~foo and foo both name the object foo in the Common partition"
+    if segment.startswith("~"):
+        return segment.split("~")[-1]
+    return segment
+
+
+class MockBigIP(object):
+    """
+      The configuration of the mock BIG-IP. Collections are ordered dictionaries of objects keyed by
+      name, every change increments the generation, as mcpd does.
+    """
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, page_limit=0, save_time=0.0, boot_time=0.0,
+                 ucs_size=4 * 1024 * 1024, seed=None, capacity=0, reboot_delay=0.0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.page_limit = page_limit                       # maximum items per page, even without $top
+        self.save_time = save_time
+        self.boot_time = boot_time
+        self.rebooted = None                               # time of the last reboot
+        self.reboot_delay = reboot_delay                   # seconds before the reboot begins
+        self.random = random.Random(seed)
+        self.lock = threading.RLock()
+        self.generation = 1
+        self.collections = dict((path, OrderedDict()) for path in COLLECTIONS)
+        self.transactions = dict()
+        self.tokens = dict()
+        self.tasks = dict()
+        self.files = dict()                                # path on the device: bytearray
+        self.ucs_size = ucs_size
+        self.saves = 0
+        self.requests = 0
+        self.capacity = capacity                           # requests processed at a time without slowing down
+        self.in_flight = 0
+
+    # -----------------------------------------------------------------------
+    # request dispatch
+    # -----------------------------------------------------------------------
+
+    def handle(self, method, path, query, body, headers):
+        " Return a tuple of (status code, dictionary) for the request, after the latency of the current load"
+        with self.lock:
+            self.requests += 1
+            self.in_flight += 1
+            load = float(self.in_flight) / self.capacity if self.capacity else 1.0
+        try:
+            if load > OVERLOAD:
+                return 503, {"code": 503, "message": "Service Unavailable"}
+            delay = self.latency * max(1.0, load) ** 2 + self.random.uniform(0, self.jitter)
+            if delay:
+                time.sleep(delay)
+            return self.process(method, path, query, body, headers)
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+    def process(self, method, path, query, body, headers):
+        if self.error_rate and self.random.random() < self.error_rate:
+            return 503, {"code": 503, "message": "Service Unavailable"}
+        if self.booting() > 0.5:
+            return 503, {"code": 503, "message": "Service Unavailable"}
+
+        path = path.rstrip("/") or "/"
+        token = headers.get("X-F5-Auth-Token")
+        if token and token not in self.tokens:
+            return 401, {"code": 401, "message": "X-F5-Auth-Token does not exist."}
+        transaction = headers.get("X-F5-REST-Coordination-Id")
+        if transaction and method != "GET" and not path.startswith("/mgmt/tm/transaction"):
+            return self.queue(transaction, method, path, query, body)
+
+        if path == "/mgmt/shared/authn/login" and method == "POST":
+            return self.login(body)
+        if path.startswith("/mgmt/shared/authz/tokens/") and method == "DELETE":
+            self.tokens.pop(path.rsplit("/", 1)[-1], None)
+            return 200, None
+        if path.startswith("/mgmt/tm/transaction"):
+            return self.transaction(method, path, body)
+        if path == "/mgmt/tm/sys/config" and method == "POST":
+            return self.sys_config(body)
+        if path == "/mgmt/tm/cm/device" and method == "GET":
+            return 200, self.page(path, query, [dict(DEVICE, generation=self.generation)])
+        if path == "/mgmt/tm/sys/ucs" and method == "POST":
+            return self.ucs(body)
+        if path.startswith("/mgmt/shared/file-transfer/ucs-downloads/") and method == "GET":
+            return self.download("/var/local/ucs/" + path.rsplit("/", 1)[-1], headers.get("Content-Range"))
+        if path.startswith("/mgmt/shared/file-transfer/uploads/") and method == "POST":
+            return self.upload("/var/config/rest/downloads/" + path.rsplit("/", 1)[-1], headers.get("Content-Range"), body)
+        if path == "/mgmt/tm/util/bash" and method == "POST":
+            return self.bash(body)
+        if path.startswith("/mgmt/tm/task/sys/config"):
+            return self.task(method, path, body)
+        if path == "/mgmt/tm/sys/service/stats" and method == "GET":
+            return 200, self.service_stats()
+        if path == "/mgmt/tm/sys" and method == "GET":
+            return 200, {"kind": "tm:sys:syscollectionstate", "selfLink": "https://localhost/mgmt/tm/sys?ver=12.1.2", "items": []}
+        return self.config(method, path, query, body)
+
+    def config(self, method, path, query, body):
+        " Create, read, update and delete objects in the collections"
+        with self.lock:
+            collection = self.find_collection(path)
+            if collection is not None:
+                if method == "GET":
+                    return 200, self.page(path, query, list(collection.values()))
+                if method == "POST":
+                    return self.create(path, collection, body)
+                return 405, {"code": 405, "message": "Method not allowed"}
+
+            parent, _, name = path.rpartition("/")
+            collection = self.find_collection(parent)
+            name = object_name(name)
+            if collection is None or name not in collection:
+                return 404, {"code": 404, "message": "01020036:3: The requested object (%s) was not found." % name}
+            if method == "GET":
+                return 200, self.select(collection[name], query)
+            if method in ("PATCH", "PUT"):
+                return self.modify(collection[name], body)
+            if method == "DELETE":
+                del collection[name]
+                self.collections.pop("%s/%s/members" % (parent, name), None)
+                self.generation += 1
+                return 200, None
+            return 405, {"code": 405, "message": "Method not allowed"}
+
+    def find_collection(self, path):
+        " Return the collection at path, the members of a pool are created along with the pool"
+        if path in self.collections:
+            return self.collections[path]
+        match = SUBCOLLECTION.match(path)
+        if match and object_name(match.group(2)) in self.collections.get(match.group(1), {}):
+            return self.collections.setdefault("%s/%s/members" % (match.group(1), object_name(match.group(2))), OrderedDict())
+        return None
+
+    def create(self, path, collection, body):
+        if not isinstance(body, dict) or "name" not in body:
+            return 400, {"code": 400, "message": "name is required"}
+        name = object_name(body["name"])
+        if name in collection:
+            return 409, {"code": 409, "message": "01020066:3: The requested object (%s) already exists." % name}
+        partition = body.get("partition", "Common")
+        self.generation += 1
+        obj = dict(body, name=name, partition=partition, fullPath="/%s/%s" % (partition, name),
+                   selfLink="https://localhost%s/~%s~%s" % (path, partition, name), generation=self.generation)
+        for key, value in obj.items():                     # references are returned with the partition
+            if key in ("pool", "monitor") and value and not value.startswith("/"):
+                obj[key] = "/%s/%s" % (partition, value)
+        members = obj.pop("members", None)
+        collection[name] = obj
+        if path in ("/mgmt/tm/ltm/pool", "/mgmt/tm/gtm/pool"):
+            obj["membersReference"] = {"link": "https://localhost%s/~%s~%s/members" % (path, partition, name)}
+            self.collections["%s/%s/members" % (path, name)] = OrderedDict()
+            for member in members or []:
+                self.create("%s/%s/members" % (path, name), self.collections["%s/%s/members" % (path, name)], member)
+        return 200, obj
+
+    def modify(self, obj, body):
+        if not isinstance(body, dict):
+            return 400, {"code": 400, "message": "invalid body"}
+        if "name" in body and object_name(body["name"]) != obj["name"]:
+            return 400, {"code": 400, "message": "the name of an object can not be modified"}
+        self.generation += 1
+        obj.update(body)
+        obj["generation"] = self.generation
+        return 200, obj
+
+    # -----------------------------------------------------------------------
+    # collections: paging, projection and filtering
+    # -----------------------------------------------------------------------
+
+    def page(self, path, query, items):
+        " Return a page of the collection, applying $filter, $skip, $top and $select"
+        items = self.filter(items, query.get("$filter"))
+        total = len(items)
+        skip = int(query.get("$skip", 0))
+        top = int(query.get("$top", 0)) or total
+        if self.page_limit:
+            top = min(top, self.page_limit)
+        page = items[skip:skip + top]
+
+        response = {"kind": "tm:collectionstate", "selfLink": "https://localhost%s" % path,
+                    "generation": self.generation}
+        if page:
+            expand = query.get("expandSubcollections") == "true"
+            response["items"] = [self.select(self.expand(path, obj) if expand else obj, query) for obj in page]
+        if skip + top < total:
+            parameters = dict((key, value) for key, value in query.items() if key not in ("$top", "$skip"))
+            parameters.update({"$top": top, "$skip": skip + top})
+            response["nextLink"] = "https://localhost%s?%s" % (path, "&".join("%s=%s" % item for item in sorted(parameters.items())))
+            response["currentItemCount"] = len(page)
+            response["totalItems"] = total
+        return response
+
+    def filter(self, items, expression):
+        " Evaluate a $filter of the form: property eq value"
+        if not expression:
+            return items
+        match = re.match(r"^\s*(\w+)\s+eq\s+'?([^']*)'?\s*$", expression)
+        if not match:
+            return items
+        key, value = match.groups()
+        return [obj for obj in items if str(obj.get(key)) == value]
+
+    def select(self, obj, query):
+        if "$select" not in query:
+            return obj
+        keys = query["$select"].split(",")
+        return dict((key, obj[key]) for key in keys if key in obj)
+
+    def expand(self, path, obj):
+        " Include the members of a pool rather than a reference to them"
+        members = self.collections.get("%s/%s/members" % (path, obj["name"]))
+        if members is None:
+            return obj
+        obj = dict(obj)
+        obj["membersReference"] = dict(obj["membersReference"], items=list(members.values()))
+        return obj
+
+    # -----------------------------------------------------------------------
+    # authentication, transactions and commands
+    # -----------------------------------------------------------------------
+
+    def login(self, body):
+        if not isinstance(body, dict) or not body.get("username"):
+            return 401, {"code": 401, "message": "Authentication failed."}
+        token = "%032X" % self.random.getrandbits(128)
+        self.tokens[token] = body["username"]
+        return 200, {"username": body["username"], "token": {"token": token, "timeout": 1200,
+                                                             "userName": body["username"]}}
+
+    def transaction(self, method, path, body):
+        with self.lock:
+            if method == "POST" and path == "/mgmt/tm/transaction":
+                transaction = int(time.time() * 1000000) + len(self.transactions)
+                self.transactions[str(transaction)] = []
+                return 200, {"transId": transaction, "state": "STARTED"}
+
+            transaction = path.rpartition("/")[2]
+            if transaction not in self.transactions:
+                return 404, {"code": 404, "message": "transaction %s not found" % transaction}
+            if method == "DELETE":
+                del self.transactions[transaction]
+                return 200, None
+            if method == "GET":
+                return 200, {"transId": int(transaction), "state": "STARTED"}
+            if method == "PATCH" and isinstance(body, dict) and body.get("state") == "VALIDATING":
+                if body.get("validateOnly"):
+                    return 200, {"transId": int(transaction), "state": "VALIDATING", "validateOnly": True}
+                for queued in self.transactions.pop(transaction):
+                    status, response = self.config(*queued)
+                    if status != 200:
+                        return 400, {"transId": int(transaction), "state": "FAILED", "failureReason": response}
+                return 200, {"transId": int(transaction), "state": "COMPLETED"}
+            return 400, {"code": 400, "message": "invalid transaction request"}
+
+    def queue(self, transaction, method, path, query, body):
+        with self.lock:
+            if transaction not in self.transactions:
+                return 404, {"code": 404, "message": "transaction %s not found" % transaction}
+            self.transactions[transaction].append((method, path, query, body))
+            return 200, {"method": method, "uri": path, "body": body,
+                         "evalOrder": len(self.transactions[transaction]), "commandId": len(self.transactions[transaction])}
+
+    def sys_config(self, body):
+        command = body.get("command") if isinstance(body, dict) else None
+        if command == "save":
+            time.sleep(self.save_time)
+            return 200, {"kind": "tm:sys:config:savestate", "command": "save"}
+        if command == "reboot":
+            self.rebooted = time.time()
+            return 200, {"kind": "tm:sys:config:rebootstate", "command": "reboot"}
+        return 400, {"code": 400, "message": "invalid command"}
+
+    def task(self, method, path, body):
+        """ Tasks are created (POST), started by a PUT of _taskState VALIDATING, then run for save_time
+            seconds in the background, their _taskState is polled with GET
+        """
+        with self.lock:
+            if method == "POST" and path == "/mgmt/tm/task/sys/config":
+                if not isinstance(body, dict) or body.get("command") != "save":
+                    return 400, {"code": 400, "message": "invalid command"}
+                task_id = str(1000 + len(self.tasks))
+                self.tasks[task_id] = dict(body, _taskId=task_id, _taskState="CREATED",
+                                           selfLink="https://localhost%s/%s" % (path, task_id))
+                return 200, self.tasks[task_id]
+            task = self.tasks.get(path.rstrip("/").split("/")[-1])
+            if task is None:
+                return 404, {"code": 404, "message": "Task not found"}
+            if method == "GET":
+                return 200, dict(task)
+            if method == "PUT" and isinstance(body, dict) and body.get("_taskState") == "VALIDATING":
+                if task["_taskState"] != "CREATED":
+                    return 400, {"code": 400, "message": "Task has already been started"}
+                task["_taskState"] = "STARTED"
+                timer = threading.Timer(self.save_time, task.update, kwargs=dict(_taskState="COMPLETED"))
+                timer.daemon = True
+                timer.start()
+                return 202, dict(task)
+            return 405, {"code": 405, "message": "Method not allowed"}
+
+    def ucs(self, body):
+        " Save a UCS archive of ucs_size random bytes, which differ on each save, as the archives of a BIG_IP do"
+        if not isinstance(body, dict) or body.get("command") != "save" or not body.get("name"):
+            return 400, {"code": 400, "message": "invalid command"}
+        name = body["name"] if body["name"].endswith(".ucs") else body["name"] + ".ucs"
+        time.sleep(self.save_time)
+        with self.lock:
+            self.saves += 1
+            seed = "%s %s" % (name, self.saves)
+        content = bytearray(random.Random(seed).getrandbits(8) for _ in range(min(self.ucs_size, 65536)))
+        while len(content) < self.ucs_size:
+            content += content[:self.ucs_size - len(content)]
+        with self.lock:
+            self.files["/var/local/ucs/" + name] = content
+        return 200, {"kind": "tm:sys:ucs:runstate", "command": "save", "name": name}
+
+    def download(self, path, content_range):
+        """ Return the bytes start through end of the Content-Range start-end/total of the request, and the
+            Content-Range start-end/size of the file in the response
+        """
+        content = self.files.get(path)
+        if content is None:
+            return 404, {"code": 404, "message": "%s not found" % path}
+        match = re.match(r"^\s*(\d+)-(\d+)/\d+\s*$", content_range or "")
+        start, end = (int(match.group(1)), int(match.group(2))) if match else (0, len(content) - 1)
+        if start >= len(content) or end < start:
+            return 400, Raw(b"", {"Content-Range": "%s-%s/%s" % (start, end, len(content))})
+        end = min(end, len(content) - 1)
+        return 200, Raw(bytes(content[start:end + 1]), {"Content-Range": "%s-%s/%s" % (start, end, len(content))})
+
+    def upload(self, path, content_range, body):
+        """ Write the body at start of the Content-Range start-end/total of the request, the file is truncated
+            or extended to total bytes, so the chunks may arrive in any order
+        """
+        match = re.match(r"^\s*(\d+)-(\d+)/(\d+)\s*$", content_range or "")
+        if not match or not isinstance(body, bytes):
+            return 400, {"code": 400, "message": "Content-Range and an application/octet-stream body are required"}
+        start, end, total = int(match.group(1)), int(match.group(2)), int(match.group(3))
+        if end < start or end >= total or len(body) != end - start + 1:
+            return 400, {"code": 400, "message": "Content-Range %s does not match the body" % content_range}
+        with self.lock:
+            content = self.files.setdefault(path, bytearray())
+            if len(content) > total:
+                del content[total:]
+            content.extend(b"\0" * (total - len(content)))
+            content[start:end + 1] = body
+        return 200, {"remainingByteCount": 0, "usedChunks": {}, "totalByteCount": total,
+                     "localFilePath": path, "generation": 0, "lastUpdateMicros": int(time.time() * 1000000)}
+
+    def bash(self, body):
+        " Only 'sha256sum path' is run"
+        arguments = body.get("utilCmdArgs", "") if isinstance(body, dict) else ""
+        match = re.match(r"^-c\s+'?sha256sum\s+(\S+?)'?$", arguments.strip())
+        if not match:
+            return 400, {"code": 400, "message": "only sha256sum is supported by the mock"}
+        content = self.files.get(match.group(1))
+        if content is None:
+            result = "sha256sum: %s: No such file or directory\n" % match.group(1)
+        else:
+            result = "%s  %s\n" % (hashlib.sha256(content).hexdigest(), match.group(1))
+        return 200, {"kind": "tm:util:bash:runstate", "command": "run", "utilCmdArgs": arguments, "commandResult": result}
+
+    def booting(self):
+        " Return the fraction of the boot time remaining, 0 when the mock is ready or the reboot has not begun"
+        if not self.rebooted or not self.boot_time:
+            return 0.0
+        elapsed = time.time() - self.rebooted - self.reboot_delay
+        if elapsed < 0:
+            return 0.0
+        return max(0.0, 1.0 - elapsed / self.boot_time)
+
+    def service_stats(self):
+        " The output of 'show sys service', as returned by iControl REST"
+        lines = []
+        for pid, name in enumerate(SERVICES):
+            if name == "tmm" and self.booting():
+                lines.append("%-12s down, not up yet" % name)
+            else:
+                lines.append("%-12s run (pid %d) 2 days" % (name, 5000 + pid))
+        uri = "https://localhost/mgmt/tm/sys/service/stats"
+        return {"kind": "tm:sys:service:servicestats", "selfLink": uri + "?ver=12.1.2",
+                "apiRawValues": {"apiAnonymous": "\n".join(lines)}}
+
+
+class Handler(BaseHTTPRequestHandler):
+    " HTTP/1.1 with keep-alive, so connection reuse by the client can be measured"
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True                         # otherwise delayed ACKs dominate the latency
+    bigip = None
+
+    def dispatch(self):
+        url = urlsplit(self.path)
+        query = dict((key, values[-1]) for key, values in parse_qs(url.query).items())
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        try:
+            if not (self.headers.get("Content-Type") or "").startswith("application/octet-stream"):
+                body = json.loads(body.decode("utf-8")) if body else None
+        except ValueError:
+            self.respond(400, {"code": 400, "message": "Found invalid JSON body in the request."})
+            return
+        status, response = self.bigip.handle(self.command, url.path, query, body, self.headers)
+        self.respond(status, response)
+
+    def respond(self, status, response):
+        headers = dict()
+        content_type = "application/json"
+        if isinstance(response, Raw):
+            headers, content_type, content = response.headers, response.content_type, response.content
+        else:
+            content = b"" if response is None else json.dumps(response).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(content)))
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(content)
+
+    do_GET = do_POST = do_PATCH = do_PUT = do_DELETE = dispatch
+
+    def log_message(self, format, *args):
+        return
+
+
+class Server(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+def serve(bigip, host="127.0.0.1", port=0, certfile=None, keyfile=None):
+    " Start the mock in a background thread, return the server, server.server_port is the port"
+    handler = type("BoundHandler", (Handler,), {"bigip": bigip})
+    server = Server((host, port), handler)
+    if certfile:
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(certfile, keyfile)
+        server.socket = context.wrap_socket(server.socket, server_side=True)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="mock iControl REST server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", default=8443, type=int)
+    parser.add_argument("--certfile", help="serve HTTPS using this certificate")
+    parser.add_argument("--keyfile")
+    parser.add_argument("--latency", default=0.0, type=float, help="seconds added to every request")
+    parser.add_argument("--jitter", default=0.0, type=float, help="up to this many seconds added at random")
+    parser.add_argument("--error-rate", default=0.0, type=float, help="fraction of requests answered with a 503")
+    parser.add_argument("--page-limit", default=0, type=int, help="maximum items returned per page")
+    parser.add_argument("--save-time", default=0.0, type=float, help="seconds taken to save the configuration")
+    parser.add_argument("--boot-time", default=0.0, type=float, help="seconds taken to reboot")
+    parser.add_argument("--reboot-delay", default=0.0, type=float, help="seconds before the reboot begins")
+    parser.add_argument("--ucs-size", default=4 * 1024 * 1024, type=int, help="bytes of a UCS archive")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--capacity", default=0, type=int, help="requests processed at a time before slowing down")
+    args = parser.parse_args()
+
+    bigip = MockBigIP(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                      page_limit=args.page_limit, save_time=args.save_time,
+                      boot_time=args.boot_time, ucs_size=args.ucs_size, seed=args.seed,
+                      capacity=args.capacity, reboot_delay=args.reboot_delay)
+    server = serve(bigip, args.host, args.port, args.certfile, args.keyfile)
+    sys.stdout.write("%s\n" % server.server_port)
+    sys.stdout.flush()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,239 @@
+#!/usr/bin/env python
+#
+"""
+     Copyright (c) 2026 World Wide Technology, Inc.
+     All rights reserved.
+
+     Revision history:
+     17 October 2026  |  1.0 - initial release
+     17 October 2026  |  1.1 - cold start of every module, the modules imported and if requests is imported
+     17 October 2026  |  1.2 - a task sending its requests directly, or through the connection broker
+
+     Startup benchmark. Ansible starts a new interpreter for every task, so the time to import a module is
+     paid for every task, and for every item of a with_items loop. Each run is a new interpreter, the median
+     of --repeat runs is reported.
+
+       modules   import each module of this repository, reporting the time to import it, the number of
+                 modules it imports and whether requests was imported
+       backends  import F5_sdk_LTM_node, create the bigip of the backend and check if a node exists
+                 against the mock iControl REST server
+
+                 import    import F5_sdk_LTM_node, the SDK is not imported until the sdk backend is used
+                 connect   sdk_bigip or rest_bigip, the SDK imports its resource tree and reads the device
+                 request   LTM.node_exists
+       broker    a task, a new interpreter, which imports icontrol_install_config and sends one GET using a
+                 token, directly and through the connection broker (icontrol_broker) holding the session and token
+
+                 import    import icontrol_install_config
+                 request   the GET, including the session created (and requests imported), connect and login
+                           when sent directly
+
+       total is the run, including the start of the interpreter
+
+     usage:
+       ./startup.py --repeat 20 --json startup.jsonl
+       ./startup.py --workloads backends --certfile cert.pem --keyfile key.pem     # the SDK requires HTTPS
+       ./startup.py --workloads broker --certfile cert.pem --keyfile key.pem
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+MODULES = ("icontrol_install_config", "icontrol_gather_facts", "bigip_check", "icontrol_bulk_import",
+           "icontrol_file_transfer", "F5_sdk_LTM_node")
+PHASES = ("import", "connect", "request", "total")
+MODES = ("direct", "broker")
+
+
+def child_module(name):
+    " Run in the new interpreter, print the time to import the module as JSON"
+    sys.path.insert(0, os.path.dirname(HERE))
+    loaded = len(sys.modules)
+    start = time.time()
+    __import__(name)
+    imported = time.time()
+    print(json.dumps({"import": imported - start, "modules": len(sys.modules) - loaded,
+                      "requests": "requests" in sys.modules}))
+
+
+def child_backend(backend, host, transport):
+    " Run in the new interpreter, print the timing of each phase as JSON"
+    start = time.time()
+    sys.path.insert(0, os.path.dirname(HERE))
+    import F5_sdk_LTM_node
+    imported = time.time()
+    try:
+        if backend == "sdk":
+            bigip = F5_sdk_LTM_node.sdk_bigip(host, "admin", "admin")
+            obj = F5_sdk_LTM_node.LTM(bigip, "node000000", "Common")
+        else:
+            from module_utils.icontrol_client import Client
+            Client.TRANSPORT = transport
+            bigip = F5_sdk_LTM_node.rest_bigip(host, "admin", "admin")
+            obj = F5_sdk_LTM_node.REST_LTM(bigip, "node000000", "Common")
+    except ImportError as e:
+        print(json.dumps(dict(error=str(e))))
+        return
+    connected = time.time()
+    obj.node_exists("node000000", "Common")
+    done = time.time()
+    print(json.dumps(dict(error=obj.get_response() if obj.failure() else None,
+                          connect=connected - imported, request=done - connected, **{"import": imported - start})))
+
+
+def child_broker(mode, host, transport, path):
+    " Run in the new interpreter, print the timing of a task sending one GET as JSON"
+    start = time.time()
+    sys.path.insert(0, os.path.dirname(HERE))
+    import icontrol_install_config as iControl
+    imported = time.time()
+    iControl.BIG_IP.TRANSPORT = transport
+    token_cache = iControl.TokenCache(os.path.join(os.path.dirname(path), "tokens.json"))
+    F5 = iControl.BIG_IP(host=host, username="admin", password="admin", token_cache=token_cache,
+                         broker=iControl.Broker.find(path) if mode == "broker" else None)
+    status = F5.request("GET", "/mgmt/tm/cm/device")
+    done = time.time()
+    entry = F5.metrics.summary()
+    print(json.dumps(dict(error=None if status == 200 else "%s %s" % (status, F5.response),
+                          request=done - imported, connect=entry["connect"], reused=entry["reused"],
+                          requests="requests" in sys.modules, **{"import": imported - start})))
+
+
+def median(values):
+    values = sorted(values)
+    return values[len(values) // 2] if values else 0.0
+
+
+def run(*arguments):
+    " Return the result printed by one run of a new interpreter, adding the total time of the run"
+    start = time.time()
+    output = subprocess.check_output([sys.executable, os.path.abspath(__file__)] + list(arguments))
+    result = json.loads(output.decode("utf-8").strip().splitlines()[-1])
+    result["total"] = time.time() - start
+    return result
+
+
+def record(args, result):
+    if args.json:
+        with open(args.json, "a") as output:
+            output.write(json.dumps(dict(result, timestamp=time.time())) + "\n")
+
+
+def modules(args):
+    print("%-26s %6s %10s %10s %8s %9s" % ("module", "runs", "import ms", "total ms", "modules", "requests"))
+    for name in MODULES:
+        runs = [run("--child-module", name) for _ in range(args.repeat)]
+        result = dict(workload="modules", module=name, runs=len(runs),
+                      import_ms=round(median([r["import"] for r in runs]) * 1000, 1),
+                      total_ms=round(median([r["total"] for r in runs]) * 1000, 1),
+                      modules=runs[-1]["modules"], requests=runs[-1]["requests"])
+        print("%(module)-26s %(runs)6d %(import_ms)10.1f %(total_ms)10.1f %(modules)8d %(requests)9s" % result)
+        record(args, result)
+
+
+def start_mock(args):
+    " Return the process of the mock (None if --host is specified), the host and the transport"
+    if args.host:
+        return None, args.host, args.transport
+    transport = args.transport
+    command = [sys.executable, os.path.join(HERE, "mock_icontrol.py"), "--port", "0"]
+    if args.certfile:
+        command += ["--certfile", args.certfile, "--keyfile", args.keyfile or args.certfile]
+    else:
+        transport = "http://"
+    process = subprocess.Popen(command, stdout=subprocess.PIPE)
+    return process, "127.0.0.1:%s" % int(process.stdout.readline()), transport
+
+
+def stop_mock(process):
+    if process:
+        process.terminate()
+        process.wait()
+
+
+def backends(args):
+    process, host, transport = start_mock(args)
+    print("%-8s %6s %10s %10s %10s %10s  %s" % ("backend", "runs", "import ms", "connect ms", "request ms", "total ms", "error"))
+    try:
+        for backend in args.backends.split(","):
+            runs = [run("--child-backend", backend, "--host", host, "--transport", transport) for _ in range(args.repeat)]
+            error = runs[-1].get("error")
+            result = dict(workload="backends", backend=backend, runs=len(runs), error=error)
+            for phase in PHASES:
+                result["%s_ms" % phase] = round(median([r.get(phase, 0.0) for r in runs]) * 1000, 1)
+            print("%(backend)-8s %(runs)6d %(import_ms)10.1f %(connect_ms)10.1f %(request_ms)10.1f %(total_ms)10.1f  %(error)s"
+                  % dict(result, error=error or ""))
+            record(args, result)
+    finally:
+        stop_mock(process)
+
+
+def broker(args):
+    sys.path.insert(0, os.path.dirname(HERE))
+    import icontrol_broker
+    process, host, transport = start_mock(args)
+    path = os.path.join(tempfile.mkdtemp(), "broker.sock")
+    started, stats = icontrol_broker.start(path, idle_timeout=60)
+
+    print("%-8s %6s %10s %10s %10s %10s %8s %9s  %s" % ("mode", "runs", "import ms", "request ms", "connect ms",
+                                                      "total ms", "reused", "requests", "error"))
+    try:
+        for mode in MODES:
+            runs = [run("--child-broker", mode, "--host", host, "--transport", transport, "--socket", path)
+                    for _ in range(args.repeat)]
+            error = runs[-1].get("error")
+            result = dict(workload="broker", mode=mode, runs=len(runs), error=error,
+                          reused=sum(r["reused"] for r in runs), requests=runs[-1]["requests"])
+            for phase in ("import", "request", "connect", "total"):
+                result["%s_ms" % phase] = round(median([r.get(phase, 0.0) for r in runs]) * 1000, 1)
+            print("%(mode)-8s %(runs)6d %(import_ms)10.1f %(request_ms)10.1f %(connect_ms)10.1f %(total_ms)10.1f "
+                  "%(reused)8d %(requests)9s  %(error)s" % dict(result, error=error or ""))
+            record(args, result)
+    finally:
+        icontrol_broker.stop(path)
+        stop_mock(process)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="module startup benchmark")
+    parser.add_argument("--workloads", default="modules,backends,broker")
+    parser.add_argument("--backends", default="rest,sdk")
+    parser.add_argument("--repeat", default=10, type=int)
+    parser.add_argument("--certfile", help="run the mock with HTTPS")
+    parser.add_argument("--keyfile")
+    parser.add_argument("--host", help="use this BIG_IP rather than starting the mock")
+    parser.add_argument("--transport", default="https://")
+    parser.add_argument("--child-module", help=argparse.SUPPRESS)
+    parser.add_argument("--child-backend", help=argparse.SUPPRESS)
+    parser.add_argument("--child-broker", help=argparse.SUPPRESS)
+    parser.add_argument("--socket", help=argparse.SUPPRESS)
+    parser.add_argument("--json", help="append the results, one JSON object per line, to this file")
+    args = parser.parse_args()
+
+    if args.child_module:
+        child_module(args.child_module)
+        return
+    if args.child_backend:
+        child_backend(args.child_backend, args.host, args.transport)
+        return
+    if args.child_broker:
+        child_broker(args.child_broker, args.host, args.transport, args.socket)
+        return
+
+    workloads = args.workloads.split(",")
+    if "modules" in workloads:
+        modules(args)
+    if "backends" in workloads:
+        backends(args)
+    if "broker" in workloads:
+        broker(args)
+
+
+if __name__ == '__main__':
+    main()
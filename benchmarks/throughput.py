@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+#
+"""
+     Copyright (c) 2026 World Wide Technology, Inc.
+     All rights reserved.
+
+     Revision history:
+     17 October 2026  |  1.0 - initial release
+
+     Throughput benchmark of the modules in this repository against the mock iControl REST server,
+     reporting operations per second, p50 and p99 latency and the peak memory (maximum resident set
+     size) of the benchmark process after each workload. tracemalloc is not used, it slows the
+     client enough to distort the latency.
+
+       create   install_config (POST) of size LTM nodes, a GET and a POST per operation
+       update   install_config (PATCH) of the description of each node, a GET and a PATCH per operation
+       gather   icontrol_gather_facts get_facts of the node collection, repeated --repeat times
+       check    bigip_check Check.test_ready, size times
+       delete   delete_config of each node
+
+     usage:
+       ./throughput.py --sizes 10,100,1000 --concurrency 1
+       ./throughput.py --sizes 100000 --workloads create,gather,delete --concurrency 8 --page-size 1000
+       ./throughput.py --sizes 1000 --latency 0.002 --json results.jsonl
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import subprocess
+from multiprocessing.pool import ThreadPool
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+from module_utils import icontrol_config as iControl
+import icontrol_gather_facts as facts
+import bigip_check
+
+WORKLOADS = ("create", "update", "gather", "check", "delete")
+NODES = "/mgmt/tm/ltm/node"
+
+
+def start_mock(args):
+    " Run the mock in its own process, so it does not compete with the client for the GIL"
+    command = [sys.executable, os.path.join(HERE, "mock_icontrol.py"), "--port", "0",
+               "--latency", str(args.latency), "--error-rate", str(args.error_rate),
+               "--page-limit", str(args.page_limit)]
+    if args.certfile:
+        command += ["--certfile", args.certfile, "--keyfile", args.keyfile or args.certfile]
+    process = subprocess.Popen(command, stdout=subprocess.PIPE)
+    port = int(process.stdout.readline())
+    return process, "127.0.0.1:%s" % port
+
+
+def percentile(values, percent):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[int(round(percent / 100.0 * (len(values) - 1)))]
+
+
+def measure(name, size, operations, concurrency=1):
+    """ Run the operations, callables returning True on success, at most concurrency at a time.
+        Return a dictionary describing the throughput, latency and peak memory of the workload.
+    """
+    def timed(operation):
+        start = time.time()
+        ok = operation()
+        return time.time() - start, ok
+
+    start = time.time()
+    if concurrency > 1:
+        pool = ThreadPool(concurrency)
+        try:
+            outcomes = pool.map(timed, operations)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        outcomes = [timed(operation) for operation in operations]
+    elapsed = time.time() - start
+
+    latencies = [latency for latency, ok in outcomes]
+    return dict(workload=name, size=size, operations=len(outcomes),
+                errors=len([ok for latency, ok in outcomes if not ok]),
+                elapsed=round(elapsed, 3),
+                ops_per_second=round(len(outcomes) / elapsed, 1) if elapsed else 0.0,
+                p50_ms=round(percentile(latencies, 50) * 1000, 2),
+                p99_ms=round(percentile(latencies, 99) * 1000, 2),
+                peak_rss_kb=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+
+def workloads(host, size, args):
+    " Generator of (name, operations) in the order they must run, each workload uses one BIG_IP session"
+    F5 = iControl.BIG_IP(host=host, username="admin", password="admin", uri=NODES, pool_size=max(10, args.concurrency))
+    names = ["node%06d" % index for index in range(size)]
+
+    if "create" in args.workloads:
+        yield "create", [lambda name=name, index=index: iControl.install_config(
+            F5.spawn(NODES, "POST"),
+            json.dumps({"name": name, "address": "10.%d.%d.%d" % (index >> 16 & 255, index >> 8 & 255, index & 255)}))
+            for index, name in enumerate(names)]
+
+    if "update" in args.workloads:
+        yield "update", [lambda name=name: iControl.install_config(
+            F5.spawn(NODES, "POST"), json.dumps({"name": name, "description": "updated"}))
+            for name in names]
+
+    if "gather" in args.workloads:
+        def gather():
+            connection = facts.Connection(host=host, username="admin", password="admin")
+            code, result = facts.get_facts(connection, NODES, page_size=args.page_size)
+            return code == 200
+        yield "gather", [gather] * args.repeat
+
+    if "check" in args.workloads:
+        check = bigip_check.Check()
+        yield "check", [lambda: check.test_ready(F5.spawn("/", "GET"))] * size
+
+    if "delete" in args.workloads:
+        yield "delete", [lambda name=name: iControl.delete_config(F5.spawn("%s/%s" % (NODES, name), "DELETE"), None)
+                         for name in names]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="iControl REST throughput benchmark")
+    parser.add_argument("--sizes", default="10,100,1000", help="comma separated number of objects")
+    parser.add_argument("--workloads", default=",".join(WORKLOADS))
+    parser.add_argument("--concurrency", default=1, type=int)
+    parser.add_argument("--page-size", default=None, type=int, help="page_size used by gather")
+    parser.add_argument("--repeat", default=5, type=int, help="number of times gather is run")
+    parser.add_argument("--latency", default=0.0, type=float, help="latency injected by the mock")
+    parser.add_argument("--error-rate", default=0.0, type=float, help="fraction of requests failed by the mock")
+    parser.add_argument("--page-limit", default=0, type=int, help="maximum items per page returned by the mock")
+    parser.add_argument("--certfile", help="run the mock with HTTPS")
+    parser.add_argument("--keyfile")
+    parser.add_argument("--host", help="use this BIG_IP rather than starting the mock")
+    parser.add_argument("--json", help="append the results, one JSON object per line, to this file")
+    args = parser.parse_args()
+    args.workloads = args.workloads.split(",")
+
+    process = None
+    host = args.host
+    if not host:
+        process, host = start_mock(args)
+        if not args.certfile:
+            iControl.Client.TRANSPORT = "http://"               # BIG_IP and Connection are Clients
+
+    print("%-8s %8s %8s %7s %10s %9s %9s %12s" % ("workload", "size", "ops", "errors", "ops/s", "p50 ms", "p99 ms", "peak RSS KB"))
+    try:
+        for size in [int(size) for size in args.sizes.split(",")]:
+            for name, operations in workloads(host, size, args):
+                result = measure(name, size, operations, args.concurrency)
+                result["concurrency"] = args.concurrency
+                print("%(workload)-8s %(size)8d %(operations)8d %(errors)7d %(ops_per_second)10.1f %(p50_ms)9.2f %(p99_ms)9.2f %(peak_rss_kb)12d" % result)
+                if args.json:
+                    with open(args.json, "a") as output:
+                        output.write(json.dumps(result) + "\n")
+    finally:
+        if process:
+            process.terminate()
+            process.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -9,6 +9,18 @@
      6 December 2016  |  1.0 - initial release
      14 December 2016 |  1.1 - Output device information
      14 December 2016 |  1.2 - added import logic for Ansible Tower
+     17 October 2026  |  1.3 - reuse the pooled session of BIG_IP across checks, report connection reuse
+     17 October 2026  |  1.4 - main() only when run as a module, so Check can be imported by the benchmarks
+     17 October 2026  |  1.5 - per request timing and transport metrics, optional JSONL trace file
+     17 October 2026  |  1.6 - retry requests which fail with 502, 503, 504 within the polling interval
+     17 October 2026  |  1.7 - readiness of tmm and mcpd, adaptive polling to a wall clock deadline, fleet mode
+     17 October 2026  |  1.8 - asynchronous save of the config using the task API
+     17 October 2026  |  1.9 - devices are icontrol_client.Client instances, the sys.path logic is removed
+     17 October 2026  |  2.0 - send requests through the connection broker, icontrol_broker, when it is running
+     17 October 2026  |  2.1 - the service name is padded in 'show sys service', ready without the service stats
+     17 October 2026  |  2.2 - save_config_async fails with the response when the task is not created or started
+     17 October 2026  |  2.3 - after a reload, the device must be seen not ready before it is waited for to be ready
+     17 October 2026  |  2.4 - broker and trace_file and their documentation are shared, transport_argument_spec
 
 """
 DOCUMENTATION = '''
@@ -22,18 +34,35 @@ short_description: check if BIG_IP device is ready for configuration
 
 description:
     - Check if the BIG_IP device is responds to iControl API calls, optionally save the config and reload the device.
-    - The timeout value is the dead interval, the interval value is a time between connection attempts.
-    - Using the default values of 10 and 40, the four attempts are made, 10 seconds apart.
-    - Output are ansible facts describing the device.
+    - The device is ready when the tmm and mcpd services are running and the device responds to iControl API calls.
+    - The timeout value is the dead interval, the device is checked until timeout seconds have elapsed.
+    - While the device does not respond, the time between checks doubles from min_interval up to interval.
+      Once the device responds, and its services are starting, it is checked every min_interval seconds.
+    - Output are ansible facts describing the device, or with hosts, bigip_fleet describing each device.
 
 requirements:
-    -  ansible-f5/icontrol_install_config.py from https://github.com/joelwking
+    -  ansible-f5/module_utils/icontrol_client.py from https://github.com/joelwking
+
+extends_documentation_fragment:
+    - icontrol_client.transport
 
 options:
     host:
         description:
             - IP address (or hostname) of BIG_IP device
-        required: true
+            - required unless hosts is specified
+        required: false
+
+    hosts:
+        description:
+            - list of BIG_IP devices, checked concurrently, e.g. after a mass reboot
+        required: false
+
+    concurrency:
+        description:
+            - maximum number of hosts checked at a time
+        required: false
+        default: 20
 
     password:
         description:
@@ -49,6 +78,8 @@ options:
     reload:
         description:
             - boolean indicating if the device should be reloaded
+            - after the reload, the device is checked every min_interval until it is not ready, as the reboot
+              has begun, and then until it is ready; both within timeout
         required: false
         default: false
 
@@ -59,6 +90,20 @@ options:
         required: false
         default: false
 
+    async_save:
+        description:
+            - save the config using the task API, /mgmt/tm/task/sys/config, rather than holding a request open
+              while the device writes the config, which can exceed the timeout of a proxy on a large config
+            - the state of the task is polled, the wait doubling from min_interval up to interval
+        required: false
+        default: false
+
+    save_timeout:
+        description:
+            - seconds to wait for the task saving the config to complete, when async_save is true
+        required: false
+        default: 600
+
     timeout:
         description:
             - timeout of API calls
@@ -67,9 +112,15 @@ options:
 
     interval:
         description:
-            - time waited between checks
+            - maximum time waited between checks, and the connect timeout of each check
         required: false
         default: 10
+
+    min_interval:
+        description:
+            - minimum time waited between checks
+        required: false
+        default: 1
 '''
 
 EXAMPLES = '''
@@ -87,9 +138,44 @@ EXAMPLES = '''
   - name: show facts output
     debug: msg="version is {{bigip.version}} {{bigip.marketingName}} {{bigip.build}} {{bigip.chassisId}}"
 
+  - name: save the config of every big_ip in parallel, without holding a request open during each save
+    bigip_check:
+       hosts: "{{groups['bigip']}}"
+       password: "{{password}}"
+       save_config: true
+       async_save: true
+    delegate_to: localhost
+    run_once: true
+
+  - name: reload every big_ip and wait until all are ready
+    bigip_check:
+       hosts: "{{groups['bigip']}}"
+       password: "{{password}}"
+       reload: true
+       timeout: 900
+       concurrency: 50
+    delegate_to: localhost
+    run_once: true
+
+  - name: show the time each big_ip took to be ready
+    debug: msg="{{item.key}} {{item.value.elapsed}}"
+    with_dict: "{{bigip_fleet}}"
+
 '''
 
+import re
+import json
+import time
+try:
+    from ansible.module_utils.icontrol_client import Client, Metrics, Retry, Broker, transport_argument_spec
+except ImportError:                                        # outside Ansible, module_utils is in this directory
+    from module_utils.icontrol_client import Client, Metrics, Retry, Broker, transport_argument_spec
+
+
 class Check(object):
+    SERVICE_URI = "/mgmt/tm/sys/service/stats"
+    TASK_URI = "/mgmt/tm/task/sys/config/"
+    SERVICES = ("tmm", "mcpd")
 
     def __init__(self):
         self.changed = 0
@@ -97,15 +183,48 @@ class Check(object):
         self.reload_command =  '{"command":"reboot"}'
 
     def save_config(self, device):
-        device.uri =  device.validate_uri("/mgmt/tm/sys/config/")
-        if device.genericPOST(self.save_command):
+        if device.request("POST", "/mgmt/tm/sys/config/", self.save_command) == 200:
             return True
 
         return False
 
+    def save_config_async(self, device, timeout=600, interval=10, min_interval=1):
+        """ Save the config using the task API: create the task, start it by setting its state to VALIDATING,
+            then poll the state of the task until it is COMPLETED or FAILED, the wait doubling from
+            min_interval up to interval. No request is held open while the device writes the config.
+
+            Return a dictionary of saved, the last state of the task and the elapsed seconds. When the task
+            cannot be created or started, the status code and the body of the response are returned as well.
+        """
+        start = time.time()
+        deadline = start + timeout
+        state = None
+        result = dict(saved=False, state=state)
+        if device.request("POST", Check.TASK_URI, self.save_command) != 200 or not self.field(device, "_taskId"):
+            result.update(status=device.status_code, response=device.response)
+        else:
+            task = "%s%s" % (Check.TASK_URI, self.field(device, "_taskId"))
+            if device.request("PUT", task, json.dumps({"_taskState": "VALIDATING"})) not in (200, 202):
+                result.update(status=device.status_code, response=device.response)
+            else:
+                state = self.field(device, "_taskState")
+                delay = min_interval
+                while state not in ("COMPLETED", "FAILED") and time.time() < deadline:
+                    time.sleep(min(delay, max(0, deadline - time.time())))
+                    delay = min(interval, delay * 2)
+                    if device.request("GET", task) == 200:
+                        state = self.field(device, "_taskState")
+        result.update(saved=state == "COMPLETED", state=state, elapsed=round(time.time() - start, 3))
+        return result
+
+    def field(self, device, name):
+        " Return the field of the response, None if there is no response or it is not a dictionary"
+        if isinstance(device.response, dict):
+            return device.response.get(name)
+        return None
+
     def reload_device(self, device):
-        device.uri =  device.validate_uri("/mgmt/tm/sys/config/")
-        if device.genericPOST(self.reload_command):
+        if device.request("POST", "/mgmt/tm/sys/config/", self.reload_command) == 200:
             return True
 
         return False
@@ -116,9 +235,90 @@ class Check(object):
         Mark's recommendation is to issue GET https://10.255.111.29/mgmt/tm/services
         and in the 'items' look for 'name' 'tmm' and 'mcpd' and 'isActive' of true
 
+        The status of the services is requested first, the device only when they are running,
+        both over the keep-alive session of the device. A device without the service stats (404)
+        is ready when it answers for the device.
+        """
+        status = device.request("GET", Check.SERVICE_URI)
+        if status == 404:
+            return device.request("GET", "/mgmt/tm/cm/device/") == 200
+        if status != 200 or not self.services_active(device.response):
+            return False
+        return device.request("GET", "/mgmt/tm/cm/device/") == 200
+
+    def services_active(self, response):
+        """ Return True if the SERVICES are active. The response either has items with 'isActive', or the
+            output of 'show sys service', lines of the form 'tmm          run (pid 6066) 2 days'
+        """
+        if isinstance(response, dict) and response.get("items"):
+            active = [item.get("name") for item in response["items"] if item.get("isActive")]
+            return all(name in active for name in Check.SERVICES)
+        text = "\n".join(self.strings(response))
+        return all(re.search(r"^%s\s+run\b" % re.escape(name), text, re.MULTILINE) for name in Check.SERVICES)
+
+    def strings(self, value):
+        " Generator of the strings in the response, apiRawValues may be nested in the entries of the stats"
+        if isinstance(value, dict):
+            value = list(value.values())
+        if isinstance(value, list):
+            for element in value:
+                for string in self.strings(element):
+                    yield string
+        elif value is not None:
+            yield "%s" % value
+
+    def wait_ready(self, device, timeout=40, interval=10, min_interval=1):
+        """ Check the device until it is ready or timeout seconds have elapsed. While the device does
+            not respond (no connection, or restjavad answers 503), the wait between checks doubles from
+            min_interval up to interval. Once it responds, its services are starting, so it is checked
+            every min_interval. No check is started, or waited for, past the deadline.
+
+            Return a dictionary of ready, the elapsed seconds and the number of checks (polls).
         """
-        device.uri =  device.validate_uri("/mgmt/tm/cm/device/")
-        return device.genericGET()
+        start = time.time()
+        deadline = start + timeout
+        connect, read = device.timeout
+        delay = min_interval
+        polls = 0
+        try:
+            while True:
+                remaining = deadline - time.time()
+                device.timeout = (max(0.1, min(connect, remaining)), max(0.1, min(read, remaining)))
+                polls += 1
+                if self.test_ready(device):
+                    return dict(ready=True, elapsed=round(time.time() - start, 3), polls=polls)
+
+                if device.status_code == 599 or device.status_code in device.retry.status:
+                    delay = min(interval, delay * 2)
+                else:
+                    delay = min_interval
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return dict(ready=False, elapsed=round(time.time() - start, 3), polls=polls)
+                time.sleep(min(delay, remaining))
+        finally:
+            device.timeout = (connect, read)
+
+    def wait_down(self, device, timeout=40, min_interval=1):
+        """ After a reload, check the device every min_interval until it is not ready, as the reboot has
+            begun, so the device is not reported ready before it reboots. No check is started past the deadline.
+
+            Return a dictionary of down, whether the device was seen not ready, and the elapsed seconds.
+        """
+        start = time.time()
+        deadline = start + timeout
+        connect, read = device.timeout
+        try:
+            while True:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return dict(down=False, elapsed=round(time.time() - start, 3))
+                device.timeout = (max(0.1, min(connect, remaining)), max(0.1, min(read, remaining)))
+                if not self.test_ready(device):
+                    return dict(down=True, elapsed=round(time.time() - start, 3))
+                time.sleep(min(min_interval, max(0, deadline - time.time())))
+        finally:
+            device.timeout = (connect, read)
 
     def device_changed(self):
         ""
@@ -134,56 +334,121 @@ class Check(object):
             return dict(error="Response not valid")
 
 
+def check_device(f5, save_config=False, reload=False, timeout=40, interval=10, min_interval=1, async_save=False,
+                 save_timeout=600):
+    """ Optionally save the config and reload the device, then wait until it is ready.
+        Return a dictionary describing the outcome, facts describe the device when it is ready.
+    """
+    me = Check()
+    result = dict(host=f5.host, ready=False, changed=False)
+
+    if save_config:
+        start = time.time()
+        if async_save:
+            save = me.save_config_async(f5, timeout=save_timeout, interval=interval, min_interval=min_interval)
+            saved = save["saved"]
+            result["save_state"] = save["state"]
+            if "status" in save:
+                result["msg"] = "Save config failed: %s %s" % (save["status"], save["response"])
+                return result
+        else:
+            saved = me.save_config(f5)
+        result["save_elapsed"] = round(time.time() - start, 3)
+        if not saved:
+            result["msg"] = "Save config failed"
+            return result
+        me.changed += 1
+
+    if reload:
+        if not me.reload_device(f5):
+            result["msg"] = "Reload failed"
+            return result
+        me.changed += 1
+        down = me.wait_down(f5, timeout=timeout, min_interval=min_interval)
+        result["reload_elapsed"] = down["elapsed"]         # until the device was seen not ready
+        if not down["down"]:
+            result.update(changed=True, msg="Device did not begin to reload")
+            return result
+        timeout = max(0, timeout - down["elapsed"])
+
+    result.update(me.wait_ready(f5, timeout=timeout, interval=interval, min_interval=min_interval))
+    result["changed"] = me.device_changed()
+    if result["ready"]:
+        result["facts"] = me.build_facts(f5.response)
+    else:
+        result["msg"] = "Device not ready"
+    return result
+
+
+def check_fleet(devices, concurrency=20, **kwargs):
+    """ Run check_device for each of the devices (Client instances, each with its own session),
+        at most concurrency at a time. Return a dictionary of the results keyed by host.
+    """
+    from multiprocessing.pool import ThreadPool
+    fleet = dict()
+    pool = ThreadPool(max(1, min(concurrency, len(devices))))
+    try:
+        for result in pool.imap_unordered(lambda f5: check_device(f5, **kwargs), devices):
+            fleet[result.pop("host")] = result
+    finally:
+        pool.close()
+        pool.join()
+    return fleet
+
+
 def main():
+    from ansible.module_utils.basic import AnsibleModule
     module = AnsibleModule(
         argument_spec=dict(
-        host=dict(required=True),
+        host=dict(required=False),
+        hosts=dict(required=False, type='list'),
+        concurrency=dict(default=20, type='int'),
         username=dict(default='admin'),
         password=dict(required=True),
         save_config=dict(default=False, type='bool'),
         reload=dict(default=False, type='bool'),
+        async_save=dict(default=False, type='bool'),
+        save_timeout=dict(default=600, type='int'),
         timeout=dict(default=40, type='int'),
-        interval=dict(default=10, type='int')
-        )
+        interval=dict(default=10, type='int'),
+        min_interval=dict(default=1, type='float'),
+        **transport_argument_spec()
+        ),
+        required_one_of=[['host', 'hosts']]
     )
 
-    #  When running under Ansible Tower, put this module in /usr/share/ansbile
-    #  and modify your ansible.cfg file to include
-    #   library = /usr/share/ansible/
-    try:
-        import icontrol_install_config as iControl
-    except ImportError:
-        sys.path.append("/usr/share/ansible")
-
-    try:
-        import icontrol_install_config as iControl
-    except ImportError:
-        module.fail_json(msg="icontrol_install_config required for this module")
-    import time
-
-    f5 = iControl.BIG_IP(host=module.params["host"], username=module.params["username"], password=module.params["password"])
-    me = Check()
-
-    if module.params["save_config"]:
-        if me.save_config(f5):
-            me.changed += 1
-        else:
-            module.fail_json(msg="Save config failed")
-
-    if module.params["reload"]:
-        if me.reload_device(f5):
-            me.changed += 1
-        else:
-            module.fail_json(msg="Reload failed")
-
-    for increment in range(0, module.params["timeout"], module.params["interval"]):
-        if me.test_ready(f5):
-            facts = me.build_facts(f5.response)
-            module.exit_json(changed=me.device_changed(), msg="Ready", ansible_facts=dict(bigip=facts))         
-        time.sleep(module.params["interval"])
-
-    module.fail_json(msg="Device not ready")
-
-from ansible.module_utils.basic import *
-main()
+    # Each Client, and its keep-alive session, is used for every call to that device
+    metrics = Metrics(trace_file=module.params["trace_file"])
+    broker = Broker.find(module.params["broker"])
+    devices = [Client(host=host, username=module.params["username"], password=module.params["password"],
+                      pool_size=1, timeout=(module.params["interval"], Client.TIMEOUT[1]),
+                      metrics=metrics, broker=broker,
+                      retry=Retry(deadline=module.params["interval"]))   # retries end before the next poll
+               for host in module.params["hosts"] or [module.params["host"]]]
+    options = dict(save_config=module.params["save_config"], reload=module.params["reload"],
+                   timeout=module.params["timeout"], interval=module.params["interval"],
+                   min_interval=module.params["min_interval"], async_save=module.params["async_save"],
+                   save_timeout=module.params["save_timeout"])
+
+    if module.params["hosts"]:
+        fleet = check_fleet(devices, concurrency=module.params["concurrency"], **options)
+        changed = any(result["changed"] for result in fleet.values())
+        failed = sorted(host for host in fleet if not fleet[host]["ready"])
+        if failed:
+            module.fail_json(msg="%s of %s devices not ready: %s" % (len(failed), len(fleet), ", ".join(failed)),
+                             changed=changed, ansible_facts=dict(bigip_fleet=fleet), metrics=metrics.summary())
+        module.exit_json(changed=changed, msg="Ready", ansible_facts=dict(bigip_fleet=fleet), metrics=metrics.summary())
+
+    f5 = devices[0]
+    result = check_device(f5, **options)
+    if not result["ready"]:
+        module.fail_json(msg=result["msg"], changed=result["changed"], elapsed=result.get("elapsed"),
+                         save_elapsed=result.get("save_elapsed"), metrics=metrics.summary())
+    module.exit_json(changed=result["changed"], msg="Ready", ansible_facts=dict(bigip=result["facts"]),
+                     elapsed=result["elapsed"], polls=result["polls"], save_elapsed=result.get("save_elapsed"),
+                     connections=f5.connection_stats(), metrics=metrics.summary())
+
+
+if __name__ == '__main__':
+    main()
 #
\ No newline at end of file
@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+#
+"""
+     Copyright (c) 2026 World Wide Technology, Inc.
+     All rights reserved.
+
+     Revision history:
+     17 October 2026  |  1.0 - initial release, the options of common_argument_spec of module_utils/icontrol_client.py
+
+     The documentation of the options shared by the modules which use the REST client, included in their
+     documentation with extends_documentation_fragment. ansible-doc finds it when this directory is in
+     ANSIBLE_DOC_FRAGMENT_PLUGINS (or doc_fragment_plugins of ansible.cfg).
+
+     usage:
+       ANSIBLE_LIBRARY=. ANSIBLE_DOC_FRAGMENT_PLUGINS=doc_fragments ansible-doc icontrol_install_config
+"""
+
+
+class ModuleDocFragment(object):
+
+    # retries, circuit breaker and governor, with TRANSPORT the options of common_argument_spec
+    DOCUMENTATION = r'''
+options:
+    retries:
+        description:
+            - number of times a request is retried when the BIG_IP responds 502, 503 or 504 (restjavad is
+              unavailable) or the connection fails, waiting an exponentially increasing, random interval
+        required: false
+        default: 3
+    backoff:
+        description:
+            - seconds of the first retry interval, doubled on each retry up to 30 seconds
+        required: false
+        default: 0.5
+    deadline:
+        description:
+            - seconds after which a request is no longer retried, including the time waiting between retries
+        required: false
+    circuit_breaker:
+        description:
+            - path of a file recording the hosts which are unreachable, shared by every module run
+            - after failure_threshold consecutive requests to a host fail to connect, requests to the host fail
+              immediately, until cooldown seconds have passed and a single request is allowed to test the host
+        required: false
+    failure_threshold:
+        description:
+            - consecutive connection failures after which the circuit breaker opens
+        required: false
+        default: 3
+    cooldown:
+        description:
+            - seconds the circuit breaker stays open before a request is allowed to test the host
+        required: false
+        default: 60
+    governor:
+        description:
+            - path of a file holding the limits of each host, shared by every fork and module run, so at most
+              max_in_flight requests are in flight to a host and at most max_rate are sent each second
+            - the limit of the requests in flight is halved when the host responds 502, 503 or 504, a request
+              times out, or the time to the first byte is more than twice the baseline, the fastest seen, and
+              increases again as requests succeed. max_rate is a fixed ceiling, it does not adapt
+        required: false
+    max_in_flight:
+        description:
+            - maximum number of requests in flight to a host, by every fork, when governor is specified
+        required: false
+        default: 10
+    max_rate:
+        description:
+            - maximum number of requests sent to a host each second, by every fork, when governor is specified
+            - 0 for no limit of the rate
+        required: false
+        default: 50
+'''
+
+    # broker and trace_file, the options of transport_argument_spec
+    TRANSPORT = r'''
+options:
+    broker:
+        description:
+            - path of the Unix socket of the connection broker, see icontrol_broker; when the broker is running,
+              requests are sent through it, using its keep-alive sessions and tokens, otherwise directly
+            - set to an empty string to always send requests directly
+        required: false
+        default: "~/.ansible/f5_broker.sock"
+    trace_file:
+        description:
+            - append the timing of each request, one JSON object per line, to this file
+            - the module result always includes a summary of the timing in metrics
+        required: false
+'''
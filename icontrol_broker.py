@@ -0,0 +1,485 @@
+#!/usr/bin/env python
+#
+"""
+     Copyright (c) 2026 World Wide Technology, Inc.
+     All rights reserved.
+
+     Revision history:
+     17 October 2026  |  1.0 - initial release
+
+"""
+DOCUMENTATION = '''
+---
+module: icontrol_broker
+author: Joel W. King @joel_w_king
+version_added: "2.0"
+short_description: Start or stop a local connection broker which keeps the sessions and tokens of each BIG_IP
+description:
+    - Every Ansible task is a new process, so every task connects to the BIG_IP, negotiates TLS and
+      authenticates again. The connection broker is a daemon, on the Ansible controller, listening on a Unix
+      socket. It holds a keep-alive session and the authentication tokens of each BIG_IP, and forwards the
+      requests of icontrol_install_config, icontrol_gather_facts and bigip_check, which send their requests
+      through the broker when its socket exists. Connection setup becomes a round trip to a local socket.
+    - At most max_per_device requests are sent to a BIG_IP at a time, by all the forks using the broker,
+      the others wait in the broker until a request completes.
+    - The broker exits when no request has been received for idle_timeout seconds, the modules then
+      send their requests directly.
+    - Tokens are obtained from /mgmt/shared/authn/login, for each username, password and login provider, and
+      held in memory by the broker. The socket is only accessible by the user who started the broker.
+
+notes:
+    - iControl(tm) REST API User Guide Version 12.0
+    - run the task on the Ansible controller, where the modules run, with delegate_to localhost and run_once
+
+requirements:
+    - ansible-f5/module_utils/icontrol_client.py from https://github.com/joelwking
+
+options:
+    socket:
+        description:
+            - path of the Unix socket of the broker, the modules use the broker of this socket by default
+        required: false
+        default: "~/.ansible/f5_broker.sock"
+    state:
+        description:
+            - started, start the broker unless it is running; stopped, stop the broker; stats, return the
+              statistics of the running broker
+        required: false
+        default: started
+        choices: ['started', 'stopped', 'stats']
+    idle_timeout:
+        description:
+            - seconds without a request after which the broker exits
+        required: false
+        default: 600
+    max_per_device:
+        description:
+            - maximum number of requests in flight to each BIG_IP, and the connections kept alive to it
+        required: false
+        default: 10
+'''
+
+EXAMPLES = '''
+
+  - name: Start the connection broker for the tasks of this play
+    icontrol_broker:
+      idle_timeout: 300
+      max_per_device: 8
+    delegate_to: localhost
+    run_once: true
+
+  - name: Tasks send their requests through the broker, without connecting or logging in to the BIG_IP
+    icontrol_install_config:
+      uri: "/mgmt/tm/ltm/node/"
+      body: '{"name": "{{item.name}}", "address": "{{item.address}}"}'
+      host: "{{inventory_hostname}}"
+      username: admin
+      password: "{{password}}"
+    with_items: "{{nodes}}"
+    delegate_to: localhost
+
+  - name: Show the requests forwarded to each BIG_IP and the connections reused
+    icontrol_broker:
+      state: stats
+    delegate_to: localhost
+    run_once: true
+    register: broker
+
+  - name: Stop the broker
+    icontrol_broker:
+      state: stopped
+    delegate_to: localhost
+    run_once: true
+
+'''
+
+import os
+import json
+import time
+import fcntl
+import hashlib
+import threading
+try:
+    import socketserver
+except ImportError:
+    import SocketServer as socketserver                    # Python 2
+try:
+    from urllib.parse import urlsplit
+except ImportError:
+    from urlparse import urlsplit                          # Python 2
+try:
+    from ansible.module_utils.icontrol_client import Broker, BrokerUnavailable, TokenCache, pooled_session, timed_request
+except ImportError:                                        # outside Ansible, module_utils is in this directory
+    from module_utils.icontrol_client import Broker, BrokerUnavailable, TokenCache, pooled_session, timed_request
+
+IDLE_TIMEOUT = 600
+MAX_PER_DEVICE = 10
+FRAME = 65536                                              # bytes of the body in each frame sent to the module
+START_TIMEOUT = 10                                         # seconds to wait for a new broker to listen
+
+# ---------------------------------------------------------------------------
+# Devices
+# ---------------------------------------------------------------------------
+
+
+class MemoryStore(object):
+    " A dictionary with the interface of LockedStore, held in memory by the broker rather than in a file"
+    def __init__(self):
+        self.data = dict()
+        self.lock = threading.Lock()
+
+    def __enter__(self):
+        self.lock.acquire()
+        return self.data
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.lock.release()
+        return False
+
+
+class Device(object):
+    """
+      The keep-alive session, tokens and concurrency limit of one BIG_IP. Tokens are cached for each username,
+      password and login provider, so a request with a wrong password is not sent with the token of another.
+    """
+    def __init__(self, transport, host, limit):
+        self.transport = transport
+        self.host = host
+        self.session = pooled_session(limit, transport)
+        self.limit = threading.BoundedSemaphore(limit)
+        self.caches = dict()
+        self.lock = threading.Lock()
+        self.stats = dict(requests=0, errors=0, in_flight=0, max_in_flight=0, queued=0.0)
+
+    def token_cache(self, auth, login_provider):
+        " Return the TokenCache of the credentials"
+        key = hashlib.sha256(json.dumps([auth[0], auth[1], login_provider]).encode("utf-8")).hexdigest()
+        with self.lock:
+            if key not in self.caches:
+                self.caches[key] = TokenCache(None, login_provider=login_provider, store=MemoryStore())
+            return self.caches[key]
+
+    def started(self, queued):
+        with self.lock:
+            self.stats["requests"] += 1
+            self.stats["in_flight"] += 1
+            self.stats["max_in_flight"] = max(self.stats["max_in_flight"], self.stats["in_flight"])
+            self.stats["queued"] += queued
+
+    def finished(self, error=False):
+        with self.lock:
+            self.stats["in_flight"] -= 1
+            self.stats["errors"] += error
+
+    def summary(self):
+        " Return the statistics, and the connections opened and reused, of the device"
+        with self.lock:
+            summary = dict(self.stats, queued=round(self.stats["queued"], 6), tokens=len(self.caches))
+        adapter = self.session.get_adapter(self.transport)
+        pools = list(adapter.poolmanager.pools.keys())
+        summary["connections"] = sum(adapter.poolmanager.pools[key].num_connections for key in pools)
+        summary["reused"] = sum(adapter.poolmanager.pools[key].num_requests for key in pools) - summary["connections"]
+        return summary
+
+# ---------------------------------------------------------------------------
+# Connection broker
+# ---------------------------------------------------------------------------
+
+
+class Handler(socketserver.StreamRequestHandler):
+    """
+      Each connection from a module is one request, a line of JSON followed by the body; or a command, stats or
+      shutdown. The response is forwarded as a line of JSON followed by the body in frames, see Broker.
+    """
+    def handle(self):
+        line = self.rfile.readline()
+        if not line:
+            return
+        request = json.loads(line.decode("utf-8"))
+        if "command" in request:
+            self.reply(self.server.command(request["command"]))
+            return
+        body = self.rfile.read(request["length"]) if request["length"] else None
+        self.replied = False
+        try:
+            self.forward(request, body)
+        except (IOError, OSError):                         # the module closed the connection
+            pass
+        except Exception as e:                             # e.g. an invalid URL, reported to the module
+            if not self.replied:
+                self.reply(dict(error="%s: %s" % (type(e).__name__, e)))
+
+    def reply(self, reply):
+        self.wfile.write(json.dumps(reply).encode("utf-8") + b"\n")
+        self.replied = True
+
+    def frame(self, chunk):
+        self.wfile.write(("%x\n" % len(chunk)).encode("ascii") + chunk)
+
+    def forward(self, request, body):
+        """ Send the request to the BIG_IP, when fewer than the limit of the device are in flight, and forward
+            the response. The body is read from the BIG_IP as it is forwarded, when the module streams it.
+        """
+        import requests
+        device = self.server.device(request["url"])
+        start = time.time()
+        with device.limit:
+            queued = time.time() - start                   # waiting for a request to the device to complete
+            device.started(queued)
+            error = True
+            try:
+                r, timing = self.send(device, request, body)
+                error = False
+            except (requests.ConnectionError, requests.Timeout) as e:
+                self.reply(dict(error=str(e), read_timeout=isinstance(e, requests.ReadTimeout)))
+                return
+            finally:
+                device.finished(error)
+
+            timing["queued"] = round(queued, 6)
+            try:
+                self.reply(dict(status=r.status_code, reason=r.reason, headers=dict(r.headers), timing=timing))
+                if request["read"]:
+                    for offset in range(0, len(r.content), FRAME):
+                        self.frame(r.content[offset:offset + FRAME])
+                else:
+                    for chunk in r.iter_content(FRAME):
+                        self.frame(chunk)
+                self.wfile.write(b"0\n")
+            finally:
+                r.close()
+
+    def send(self, device, request, body):
+        """ Send the request using a token of the credentials, unless the module specified a token, or one
+            could not be obtained. A token revoked before it expired is replaced, and the request sent again.
+        """
+        headers = request["headers"] or dict()
+        auth = tuple(request["auth"]) if request["auth"] else None
+        timeout = tuple(request["timeout"]) if request["timeout"] else None
+        tokens = None
+        token = None
+        if auth and "X-F5-Auth-Token" not in headers:
+            tokens = device.token_cache(auth, request["login_provider"])
+            token = tokens.get(device.session, device.transport + device.host, device.host, auth[0], auth[1],
+                               timeout=timeout)
+
+        r, timing = self.timed(device, request, body, headers, auth, token, timeout)
+        if r.status_code == 401 and token:
+            r.content
+            tokens.invalidate(device.host, auth[0])
+            token = tokens.get(device.session, device.transport + device.host, device.host, auth[0], auth[1],
+                               timeout=timeout)
+            r, timing = self.timed(device, request, body, headers, auth, token, timeout)
+        return r, timing
+
+    def timed(self, device, request, body, headers, auth, token, timeout):
+        if token:
+            headers = dict(headers, **{"X-F5-Auth-Token": token})
+            auth = None
+        return timed_request(device.session, request["method"], request["url"], read=request["read"], auth=auth,
+                             data=body, headers=headers, timeout=timeout)
+
+
+class ConnectionBroker(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+      The daemon, listening on a Unix socket, holding a Device for each BIG_IP. Each connection is handled by
+      a thread. When there has been no connection for idle_timeout seconds, the socket is removed and the
+      daemon exits, after the connections in progress are complete.
+    """
+    daemon_threads = True
+
+    def __init__(self, path, idle_timeout=IDLE_TIMEOUT, max_per_device=MAX_PER_DEVICE):
+        self.path = path
+        self.idle_timeout = idle_timeout
+        self.max_per_device = max_per_device
+        self.devices = dict()
+        self.lock = threading.Lock()
+        self.connections = 0                               # connections in progress
+        self.started = time.time()
+        self.last = time.time()                            # time of the last connection
+        socketserver.UnixStreamServer.__init__(self, path, Handler)
+        self.inode = os.stat(path).st_ino
+
+    def device(self, URI):
+        " Return the Device of the scheme and host of the URI, creating it on the first request"
+        url = urlsplit(URI)
+        key = "%s://%s" % (url.scheme, url.netloc)
+        with self.lock:
+            if key not in self.devices:
+                self.devices[key] = Device("%s://" % url.scheme, url.netloc, self.max_per_device)
+            return self.devices[key]
+
+    def process_request(self, request, client_address):
+        with self.lock:
+            self.connections += 1
+            self.last = time.time()
+        socketserver.ThreadingMixIn.process_request(self, request, client_address)
+
+    def shutdown_request(self, request):
+        socketserver.UnixStreamServer.shutdown_request(self, request)
+        with self.lock:
+            self.connections -= 1
+            self.last = time.time()
+
+    def command(self, command):
+        if command == "shutdown":
+            threading.Thread(target=self.stop).start()
+        with self.lock:
+            devices = list(self.devices.items())
+            connections = self.connections - 1             # not counting this connection
+        return dict(pid=os.getpid(), socket=self.path, uptime=round(time.time() - self.started, 3),
+                    idle_timeout=self.idle_timeout, max_per_device=self.max_per_device, connections=connections,
+                    devices=dict((key, device.summary()) for key, device in devices))
+
+    def watch(self):
+        " Stop the broker when it has been idle for idle_timeout seconds"
+        while True:
+            time.sleep(min(1.0, self.idle_timeout))
+            with self.lock:
+                if self.connections == 0 and time.time() - self.last >= self.idle_timeout:
+                    break
+        self.stop()
+
+    def stop(self):
+        " Remove the socket, so the modules send requests directly rather than connecting, and stop listening"
+        self.remove()
+        self.shutdown()
+
+    def remove(self):
+        " Remove the socket, unless it has been replaced by another broker"
+        try:
+            if os.stat(self.path).st_ino == self.inode:
+                os.unlink(self.path)
+        except OSError:
+            pass
+
+    def drain(self):
+        " Wait for the connections in progress to complete"
+        while True:
+            with self.lock:
+                if self.connections <= 0:
+                    return
+            time.sleep(0.05)
+
+
+def serve(path=Broker.SOCKET, idle_timeout=IDLE_TIMEOUT, max_per_device=MAX_PER_DEVICE):
+    """ Listen on the Unix socket path, which is created accessible only by this user, forwarding requests
+        until idle for idle_timeout seconds or a shutdown command is received.
+    """
+    path = os.path.expanduser(path)
+    directory = os.path.dirname(path)
+    if directory and not os.path.isdir(directory):
+        os.makedirs(directory, 0o700)
+    umask = os.umask(0o077)
+    try:
+        server = ConnectionBroker(path, idle_timeout=idle_timeout, max_per_device=max_per_device)
+    finally:
+        os.umask(umask)
+
+    watcher = threading.Thread(target=server.watch)
+    watcher.daemon = True
+    watcher.start()
+    try:
+        server.serve_forever(poll_interval=0.5)
+        server.drain()
+    finally:
+        server.remove()
+        server.server_close()
+
+
+def running(path):
+    " Return the statistics of the broker listening on path, or None"
+    try:
+        return Broker(path).command("stats")
+    except BrokerUnavailable:
+        return None
+
+
+def start(path=Broker.SOCKET, idle_timeout=IDLE_TIMEOUT, max_per_device=MAX_PER_DEVICE):
+    """ Start the broker, detached from this process, unless a broker is listening on path. The start is
+        serialized by a lock file, so concurrent forks start one broker. Return a tuple of whether the broker
+        was started and its statistics, or None if it did not start listening within START_TIMEOUT.
+    """
+    path = os.path.expanduser(path)
+    directory = os.path.dirname(path)
+    if directory and not os.path.isdir(directory):
+        os.makedirs(directory, 0o700)
+    lock_fd = os.open(path + ".lock", os.O_RDWR | os.O_CREAT, 0o600)
+    fcntl.flock(lock_fd, fcntl.LOCK_EX)
+    try:
+        stats = running(path)
+        if stats:
+            return False, stats
+        if os.path.exists(path):                           # a broker which did not exit cleanly
+            os.unlink(path)
+
+        pid = os.fork()
+        if pid == 0:
+            try:
+                os.setsid()
+                if os.fork() == 0:                         # the daemon is not a child of the module
+                    os.chdir("/")
+                    devnull = os.open(os.devnull, os.O_RDWR)
+                    for fd in (0, 1, 2):
+                        os.dup2(devnull, fd)
+                    os.close(lock_fd)
+                    serve(path, idle_timeout=idle_timeout, max_per_device=max_per_device)
+            finally:
+                os._exit(0)
+        os.waitpid(pid, 0)
+
+        deadline = time.time() + START_TIMEOUT
+        while time.time() < deadline:
+            stats = running(path)
+            if stats:
+                return True, stats
+            time.sleep(0.05)
+        return True, None
+    finally:
+        fcntl.flock(lock_fd, fcntl.LOCK_UN)
+        os.close(lock_fd)
+
+
+def stop(path=Broker.SOCKET):
+    " Stop the broker listening on path, return its statistics or None if it was not running"
+    try:
+        return Broker(path).command("shutdown")
+    except BrokerUnavailable:
+        return None
+
+# ---------------------------------------------------------------------------
+# MAIN
+# ---------------------------------------------------------------------------
+
+def main():
+    "   "
+    from ansible.module_utils.basic import AnsibleModule
+    module = AnsibleModule(
+        argument_spec=dict(
+            socket=dict(required=False, default=Broker.SOCKET, type='path'),
+            state=dict(required=False, default='started', choices=['started', 'stopped', 'stats']),
+            idle_timeout=dict(required=False, default=IDLE_TIMEOUT, type='int'),
+            max_per_device=dict(required=False, default=MAX_PER_DEVICE, type='int')
+        )
+    )
+    path = module.params["socket"]
+
+    if module.params["state"] == "stats":
+        stats = running(path)
+        if stats is None:
+            module.fail_json(msg="the broker is not running on %s" % path)
+        module.exit_json(changed=False, broker=stats)
+
+    if module.params["state"] == "stopped":
+        stats = stop(path)
+        module.exit_json(changed=stats is not None, broker=stats)
+
+    changed, stats = start(path, idle_timeout=module.params["idle_timeout"],
+                           max_per_device=module.params["max_per_device"])
+    if stats is None:
+        module.fail_json(msg="the broker did not start listening on %s" % path)
+    module.exit_json(changed=changed, broker=stats)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,452 @@
+#!/usr/bin/env python
+#
+"""
+     Copyright (c) 2026 World Wide Technology, Inc.
+     All rights reserved.
+
+     Revision history:
+     17 October 2026  |  1.0 - initial release
+     17 October 2026  |  1.1 - ThreadPool is imported only when chunks are applied in transactions
+     17 October 2026  |  1.2 - BIG_IP and the batch functions are imported from ansible.module_utils
+     17 October 2026  |  1.3 - retries, circuit breaker, connection broker and the governor shared by every fork
+     17 October 2026  |  1.4 - a chunk in which diff finds nothing to change is not a failed transaction
+     17 October 2026  |  1.5 - the client options and their documentation are shared, common_argument_spec
+
+"""
+DOCUMENTATION = '''
+---
+module: icontrol_bulk_import
+author: Joel W. King @joel_w_king
+version_added: "2.0"
+short_description: Load a CSV or JSONL file of object definitions into an F5 BIG_IP using the REST API
+description:
+    - Rather than a task for each row of a spreadsheet, with an Ansible fork, module invocation and
+      authentication for every row, the file is read by the module. Rows are read as they are needed, grouped
+      into chunks and each chunk is applied concurrently, or queued and committed in a transaction, using
+      the pooled session of icontrol_install_config.
+    - Each row of a CSV file is a dictionary keyed by the column names in the first row. Each line of a JSONL
+      file is a JSON object, either a row, or an item of icontrol_install_config with keys of uri, body and method.
+    - The body of each row is the row, less the columns in exclude, unless body is specified. The strings in body
+      and uri are templates, {column} is replaced by the value of the column of the row.
+    - Rows which fail are written to error_file, one JSON object per line, with the row number, the row and
+      the response of the BIG_IP. A line describing each chunk, as it completes, is appended to progress_file.
+
+notes:
+    - iControl(tm) REST API User Guide Version 12.0
+    - a POST is not retried after a read timeout, as the BIG_IP may have created the object
+
+requirements:
+    - ansible-f5/module_utils/icontrol_client.py and icontrol_config.py from https://github.com/joelwking
+
+extends_documentation_fragment:
+    - icontrol_client
+    - icontrol_client.transport
+
+options:
+    host:
+        description:
+            - The IP address or hostname of the F5 appliance
+        required: true
+    username:
+        description:
+            - Login username
+        required: true
+    password:
+        description:
+            - Login password
+        required: true
+    token_cache:
+        description:
+            - path of a file where authentication tokens are cached, see icontrol_install_config
+        required: false
+    src:
+        description:
+            - path of the CSV or JSONL file
+        required: true
+    format:
+        description:
+            - csv or jsonl, by default the extension of src, files ending in .json or .jsonl are JSONL
+        required: false
+    uri:
+        description:
+            - the URI of each row, a template, e.g. /mgmt/tm/ltm/pool/{pool}/members
+            - required unless each line of a JSONL file specifies its uri
+        required: false
+    body:
+        description:
+            - 'the body of each row, a dictionary (or JSON string) of templates, e.g. {"name": "{name}:{port}"}'
+            - by default, every column of the row which is not in exclude and is not empty
+        required: false
+    exclude:
+        description:
+            - columns of the row which are not included in the body, when body is not specified
+        required: false
+        default: []
+    method:
+        description:
+            - the method of each row, as icontrol_install_config
+        required: false
+        default: POST
+    chunk_size:
+        description:
+            - number of rows read, and applied, at a time
+        required: false
+        default: 1000
+    concurrency:
+        description:
+            - maximum number of requests in flight. With transaction, the number of chunks queued at a time.
+        required: false
+        default: 8
+    strategy:
+        description:
+            - create strategy of icontrol_install_config, check, optimistic or prefetch. With prefetch, the names
+              in each collection are requested once, when a row first targets the collection.
+        required: false
+        default: optimistic
+    transaction:
+        description:
+            - queue the rows of each chunk in a transaction and commit it, a chunk is applied entirely or not at all
+        required: false
+        default: false
+    validate:
+        description:
+            - validate each transaction before it is committed
+        required: false
+        default: true
+    error_file:
+        description:
+            - path of a file where the rows which failed are written, one JSON object per line
+        required: false
+    progress_file:
+        description:
+            - path of a file where a line describing each chunk is appended as it completes
+        required: false
+'''
+
+EXAMPLES = '''
+
+  - name: Load the nodes of the spreadsheet
+    icontrol_bulk_import:
+      src: ./files/f5_wide_IP.csv
+      uri: "/mgmt/tm/ltm/node"
+      body: {"name": "{name}", "address": "{address}"}
+      host: "{{ltm.hostname}}"
+      username: admin
+      password: "{{password}}"
+      token_cache: "~/.ansible/f5_tokens.json"
+      chunk_size: 1000
+      concurrency: 16
+      error_file: /tmp/node_errors.jsonl
+      progress_file: /tmp/node_progress.jsonl
+
+  - name: Add the nodes to the pool, each chunk in a transaction
+    icontrol_bulk_import:
+      src: ./files/f5_wide_IP.csv
+      uri: "/mgmt/tm/ltm/pool/NEW_POOL/members"
+      body: {"name": "{name}:{port}", "partition": "{partition}"}
+      transaction: true
+      concurrency: 4
+      host: "{{ltm.hostname}}"
+      username: admin
+      password: "{{password}}"
+
+  - name: Apply a JSONL file of items, each line {"uri": ..., "body": {...}, "method": ...}
+    icontrol_bulk_import:
+      src: ./files/objects.jsonl
+      host: "{{ltm.hostname}}"
+      username: admin
+      password: "{{password}}"
+
+  - name: show the throughput
+    debug: msg="{{bulk_import.rows}} rows in {{bulk_import.elapsed}} seconds, {{bulk_import.rows_per_second}} per second"
+
+'''
+
+import os
+import csv
+import json
+import time
+import threading
+from itertools import islice
+
+try:
+    from ansible.module_utils.icontrol_client import TokenCache, common_argument_spec, client_options
+    from ansible.module_utils.icontrol_config import (BIG_IP, to_json, normalize_item, prefetch_names, apply_items,
+                                                      apply_transaction)
+except ImportError:                                        # outside Ansible, module_utils is in this directory
+    from module_utils.icontrol_client import TokenCache, common_argument_spec, client_options
+    from module_utils.icontrol_config import (BIG_IP, to_json, normalize_item, prefetch_names, apply_items,
+                                              apply_transaction)
+
+try:
+    STRINGS = (str, unicode)
+except NameError:
+    STRINGS = (str,)                                       # Python 3
+
+# ---------------------------------------------------------------------------
+# reading rows
+# ---------------------------------------------------------------------------
+
+
+def read_rows(path, format=None):
+    """ Generator of (row number, row) of a CSV or JSONL file, reading the file as rows are needed.
+        A JSONL line which is not valid JSON is returned as the ValueError, so it can be reported.
+    """
+    if not format:
+        format = "jsonl" if os.path.splitext(path)[1].lower() in (".json", ".jsonl") else "csv"
+
+    with open(path) as source:
+        if format == "csv":
+            for number, row in enumerate(csv.DictReader(source), 1):
+                yield number, row
+            return
+        for number, line in enumerate(source, 1):
+            if not line.strip():
+                continue
+            try:
+                yield number, json.loads(line)
+            except ValueError as e:
+                yield number, e
+
+
+def render(template, row):
+    " Replace {column} in the strings of the template with the values of the row"
+    if isinstance(template, dict):
+        return dict((key, render(value, row)) for key, value in template.items())
+    if isinstance(template, list):
+        return [render(value, row) for value in template]
+    if isinstance(template, STRINGS):
+        return template.format(**row)
+    return template
+
+
+def row_item(row, uri=None, method="POST", body=None, exclude=()):
+    """ Return the (uri, body, method) of the row, as normalize_item of icontrol_install_config.
+        Raises KeyError or ValueError if the row does not match the templates.
+    """
+    if not isinstance(row, dict):
+        raise ValueError("row is not an object")
+    if "uri" in row and "body" in row:                     # an item of icontrol_install_config
+        return normalize_item(row, uri, method)
+    if not uri:
+        raise ValueError("uri not specified")
+    if body:
+        content = render(body, row)
+    else:
+        content = dict((key, value) for key, value in row.items() if key not in exclude and value not in ("", None))
+    return render(uri, row), to_json(content), method
+
+
+def chunks(rows, size):
+    " Generator of lists of up to size rows"
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+# ---------------------------------------------------------------------------
+# import
+# ---------------------------------------------------------------------------
+
+
+class Import(object):
+    """
+      Apply the rows of a file in chunks, counting the outcome of each row and writing the rows which fail
+      to the error file and a line describing each chunk to the progress file.
+    """
+    def __init__(self, F5, uri=None, method="POST", body=None, exclude=(), chunk_size=1000, concurrency=8,
+                 strategy="optimistic", transaction=False, validate=True, error_file=None, progress_file=None):
+        self.F5 = F5
+        self.uri = uri
+        self.method = method
+        self.body = body
+        self.exclude = exclude
+        self.chunk_size = chunk_size
+        self.concurrency = concurrency
+        self.strategy = strategy
+        self.transaction = transaction
+        self.validate = validate
+        self.error_file = error_file
+        self.progress_file = progress_file
+        self.existing = dict()                             # names in each collection, for the prefetch strategy
+        self.lock = threading.Lock()
+        self.summary = dict(rows=0, chunks=0, changed=0, failed=0, round_trips=0, elapsed=0.0, rows_per_second=0.0)
+        self.errors = None
+        self.start = None
+
+    def run(self, rows):
+        " Apply the (row number, row) of rows, return the summary"
+        self.start = time.time()
+        if self.error_file:
+            self.errors = open(self.error_file, "w")
+        try:
+            if self.transaction:
+                from multiprocessing.pool import ThreadPool
+                group = max(1, self.concurrency)           # chunks queued in transactions at a time
+                pool = ThreadPool(group)
+                try:
+                    for chunk_group in chunks(chunks(rows, self.chunk_size), group):
+                        for chunk, results in zip(chunk_group, pool.map(self.apply_transaction, chunk_group)):
+                            self.report(chunk, results)
+                finally:
+                    pool.close()
+                    pool.join()
+            else:
+                for chunk in chunks(rows, self.chunk_size):
+                    self.report(chunk, self.apply_chunk(chunk))
+        finally:
+            if self.errors:
+                self.errors.close()
+        return self.summary
+
+    def items(self, chunk):
+        """ Return the (uri, body, method) of the rows of the chunk which could be rendered, and a list of the
+            results, a failed result for the rows which could not be, None for the others
+        """
+        items = []
+        results = []
+        for number, row in chunk:
+            try:
+                if isinstance(row, Exception):
+                    raise row
+                items.append(row_item(row, self.uri, self.method, self.body, self.exclude))
+                results.append(None)
+            except (KeyError, IndexError, ValueError) as e:
+                results.append(dict(failed=True, changed=False, round_trips=0, msg="%s: %s" % (type(e).__name__, e)))
+        return items, results
+
+    def prefetch(self, items):
+        " For the prefetch strategy, request the names of the collections not yet requested"
+        if self.strategy != "prefetch":
+            return None
+        with self.lock:                                    # chunks are queued in transactions concurrently
+            missing = [item for item in items if item[0] not in self.existing]
+            if missing:
+                self.existing.update(prefetch_names(self.F5, missing))
+        return self.existing
+
+    def merge(self, results, applied):
+        " Return results with the None entries replaced by the results of the items applied"
+        applied = iter(applied)
+        return [result if result is not None else next(applied) for result in results]
+
+    def apply_chunk(self, chunk):
+        items, results = self.items(chunk)
+        existing = self.prefetch(items)
+        return self.merge(results, apply_items(self.F5, items, concurrency=self.concurrency,
+                                               strategy=self.strategy, existing=existing))
+
+    def apply_transaction(self, chunk):
+        """ Queue the rows of the chunk in a transaction of its own, on an instance spawned from F5 so the
+            chunks can be queued concurrently. If the transaction is not committed, every row failed.
+        """
+        items, results = self.items(chunk)
+        if not items:
+            return results
+        existing = self.prefetch(items)
+        F5 = self.F5.spawn(self.F5.uri, self.F5.method)
+        applied, summary = apply_transaction(F5, items, validate=self.validate, strategy=self.strategy,
+                                             existing=existing)
+        if any(result["failed"] for result in applied) or (summary["queued"] and not summary["committed"]):
+            applied = [dict(result, failed=True, changed=False, msg=summary.get("msg")) for result in applied]
+            applied += [dict(failed=True, changed=False, round_trips=0, msg=summary.get("msg"))] * (len(items) - len(applied))
+        return self.merge(results, applied)
+
+    def report(self, chunk, results):
+        " Count the outcome of each row, write the rows which failed and the progress of the import"
+        failed = 0
+        for (number, row), result in zip(chunk, results):
+            self.summary["round_trips"] += result.get("round_trips", 0)
+            if result["changed"]:
+                self.summary["changed"] += 1
+            if not result["failed"]:
+                continue
+            failed += 1
+            if self.errors:
+                error = dict(row=number, uri=result.get("uri"), status_code=result.get("status_code"),
+                             msg=result.get("msg") or result.get("content"))
+                error["data"] = str(row) if isinstance(row, Exception) else row
+                self.errors.write(json.dumps(error) + "\n")
+
+        elapsed = time.time() - self.start
+        self.summary["rows"] += len(chunk)
+        self.summary["chunks"] += 1
+        self.summary["failed"] += failed
+        self.summary["elapsed"] = round(elapsed, 3)
+        self.summary["rows_per_second"] = round(self.summary["rows"] / elapsed, 1) if elapsed else 0.0
+        if self.progress_file:
+            with open(self.progress_file, "a") as progress:
+                progress.write(json.dumps(dict(self.summary, chunk=self.summary["chunks"], chunk_rows=len(chunk),
+                                               chunk_failed=failed, timestamp=time.time())) + "\n")
+
+# ---------------------------------------------------------------------------
+# MAIN
+# ---------------------------------------------------------------------------
+
+
+def main():
+    "   "
+    from ansible.module_utils.basic import AnsibleModule
+    module = AnsibleModule(
+        argument_spec=dict(
+            host=dict(required=True),
+            username=dict(required=True),
+            password=dict(required=True, no_log=True),
+            token_cache=dict(required=False, type='path'),
+            src=dict(required=True, type='path'),
+            format=dict(required=False, choices=['csv', 'jsonl']),
+            uri=dict(required=False),
+            body=dict(required=False, type='raw'),
+            exclude=dict(required=False, default=[], type='list'),
+            method=dict(required=False, default='POST'),
+            chunk_size=dict(required=False, default=1000, type='int'),
+            concurrency=dict(required=False, default=8, type='int'),
+            strategy=dict(required=False, default='optimistic', choices=['check', 'optimistic', 'prefetch']),
+            transaction=dict(required=False, default=False, type='bool'),
+            validate=dict(required=False, default=True, type='bool'),
+            error_file=dict(required=False, type='path'),
+            progress_file=dict(required=False, type='path'),
+            **common_argument_spec()
+        ),
+        check_invalid_arguments=False,
+        add_file_common_args=True
+    )
+
+    body = module.params["body"]
+    if body and not isinstance(body, dict):
+        try:
+            body = json.loads(body)
+        except ValueError as e:
+            module.fail_json(msg="body is not valid JSON: %s" % e)
+
+    token_cache = None
+    if module.params["token_cache"]:
+        token_cache = TokenCache(module.params["token_cache"])
+    F5 = BIG_IP(host=module.params["host"], username=module.params["username"],
+                password=module.params["password"], uri=module.params["uri"] or "/",
+                method=module.params["method"].upper(),
+                pool_size=max(BIG_IP.POOL_SIZE, module.params["concurrency"]),
+                token_cache=token_cache,
+                **client_options(module.params))
+
+    bulk = Import(F5, uri=module.params["uri"], method=module.params["method"].upper(), body=body,
+                  exclude=module.params["exclude"], chunk_size=module.params["chunk_size"],
+                  concurrency=module.params["concurrency"], strategy=module.params["strategy"],
+                  transaction=module.params["transaction"], validate=module.params["validate"],
+                  error_file=module.params["error_file"], progress_file=module.params["progress_file"])
+    try:
+        summary = bulk.run(read_rows(module.params["src"], module.params["format"]))
+    except (IOError, OSError, csv.Error) as e:
+        module.fail_json(msg="%s: %s" % (module.params["src"], e), ansible_facts=dict(bulk_import=bulk.summary))
+
+    if summary["failed"]:
+        module.fail_json(msg="%s of %s rows failed" % (summary["failed"], summary["rows"]), changed=bool(summary["changed"]),
+                         ansible_facts=dict(bulk_import=summary), metrics=F5.metrics.summary())
+    module.exit_json(changed=bool(summary["changed"]), ansible_facts=dict(bulk_import=summary),
+                     connections=F5.connection_stats(), metrics=F5.metrics.summary())
+
+
+if __name__ == '__main__':
+    main()
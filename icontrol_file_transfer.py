@@ -0,0 +1,666 @@
+#!/usr/bin/env python
+#
+"""
+     Copyright (c) 2026 World Wide Technology, Inc.
+     All rights reserved.
+
+     Revision history:
+     17 October 2026  |  1.0 - initial release, UCS archive download in parallel Content-Range chunks
+     17 October 2026  |  1.1 - upload, e.g. certificates, iFiles and UCS archives to be restored
+     17 October 2026  |  1.2 - requests and ThreadPool are imported when a transfer starts
+     17 October 2026  |  1.3 - resume the download of the same archive only, verified before it is renamed
+     17 October 2026  |  1.4 - BIG_IP is imported from ansible.module_utils
+     17 October 2026  |  1.5 - names must be file names, not paths, the upload state is kept for each name
+     17 October 2026  |  1.6 - retries, circuit breaker, connection broker and the governor shared by every fork
+     17 October 2026  |  1.7 - the client options and their documentation are shared, common_argument_spec
+
+"""
+DOCUMENTATION = '''
+---
+module: icontrol_file_transfer
+author: Joel W. King @joel_w_king
+version_added: "2.0"
+short_description: Transfer files to and from an F5 BIG_IP using the iControl REST file-transfer workers
+description:
+    - Download a UCS archive, optionally saving it first, from /mgmt/shared/file-transfer/ucs-downloads/.
+    - Upload a file, e.g. a certificate, an iFile or a UCS archive to be restored, to
+      /mgmt/shared/file-transfer/uploads/. The file is saved in /var/config/rest/downloads/ on the BIG_IP.
+      Each chunk is streamed from disk as it is sent, the file is never read into memory. The sha256 of each
+      chunk is saved to src.<host>.<name>.state as the chunk is accepted, so an interrupted upload resumes with the
+      chunks not yet accepted, or which have changed since.
+    - The file is transferred in chunks, each request specifying the bytes of its chunk in a Content-Range header.
+      Chunks are requested concurrently and written to disk as they are received, to a file named dest with .part
+      appended. The sha256 of each chunk is saved to a state file as the chunk is written, so an interrupted
+      transfer resumes with the chunks it did not complete; the chunks saved are checked before resuming.
+      The state is keyed by the sha256 of the archive on the BIG_IP, so the chunks of a different archive
+      of the same name are not resumed. When the transfer is complete, and its sha256 verified, the file is
+      renamed to dest and the state file removed. If the sha256 differs, the .part and state files are kept.
+    - The sha256 of the file is returned, and compared with the sha256 of the file on the BIG_IP when
+      verify_checksum is true, using /mgmt/tm/util/bash.
+
+notes:
+    - iControl(tm) REST API User Guide Version 12.0
+    - the file-transfer workers accept at most 1 MB in a request
+    - set concurrency to 1 if the upload worker of the BIG_IP version requires the chunks in order
+    - a chunk is retried after a read timeout as well, it is written at its offset
+
+requirements:
+    - ansible-f5/module_utils/icontrol_client.py and icontrol_config.py from https://github.com/joelwking
+
+extends_documentation_fragment:
+    - icontrol_client
+    - icontrol_client.transport
+
+options:
+    host:
+        description:
+            - The IP address or hostname of the F5 appliance
+        required: true
+    username:
+        description:
+            - Login username
+        required: true
+    password:
+        description:
+            - Login password
+        required: true
+    token_cache:
+        description:
+            - path of a file where authentication tokens are cached, see icontrol_install_config
+        required: false
+    direction:
+        description:
+            - download or upload
+        required: false
+        default: download
+        choices: ['download', 'upload']
+    ucs:
+        description:
+            - name of the UCS archive in /var/local/ucs, .ucs is appended if missing, required to download
+            - letters, digits, _, . and - only, not a path
+        required: false
+    create:
+        description:
+            - save the UCS archive before downloading it, rather than downloading an existing archive
+            - the archive is not saved again when an interrupted download of dest is resumed
+        required: false
+        default: true
+    dest:
+        description:
+            - path of the file downloaded, required to download
+        required: false
+    src:
+        description:
+            - path of the file uploaded, required to upload
+        required: false
+    name:
+        description:
+            - name of the file uploaded in /var/config/rest/downloads
+            - letters, digits, _, . and - only, not a path
+        required: false
+        default: the file name of src
+    chunk_size:
+        description:
+            - bytes requested in each request, at most 1048576
+        required: false
+        default: 1048576
+    concurrency:
+        description:
+            - number of chunks transferred at a time
+        required: false
+        default: 4
+    verify_checksum:
+        description:
+            - compare the sha256 of the file with the sha256 of the file on the BIG_IP
+            - an interrupted download is resumed only if the sha256 of the archive on the BIG_IP is known,
+              whether or not verify_checksum is true
+        required: false
+        default: true
+    read_timeout:
+        description:
+            - seconds to wait for a response, saving a large UCS archive may take several minutes
+        required: false
+        default: 600
+'''
+
+EXAMPLES = '''
+
+  - name: Save a UCS archive and download it, resuming if a previous download was interrupted
+    icontrol_file_transfer:
+      ucs: "{{inventory_hostname}}_backup"
+      dest: "/backups/{{inventory_hostname}}_backup.ucs"
+      concurrency: 8
+      host: "{{inventory_hostname}}"
+      username: admin
+      password: "{{password}}"
+    delegate_to: localhost
+
+  - name: show the throughput
+    debug: msg="{{transfer.bytes}} bytes at {{transfer.mb_per_second}} MB/s sha256 {{transfer.sha256}}"
+
+  - name: Upload a certificate, in 512 KB chunks
+    icontrol_file_transfer:
+      direction: upload
+      src: "certificates/www.example.net.crt"
+      chunk_size: 524288
+      host: "{{inventory_hostname}}"
+      username: admin
+      password: "{{password}}"
+    delegate_to: localhost
+
+'''
+
+import os
+import re
+import json
+import time
+import hashlib
+import threading
+
+try:
+    from ansible.module_utils.icontrol_client import TokenCache, common_argument_spec, client_options
+    from ansible.module_utils.icontrol_config import BIG_IP
+except ImportError:                                        # outside Ansible, module_utils is in this directory
+    from module_utils.icontrol_client import TokenCache, common_argument_spec, client_options
+    from module_utils.icontrol_config import BIG_IP
+
+UCS_URI = "/mgmt/tm/sys/ucs"
+UCS_DIRECTORY = "/var/local/ucs/"
+DOWNLOAD_URI = "/mgmt/shared/file-transfer/ucs-downloads/"
+UPLOAD_URI = "/mgmt/shared/file-transfer/uploads/"
+UPLOAD_DIRECTORY = "/var/config/rest/downloads/"
+BASH_URI = "/mgmt/tm/util/bash"
+CHUNK_SIZE = 1024 * 1024                                   # the largest chunk accepted by the file-transfer workers
+BLOCK = 64 * 1024                                          # bytes read from, or written to, disk at a time
+NAME = re.compile(r"^(?!\.+$)[\w.-]+$")                    # a file name, not a path, safe in a shell command
+
+# ---------------------------------------------------------------------------
+# chunks and their state
+# ---------------------------------------------------------------------------
+
+
+def chunk_ranges(size, chunk_size):
+    " Return a list of (index, start, end) of the chunks of a file of size bytes, end is inclusive"
+    return [(index, start, min(size, start + chunk_size) - 1) for index, start in enumerate(range(0, size, chunk_size))]
+
+
+def file_digest(path, start=0, length=None):
+    " Return the sha256 of length bytes of the file, from start, or the rest of the file, reading a block at a time"
+    digest = hashlib.sha256()
+    with open(path, "rb") as source:
+        source.seek(start)
+        while length is None or length > 0:
+            block = source.read(BLOCK if length is None else min(BLOCK, length))
+            if not block:
+                break
+            digest.update(block)
+            if length is not None:
+                length -= len(block)
+    return digest.hexdigest()
+
+
+def state_file(path):
+    " The state of the transfer of a file, beside the file"
+    return path + ".state"
+
+
+class TransferState(object):
+    """
+      The chunks of a transfer which are complete, and the sha256 of each, saved in a file beside the file
+      transferred as each chunk completes. A transfer of the same file, its identity, e.g. the sha256 of the
+      file on the BIG_IP, of the same size in chunks of the same size resumes with the chunks which are not
+      in the state.
+    """
+    def __init__(self, path, size, chunk_size, identity=None):
+        self.path = path
+        self.lock = threading.Lock()
+        self.state = dict(size=size, chunk_size=chunk_size, identity=identity, chunks=dict())
+
+    def load(self):
+        " Load the chunks of a previous transfer of the same file, return the number of chunks"
+        try:
+            with open(self.path) as source:
+                state = json.load(source)
+        except (IOError, OSError, ValueError):
+            return 0
+        if all(state.get(key) == self.state[key] for key in ("size", "chunk_size", "identity")):
+            self.state["chunks"] = state.get("chunks", dict())
+        return len(self.state["chunks"])
+
+    def digest(self, index):
+        return self.state["chunks"].get(str(index))
+
+    def complete(self, index, digest):
+        " Record the chunk as complete, replacing the state file atomically"
+        with self.lock:
+            if digest is None:
+                self.state["chunks"].pop(str(index), None)
+            else:
+                self.state["chunks"][str(index)] = digest
+            temporary = "%s.%s" % (self.path, os.getpid())
+            with open(temporary, "w") as output:
+                json.dump(self.state, output)
+            os.rename(temporary, self.path)
+
+    def remove(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def stale_chunks(state, path, chunks):
+    " Return the chunks not in the state of a previous transfer, or whose sha256 differs from the file on disk"
+    return [chunk for chunk in chunks
+            if state.digest(chunk[0]) is None or
+            state.digest(chunk[0]) != file_digest(path, chunk[1], chunk[2] - chunk[1] + 1)]
+
+
+def device_checksum(F5, path):
+    " Return the sha256 of the file on the BIG_IP, using util bash, or None. The name of the file must be valid_name"
+    directory, name = path.rsplit("/", 1)
+    if directory not in (UCS_DIRECTORY.rstrip("/"), UPLOAD_DIRECTORY.rstrip("/")) or not valid_name(name):
+        return None
+    body = json.dumps({"command": "run", "utilCmdArgs": "-c 'sha256sum %s'" % path})
+    if F5.request("POST", BASH_URI, body) != 200:
+        return None
+    match = re.match(r"^([0-9a-f]{64})\s", str(F5.response.get("commandResult", "")))
+    return match.group(1) if match else None
+
+
+def valid_name(name):
+    " A file name of letters, digits, _, . and -, which is not a path, e.g. ../config, and needs no quoting"
+    return bool(NAME.match(name or ""))
+
+
+def content_range(start, end, size):
+    return "%s-%s/%s" % (start, end, size)
+
+# ---------------------------------------------------------------------------
+# download
+# ---------------------------------------------------------------------------
+
+
+class Download(object):
+    """
+      Download a file from a file-transfer worker, e.g. /mgmt/shared/file-transfer/ucs-downloads/, in chunks.
+      The first request, of the first chunk, returns the size of the file in its Content-Range. The other
+      chunks are requested concurrently, each streamed to its offset of the .part file as it is received.
+
+      The state of a previous download is only resumed when its sha256, the file on the BIG_IP, is the
+      same; with a sha256 of None, the download starts again. When verify is true, the .part file is
+      renamed to dest only if its sha256 matches.
+    """
+    def __init__(self, F5, uri, dest, chunk_size=CHUNK_SIZE, concurrency=4, sha256=None, verify=False):
+        self.F5 = F5
+        self.uri = uri
+        self.dest = dest
+        self.part = dest + ".part"
+        self.sha256 = sha256
+        self.verify = verify
+        self.chunk_size = min(chunk_size, CHUNK_SIZE)
+        self.concurrency = concurrency
+        self.state = None
+        self.size = None
+        self.received = 0                                  # bytes received by this run
+        self.probed = 0                                    # 1 when the first chunk was written by the probe
+        self.lock = threading.Lock()
+
+    def request(self, start, end, size):
+        " Issue the request for the bytes start through end, return the response, its body not read, and timing"
+        URI = "%s%s%s" % (self.F5.transport, self.F5.host, self.uri)
+        return self.F5.send("GET", URI, headers={"Content-Range": content_range(start, end, size)}, read=False)
+
+    def write(self, r, start, end):
+        " Stream the body to the .part file at start, return its sha256, or None if it is not end - start + 1 bytes"
+        digest = hashlib.sha256()
+        length = 0
+        with open(self.part, "r+b") as output:
+            output.seek(start)
+            for block in r.iter_content(BLOCK):
+                digest.update(block)
+                output.write(block)
+                length += len(block)
+        with self.lock:
+            self.received += length
+        return digest.hexdigest() if length == end - start + 1 else None
+
+    def fetch(self, chunk):
+        """ Download the chunk, retrying as specified by the retry policy of F5.
+            Return the sha256 of the chunk, or the status code or exception of the last attempt.
+        """
+        index, start, end = chunk
+
+        def attempt():
+            began = time.time()
+            try:
+                r, timing = self.request(start, end, self.size)
+            except self.F5.transport_errors()[0] as e:
+                self.F5.metrics.record_error("GET", self.uri, began, e)
+                return e, True
+            began = time.time()
+            try:
+                if r.status_code != 200:
+                    timing["bytes_received"] += len(r.content)
+                    return r.status_code, r.status_code in self.F5.retry.status
+                digest = self.write(r, start, end)
+                timing["bytes_received"] += end - start + 1
+                return digest, digest is None              # a short read is retried
+            except self.F5.transport_errors()[0] as e:
+                return e, True
+            finally:
+                timing["download"] = round(time.time() - began, 6)
+                self.F5.metrics.record(timing)
+                r.close()
+
+        result = self.F5.retry.call(attempt, self.F5.metrics)
+        if isinstance(result, str):
+            self.state.complete(index, result)
+        return result
+
+    def probe(self):
+        """ Request the first chunk, so the size of the file is known, and prepare the .part file and state.
+            Return None, or a message describing why the download can not proceed.
+        """
+
+        def attempt():
+            began = time.time()
+            try:
+                r, timing = self.request(0, self.chunk_size - 1, 0)
+            except self.F5.transport_errors()[0] as e:
+                self.F5.metrics.record_error("GET", self.uri, began, e)
+                return str(e), True
+            try:
+                match = re.match(r"^\s*(\d+)-(\d+)/(\d+)\s*$", r.headers.get("Content-Range", ""))
+                if not match:
+                    return "%s %s" % (r.status_code, r.content[:200]), r.status_code in self.F5.retry.status
+                self.prepare(int(match.group(3)))
+                start, end = int(match.group(1)), int(match.group(2))
+                if r.status_code == 200 and start == 0 and end == min(self.size, self.chunk_size) - 1:
+                    self.state.complete(0, self.write(r, start, end))
+                    self.probed = 1
+                else:
+                    r.content                              # e.g. a 400 when the file is smaller than the chunk
+                return None, False
+            except self.F5.transport_errors()[0] as e:
+                return str(e), True
+            finally:
+                self.F5.metrics.record(timing)
+                r.close()
+
+        return self.F5.retry.call(attempt, self.F5.metrics)
+
+    def prepare(self, size):
+        " Load the state of a previous download of a file of this size, or create a sparse .part file of the size"
+        self.size = size
+        self.state = TransferState(state_file(self.dest), size, self.chunk_size, identity=self.sha256)
+        resume = self.sha256 and self.state.load()
+        if not resume or not os.path.exists(self.part) or os.path.getsize(self.part) != size:
+            self.state.state["chunks"] = dict()
+            with open(self.part, "wb") as output:
+                output.truncate(size)
+
+    def run(self):
+        """ Download the file, return a dictionary describing the transfer. The .part file is renamed to dest
+            when all the chunks are complete, and verified, the sha256 of the file is returned in sha256. If the
+            sha256 differs, the .part file and the state are kept.
+        """
+        start = time.time()
+        result = dict(path=self.dest, completed=False)
+        msg = self.probe()
+        if msg:
+            result["msg"] = msg
+            return result
+
+        chunks = chunk_ranges(self.size, self.chunk_size)
+        pending = stale_chunks(self.state, self.part, chunks)
+        result.update(bytes=self.size, chunks=len(chunks), resumed=len(chunks) - len(pending) - self.probed)
+        if pending:
+            from multiprocessing.pool import ThreadPool
+            pool = ThreadPool(max(1, min(self.concurrency, len(pending))))
+            try:
+                outcomes = pool.map(self.fetch, pending)
+            finally:
+                pool.close()
+                pool.join()
+            failed = [(chunk[0], outcome) for chunk, outcome in zip(pending, outcomes) if not isinstance(outcome, str)]
+            if failed:
+                result["msg"] = "%s chunks failed, e.g. chunk %s: %s" % (len(failed), failed[0][0], failed[0][1])
+                return result
+
+        result["sha256"] = file_digest(self.part)
+        if self.verify:
+            result["device_sha256"] = self.sha256
+            if result["sha256"] != self.sha256:
+                result["msg"] = "sha256 of %s differs from the BIG_IP" % self.part
+                return result
+        os.rename(self.part, self.dest)
+        self.state.remove()
+        elapsed = time.time() - start
+        result.update(completed=True, received=self.received, elapsed=round(elapsed, 3),
+                      mb_per_second=round(self.received / 1048576.0 / elapsed, 2) if elapsed else 0.0)
+        return result
+
+
+# ---------------------------------------------------------------------------
+# upload
+# ---------------------------------------------------------------------------
+
+
+class ChunkReader(object):
+    """
+      A file-like object of length bytes of the file from start. requests sends it as the body of a request
+      a block at a time, using its length as the Content-Length, so the chunk is not read into memory.
+      The sha256 of the bytes read is in digest.
+    """
+    def __init__(self, path, start, length):
+        self.source = open(path, "rb")
+        self.source.seek(start)
+        self.length = length
+        self.remaining = length
+        self.digest = hashlib.sha256()
+
+    def __len__(self):
+        return self.length
+
+    def read(self, size=-1):
+        if size is None or size < 0 or size > self.remaining:
+            size = self.remaining
+        block = self.source.read(size)
+        self.remaining -= len(block)
+        self.digest.update(block)
+        return block
+
+    def close(self):
+        self.source.close()
+
+
+class Upload(object):
+    """
+      Upload a file to the file-transfer worker /mgmt/shared/file-transfer/uploads/ in chunks, requested
+      concurrently, each POST specifying the bytes of the chunk in its Content-Range.
+    """
+    def __init__(self, F5, src, name=None, chunk_size=CHUNK_SIZE, concurrency=4):
+        self.F5 = F5
+        self.src = src
+        self.name = name or os.path.basename(src)
+        self.uri = UPLOAD_URI + self.name
+        self.chunk_size = min(chunk_size, CHUNK_SIZE)
+        self.concurrency = concurrency
+        self.size = os.path.getsize(src)
+        self.state = TransferState(state_file("%s.%s.%s" % (src, F5.BIG_IP_host, self.name)), self.size, self.chunk_size,
+                                   identity=self.name)
+        self.sent = 0                                      # bytes sent by this run
+        self.lock = threading.Lock()
+
+    def send(self, chunk):
+        """ Upload the chunk, retrying as specified by the retry policy of F5. A chunk is written at its
+            offset, so sending it again is harmless. Return the sha256 of the chunk, or the status code
+            or exception of the last attempt.
+        """
+        index, start, end = chunk
+        URI = "%s%s%s" % (self.F5.transport, self.F5.host, self.uri)
+        headers = {"Content-Type": "application/octet-stream", "Content-Range": content_range(start, end, self.size)}
+
+        def attempt():
+            reader = ChunkReader(self.src, start, end - start + 1)
+            began = time.time()
+            try:
+                r, timing = self.F5.send("POST", URI, body=reader, headers=headers)
+            except self.F5.transport_errors()[0] as e:
+                self.F5.metrics.record_error("POST", URI, began, e)
+                return e, True
+            finally:
+                reader.close()
+            self.F5.metrics.record(timing)
+            if r.status_code != 200:
+                return r.status_code, r.status_code in self.F5.retry.status
+            with self.lock:
+                self.sent += len(reader)
+            return reader.digest.hexdigest(), False
+
+        result = self.F5.retry.call(attempt, self.F5.metrics)
+        if isinstance(result, str):
+            self.state.complete(index, result)
+        return result
+
+    def run(self):
+        """ Upload the chunks which were not accepted by a previous run, return a dictionary describing the
+            transfer. The state is kept until the sha256 of the file is verified.
+        """
+        start = time.time()
+        result = dict(path=UPLOAD_DIRECTORY + self.name, completed=False)
+        if not self.size:
+            result["msg"] = "%s is empty" % self.src
+            return result
+
+        self.state.load()
+        chunks = chunk_ranges(self.size, self.chunk_size)
+        pending = stale_chunks(self.state, self.src, chunks)
+        result.update(bytes=self.size, chunks=len(chunks), resumed=len(chunks) - len(pending))
+        if pending:
+            from multiprocessing.pool import ThreadPool
+            pool = ThreadPool(max(1, min(self.concurrency, len(pending))))
+            try:
+                outcomes = pool.map(self.send, pending)
+            finally:
+                pool.close()
+                pool.join()
+            failed = [(chunk[0], outcome) for chunk, outcome in zip(pending, outcomes) if not isinstance(outcome, str)]
+            if failed:
+                result["msg"] = "%s chunks failed, e.g. chunk %s: %s" % (len(failed), failed[0][0], failed[0][1])
+                return result
+
+        elapsed = time.time() - start
+        result.update(completed=True, sent=self.sent, sha256=file_digest(self.src), elapsed=round(elapsed, 3),
+                      mb_per_second=round(self.sent / 1048576.0 / elapsed, 2) if elapsed else 0.0)
+        return result
+
+
+def upload_file(F5, src, name=None, chunk_size=CHUNK_SIZE, concurrency=4, verify_checksum=True):
+    """ Upload the file, return a dictionary describing the transfer. When the sha256 of the file on the
+        BIG_IP differs, the state is removed, so the next run uploads every chunk.
+    """
+    name = name or os.path.basename(src)
+    if not valid_name(name):
+        return dict(path=name, completed=False, msg="invalid name %s, use letters, digits, _, . and -" % name)
+    upload = Upload(F5, src, name=name, chunk_size=chunk_size, concurrency=concurrency)
+    result = upload.run()
+    if result["completed"] and verify_checksum:
+        result["device_sha256"] = device_checksum(F5, result["path"])
+        if result["device_sha256"] != result["sha256"]:
+            result.update(completed=False, msg="sha256 of %s differs from %s" % (result["path"], src))
+    if result["completed"] or result.get("device_sha256"):
+        upload.state.remove()
+    return result
+
+
+def create_ucs(F5, name):
+    " Save a UCS archive of the configuration, return True if it was saved"
+    return F5.request("POST", UCS_URI, json.dumps({"command": "save", "name": name})) == 200
+
+
+def ucs_name(name):
+    return name if name.endswith(".ucs") else name + ".ucs"
+
+
+def download_ucs(F5, name, dest, create=True, chunk_size=CHUNK_SIZE, concurrency=4, verify_checksum=True):
+    """ Optionally save the UCS archive, then download it. Return a dictionary describing the transfer.
+        The archive is not saved again when a previous download is to be resumed, as each save changes
+        the archive. The sha256 of the archive on the BIG_IP identifies the archive of the previous download.
+    """
+    name = ucs_name(name)
+    if not valid_name(name):
+        return dict(path=dest, completed=False, msg="invalid ucs %s, use letters, digits, _, . and -" % name)
+    resume = os.path.exists(state_file(dest))
+    if create and not resume and not create_ucs(F5, name):
+        return dict(path=dest, completed=False, msg="save of %s failed: %s %s" % (name, F5.status_code, F5.response))
+
+    sha256 = device_checksum(F5, UCS_DIRECTORY + name)
+    if verify_checksum and not sha256:
+        return dict(path=dest, completed=False, msg="sha256 of %s on the BIG_IP failed: %s %s" % (name, F5.status_code,
+                                                                                                  F5.response))
+    result = Download(F5, DOWNLOAD_URI + name, dest, chunk_size=chunk_size, concurrency=concurrency, sha256=sha256,
+                      verify=verify_checksum).run()
+    result["created"] = create and not resume
+    return result
+
+# ---------------------------------------------------------------------------
+# MAIN
+# ---------------------------------------------------------------------------
+
+
+def main():
+    "   "
+    from ansible.module_utils.basic import AnsibleModule
+    module = AnsibleModule(
+        argument_spec=dict(
+            host=dict(required=True),
+            username=dict(required=True),
+            password=dict(required=True, no_log=True),
+            token_cache=dict(required=False, type='path'),
+            direction=dict(required=False, default='download', choices=['download', 'upload']),
+            ucs=dict(required=False),
+            create=dict(required=False, default=True, type='bool'),
+            dest=dict(required=False, type='path'),
+            src=dict(required=False, type='path'),
+            name=dict(required=False),
+            chunk_size=dict(required=False, default=CHUNK_SIZE, type='int'),
+            concurrency=dict(required=False, default=4, type='int'),
+            verify_checksum=dict(required=False, default=True, type='bool'),
+            read_timeout=dict(required=False, default=600, type='int'),
+            **common_argument_spec()
+        ),
+        check_invalid_arguments=False,
+        add_file_common_args=True
+    )
+
+    if module.params["direction"] == "download" and not (module.params["ucs"] and module.params["dest"]):
+        module.fail_json(msg="ucs and dest are required to download")
+    if module.params["direction"] == "upload" and not module.params["src"]:
+        module.fail_json(msg="src is required to upload")
+
+    token_cache = None
+    if module.params["token_cache"]:
+        token_cache = TokenCache(module.params["token_cache"])
+    F5 = BIG_IP(host=module.params["host"], username=module.params["username"],
+                password=module.params["password"],
+                pool_size=max(BIG_IP.POOL_SIZE, module.params["concurrency"]),
+                timeout=(BIG_IP.TIMEOUT[0], module.params["read_timeout"]),
+                token_cache=token_cache,
+                **client_options(module.params))
+    F5.authenticate()
+
+    if module.params["direction"] == "upload":
+        result = upload_file(F5, module.params["src"], name=module.params["name"],
+                             chunk_size=module.params["chunk_size"], concurrency=module.params["concurrency"],
+                             verify_checksum=module.params["verify_checksum"])
+    else:
+        result = download_ucs(F5, module.params["ucs"], module.params["dest"], create=module.params["create"],
+                              chunk_size=module.params["chunk_size"], concurrency=module.params["concurrency"],
+                              verify_checksum=module.params["verify_checksum"])
+    if not result["completed"]:
+        module.fail_json(msg=result.get("msg"), transfer=result, metrics=F5.metrics.summary())
+    module.exit_json(changed=True, transfer=result, connections=F5.connection_stats(), metrics=F5.metrics.summary())
+
+
+if __name__ == '__main__':
+    main()
@@ -9,6 +9,21 @@
      3 December 2015  |  1.1 - cosmetic and best practices updates.
      14 December 2016 |  1.2 - address name conflict with 'items'
      20 April 2017    |  1.3 - https://github.com/joelwking/ansible-f5/issues/2
+     17 October 2026  |  1.4 - paginated collection fetch using $top, $skip and nextLink
+     17 October 2026  |  1.5 - $select, $filter and expandSubcollections, report payload bytes
+     17 October 2026  |  1.6 - concurrent fact gathering from a list of hosts and URIs
+     17 October 2026  |  1.7 - token authentication using the token cache of icontrol_install_config
+     17 October 2026  |  1.8 - per request timing and transport metrics, optional JSONL trace file
+     17 October 2026  |  1.9 - connect and read timeouts, retries with backoff, circuit breaker per host
+     17 October 2026  |  2.0 - fact cache, revalidated using the generation of the objects
+     17 October 2026  |  2.1 - stream parse large collections to a JSONL file rather than returning them as facts
+     17 October 2026  |  2.2 - Connection is an icontrol_client.Client, icontrol_install_config is not imported
+     17 October 2026  |  2.3 - send requests through the connection broker, icontrol_broker, when it is running
+     17 October 2026  |  2.4 - adaptive governor of the rate and requests in flight to each host, shared by every fork
+     17 October 2026  |  2.5 - errors which are not JSON and connection errors while streaming are a failed result
+     17 October 2026  |  2.6 - the URIs of the hosts are fetched round robin, a worker never waits for a busy host
+     17 October 2026  |  2.7 - a cache miss is a single GET, the signature is the digest of the items fetched
+     17 October 2026  |  2.8 - the client options and their documentation are shared, common_argument_spec
 
  
 """
@@ -29,13 +44,23 @@ references:
       iControl REST API User Guide Version 12.0
 
 requirements:
-    - none
+    - ansible-f5/module_utils/icontrol_client.py from https://github.com/joelwking
+
+extends_documentation_fragment:
+    - icontrol_client
+    - icontrol_client.transport
 
 options:
     host:
         description:
             - The IP address or hostname of the F5 appliance
-        required: true
+            - required unless hosts is specified
+        required: false
+
+    hosts:
+        description:
+            - list of F5 appliances, facts are gathered from each host for each URI of uris concurrently
+        required: false
 
     username:
         description:
@@ -47,14 +72,103 @@ options:
             - Login password
         required: true
 
+    token_cache:
+        description:
+            - path of a file where authentication tokens are cached, keyed by host and username
+            - when specified, a token is obtained and shared with other module runs rather than using basic authentication
+        required: false
+
     uri:
         description:
             - URI to query for facts
-        required: true
+            - required unless uris is specified
+        required: false
+
+    uris:
+        description:
+            - list of URIs to query on each of the hosts
+        required: false
+
+    concurrency:
+        description:
+            - maximum number of requests in flight across all hosts when hosts or uris is specified
+        required: false
+        default: 10
+
+    host_concurrency:
+        description:
+            - maximum number of requests in flight to any one host when hosts or uris is specified
+        required: false
+        default: 2
+
+    page_size:
+        description:
+            - number of items requested per page using $top and $skip, the nextLink of each page is followed
+              until the collection is exhausted. By default the collection is requested in a single page.
+        required: false
+
+    select:
+        description:
+            - list of properties returned for each object, mapped to the OData $select query parameter
+        required: false
+
+    filter:
+        description:
+            - OData $filter expression evaluated by the BIG_IP, e.g. "partition eq Common"
+        required: false
+
+    expand_subcollections:
+        description:
+            - include subcollections, such as pool members, in the response rather than a reference to them
+        required: false
+        default: false
+
+    connect_timeout:
+        description:
+            - seconds to wait for the connection to the F5 appliance to be established
+        required: false
+        default: 10
+
+    read_timeout:
+        description:
+            - seconds to wait for each response, a large collection may take the BIG_IP some time to serialize
+        required: false
+        default: 300
+
+    fact_cache:
+        description:
+            - path of a file indexing the facts of previous requests, keyed by host, username, URI and query and
+              shared by module runs. The facts of each request are saved in the directory of the same name with .d appended
+            - facts saved less than cache_ttl seconds ago are returned without a request to the F5 appliance,
+              older facts are revalidated by requesting only the name and generation of each object, and only
+              if an object was created, modified or deleted is the URI requested again
+        required: false
+
+    cache_ttl:
+        description:
+            - seconds the facts are returned from the fact cache before they are revalidated
+        required: false
+        default: 60
+
+    cache_size:
+        description:
+            - maximum number of requests in the fact cache, the least recently used are evicted
+        required: false
+        default: 100
+
+    spill_path:
+        description:
+            - write the items of the collection to this file, one JSON object per line, rather than returning them
+              in bigip_items. Each page is parsed as it is received, so the collection is never held in memory.
+              bigip_items_file, bigip_items_count and bigip_items_summary (the count of each kind and partition)
+              are returned instead.
+            - when hosts or uris is specified, a directory, the file of each request is named by host and URI
+            - fact_cache is not used when spill_path is specified
+        required: false
 
     debug:
         description:
-            - debug switch
+            - debug switch, when true the timing of each request is included in metrics
         required: false
 
 
@@ -68,36 +182,106 @@ EXAMPLES = '''
         host: "{{inventory_hostname}}"
         username: admin
         password: "{{password}}"
+        page_size: 1000
 
     - name: debug output
       debug: msg="{{item.name}} {{item.fullPath}} {{item.pool}}"
       with_items: "{{bigip_items}}"
 
+    - name: Get only the properties used by the playbook, and the members of each pool
+      icontrol_gather_facts:
+        uri: "/mgmt/tm/ltm/pool"
+        select: [name, fullPath, membersReference]
+        filter: "partition eq Common"
+        expand_subcollections: true
+        host: "{{inventory_hostname}}"
+        username: admin
+        password: "{{password}}"
+
+    - name: Get facts, reusing those of a previous run while the configuration is unchanged
+      icontrol_gather_facts:
+        uri: "/mgmt/tm/ltm/virtual"
+        fact_cache: "~/.ansible/tmp/bigip_facts"
+        cache_ttl: 300
+        host: "{{inventory_hostname}}"
+        username: admin
+        password: "{{password}}"
+
+    - name: Write a very large collection to a file, rather than facts
+      icontrol_gather_facts:
+        uri: "/mgmt/tm/ltm/node"
+        page_size: 10000
+        spill_path: "/tmp/{{inventory_hostname}}_nodes.jsonl"
+        host: "{{inventory_hostname}}"
+        username: admin
+        password: "{{password}}"
+
+    - name: debug output
+      debug: msg="{{bigip_items_count}} nodes in {{bigip_items_file}}"
+
+    - name: Get facts from every BIG-IP in the group, results are keyed by host and URI
+      icontrol_gather_facts:
+        hosts: "{{groups['bigip']}}"
+        uris: ["/mgmt/tm/ltm/virtual", "/mgmt/tm/ltm/pool", "/mgmt/tm/sys/version"]
+        concurrency: 20
+        host_concurrency: 2
+        username: admin
+        password: "{{password}}"
+      delegate_to: localhost
+      run_once: true
+
+    - name: debug output
+      debug: msg="{{item.key}} {{item.value['/mgmt/tm/ltm/virtual'].elapsed}}"
+      with_dict: "{{bigip_matrix}}"
+
 
 '''
 
 
-import sys
+import os
+import re
 import time
 import json
-import requests
+import codecs
+import hashlib
+from collections import deque
+import threading
+try:
+    from urllib.parse import urlsplit
+except ImportError:
+    from urlparse import urlsplit                          # Python 2
+try:
+    from ansible.module_utils.icontrol_client import (Client, LockedStore, TokenCache, pooled_session,
+                                                      common_argument_spec, client_options)
+except ImportError:                                        # outside Ansible, module_utils is in this directory
+    from module_utils.icontrol_client import (Client, LockedStore, TokenCache, pooled_session,
+                                              common_argument_spec, client_options)
 
 # ---------------------------------------------------------------------------
 # F5 icontrol REST Connection Class
 # ---------------------------------------------------------------------------
-class Connection(object):
+class Connection(Client):
     """
       Connection class for Python to F5 REST calls
  
     """
-    def __init__(self, host="192.0.2.1", username="admin", password="redacted", debug=False):                    
-        self.transport = "https://"
-        self.appliance = host
-        self.username = username
-        self.password = password
-        self.debug = debug
-        self.HEADER = {"Content-Type": "application/json"}
+    PAGING = ("nextLink", "previousLink", "currentItemCount", "itemsPerPage", "pageIndex", "startIndex", "totalPages")
+
+    def __init__(self, host="192.0.2.1", username="admin", password="redacted", debug=False, session=None, token_cache=None,
+                 metrics=None, timeout=Client.TIMEOUT, retry=None, breaker=None, broker=None, governor=None):
+        Client.__init__(self, host=host, username=username, password=password, pool_size=1, timeout=timeout,
+                        session=session, token_cache=token_cache, metrics=metrics, retry=retry, breaker=breaker,
+                        broker=broker, governor=governor)
+        self.debug = debug                                 # pages are fetched over one keep-alive connection
+        self.status_code = None
+        self.collection = None
+        self.payload_bytes = 0                             # bytes of JSON received, and seconds spent parsing it
+        self.parse_time = 0.0
         return
+
+    @property
+    def appliance(self):
+        return self.host
 #
 #
 #
@@ -107,23 +291,345 @@ class Connection(object):
               curl -k -u admin:redacted -X GET https://192.0.2.1/mgmt/tm/ltm/virtual
 
         """
-        URI = "%s%s%s" % (self.transport, self.appliance, URI)
-        try:
-            r = requests.get(URI, auth=(self.username, self.password), headers=self.HEADER, verify=False)
-        except requests.ConnectionError as e:
-            return (False, e)
+        response = self.get_response(URI)
+        if isinstance(response, Exception):
+            return (False, response)
+
+        r, timing = response
+        self.payload_bytes += len(r.content)
+        start = time.time()
         content = json.loads(r.content)
+        timing["parse"] = round(time.time() - start, 6)
+        self.parse_time += timing["parse"]
+        if r.status_code not in self.retry.status:         # otherwise recorded by attempt
+            self.metrics.record(timing)
         return (r.status_code, content)
 
+    def get_response(self, URI, read=True):
+        """ GET the URI, retrying as specified by the retry policy, return a tuple of the response and its timing
+            or the exception raised by the last attempt. When read is False, the body is left to the caller to stream.
+        """
+        return self.exchange("GET", URI, read=read)
+
+    def iter_items(self, URI, page_size=None):
+        """
+            Generator of the items of a collection. When page_size is specified, pages of that many items are
+            requested using $top and $skip. The nextLink of each page is followed until the collection is exhausted,
+            so only one page is held in memory at a time.
+
+            The properties of the collection, other than items and the paging links, are saved in self.collection
+            and the status code of the last request in self.status_code. On error, self.collection is the response.
+        """
+        if page_size:
+            URI = add_query(URI, {"$top": page_size, "$skip": 0})
+
+        self.collection = None
+        while URI:
+            self.status_code, content = self.genericGET(URI)
+            if self.status_code != 200:
+                self.collection = content
+                return
+
+            items = content.pop("items", None)
+            URI = self.relative_link(content.get("nextLink"))
+            for key in Connection.PAGING:
+                content.pop(key, None)
+            if self.collection is None:
+                self.collection = content
+            if items is not None:
+                self.collection["items"] = True        # the collection contained items, even if this page was empty
+                for item in items:
+                    yield item
+
+    def stream_items(self, URI, page_size=None, chunk_size=65536):
+        """
+            Generator of the items of a collection, as iter_items, but the body of each page is parsed as it is
+            received rather than read and parsed as a whole, so at most one chunk and one item are held in memory.
+            The download time of each page includes the time the caller spends with the items.
+
+            The body of an error is parsed only if it is JSON, otherwise it is kept as text. If the connection fails
+            or the body is not valid JSON while the page is streamed, self.status_code is False and self.collection
+            the exception, as when no response is received.
+        """
+        if page_size:
+            URI = add_query(URI, {"$top": page_size, "$skip": 0})
+
+        self.collection = None
+        while URI:
+            response = self.get_response(URI, read=False)
+            if isinstance(response, Exception):
+                self.status_code, self.collection = False, response
+                return
+            r, timing = response
+            self.status_code = r.status_code
+            start = time.time()
+            parser = None
+            try:
+                if r.status_code != 200:
+                    content = r.content
+                    self.payload_bytes += len(content)
+                    timing["bytes_received"] += len(content)
+                    self.collection = self.error_body(content)
+                    return
+
+                parser = CollectionParser(r.iter_content(chunk_size))
+                try:
+                    for item in parser.items():
+                        yield item
+                except self.stream_errors() as e:
+                    self.status_code, self.collection = False, e
+                    return
+            finally:
+                timing["download"] = round(time.time() - start, 6)
+                if parser:
+                    self.payload_bytes += parser.received
+                    timing["bytes_received"] += parser.received
+                self.metrics.record(timing)
+                r.close()
+
+            content = parser.properties
+            URI = self.relative_link(content.get("nextLink"))
+            for key in Connection.PAGING:
+                content.pop(key, None)
+            if self.collection is None:
+                self.collection = content
+            if parser.found_items:
+                self.collection["items"] = True
+
+    def error_body(self, content):
+        " Return the body of an error, parsed if it is JSON, otherwise as text, a BIG_IP may return HTML"
+        try:
+            return json.loads(content)
+        except ValueError:
+            return content.decode("utf-8", "replace") if isinstance(content, bytes) else content
+
+    def stream_errors(self):
+        """ Return the exceptions raised while the body is streamed: the connection failing or timing out,
+            the chunked encoding broken off, or the body not valid JSON.
+        """
+        errors = sum(self.transport_errors(), ()) + (ValueError,)
+        if self.session is None:
+            return errors
+        import requests
+        return errors + (requests.RequestException,)
+
+    def relative_link(self, link):
+        " The BIG_IP returns links as https://localhost/mgmt/..., return the path and query to be used with this appliance"
+        if not link:
+            return None
+        link = urlsplit(link)
+        if link.query:
+            return "%s?%s" % (link.path, link.query)
+        return link.path
+
+
+class CollectionParser(object):
+    """
+      Incremental parser of a collection, {"kind": ..., "items": [{...}, ...], "nextLink": ...}, from the chunks
+      of bytes of the body. Each element of the items array is decoded as soon as it has been received and
+      yielded by items(), the other properties are saved in properties. Text already parsed is discarded as
+      each chunk is read.
+    """
+    WHITESPACE = " \t\r\n"
+
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.utf8 = codecs.getincrementaldecoder("utf-8")()
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.position = 0
+        self.eof = False
+        self.received = 0                                  # bytes of the body
+        self.properties = dict()
+        self.found_items = False
+
+    def read(self):
+        " Append the next chunk to the buffer. Return False if the body has been read"
+        if self.eof:
+            return False
+        try:
+            chunk = next(self.chunks)
+            self.received += len(chunk)
+            text = self.utf8.decode(chunk)
+        except StopIteration:
+            self.eof = True
+            text = self.utf8.decode(b"", True)
+        self.buffer = self.buffer[self.position:] + text
+        self.position = 0
+        return True
+
+    def skip(self, separators=""):
+        " Skip whitespace and separators, return the next character or None at the end of the body"
+        while True:
+            while self.position < len(self.buffer) and self.buffer[self.position] in CollectionParser.WHITESPACE + separators:
+                self.position += 1
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+            if not self.read():
+                return None
+
+    def expect(self, character):
+        if self.skip() != character:
+            raise ValueError("expected '%s' at offset %s of the response" % (character, self.received - len(self.buffer) + self.position))
+        self.position += 1
+
+    def value(self):
+        " Decode the JSON value at the position, reading chunks until it is complete"
+        self.skip()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.position)
+                if end < len(self.buffer) or self.eof:     # a number at the end of the buffer may continue in the next chunk
+                    self.position = end
+                    return value
+            except ValueError:
+                if self.eof:
+                    raise
+            self.read()
+
+    def items(self):
+        " Generator of the elements of the items array"
+        self.expect("{")
+        while self.skip(",") not in ("}", None):
+            key = self.value()
+            self.expect(":")
+            if key != "items" or self.skip() != "[":
+                self.properties[key] = self.value()
+                continue
+            self.position += 1
+            self.found_items = True
+            while True:
+                character = self.skip(",")
+                if character == "]":
+                    self.position += 1
+                    break
+                if character is None:
+                    raise ValueError("the response ended within the items")
+                yield self.value()
+        self.expect("}")
+
+
+class FactCache(object):
+    """
+      Facts of previous requests, keyed by host, username, URI and query, shared by module runs. The index is
+      a LockedStore, the facts of each entry are a JSON file in the directory path.d. Facts younger than ttl
+      seconds are returned without a request. Older facts are revalidated: the name and generation of each
+      object is requested, and compared with those when the facts were saved. mcpd increments the generation
+      whenever an object is modified, so the URI is only requested again if the configuration changed.
+      When there are more than size entries, the least recently used are evicted.
+    """
+    PROBE = ("name", "generation", "lastUpdateMicros")
+
+    def __init__(self, path, ttl=60, size=100):
+        self.store = LockedStore(path)
+        self.directory = os.path.expanduser(path) + ".d"
+        self.ttl = ttl
+        self.size = size
+        self.lock = threading.Lock()
+        self.stats = dict(hit=0, revalidated=0, miss=0)
+
+    def key(self, host, username, uri, query):
+        return hashlib.sha1(json.dumps([host, username, uri, query or {}], sort_keys=True).encode("utf-8")).hexdigest()
+
+    def count(self, outcome):
+        with self.lock:
+            self.stats[outcome] += 1
+        return outcome
+
+    def signature(self, F5, uri, query=None):
+        """ Request the name and generation of each object, honoring the $filter of the query, and return
+            a digest of them. Return None if the response has no generation to compare.
+        """
+        probe = dict((key, value) for key, value in (query or {}).items() if key == "$filter")
+        probe["$select"] = ",".join(FactCache.PROBE)
+        items = list(F5.iter_items(add_query(uri, probe)))
+        if F5.status_code != 200:
+            return None
+        return self.digest(items, F5.collection)
+
+    def digest(self, items, collection):
+        """ Return a digest of the name and generation of each item and of the collection, as signature
+            requests them, or None if there is no generation to compare.
+        """
+        versions = [[item.get(key) for key in FactCache.PROBE] for item in items]
+        versions.append([collection.get(key) for key in FactCache.PROBE])
+        if not any(version[1] is not None or version[2] is not None for version in versions):
+            return None
+        return hashlib.sha1(json.dumps(versions, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def lookup(self, key):
+        " Return the index entry of key, or None"
+        with self.store as index:
+            return index.get(key)
+
+    def load(self, key):
+        " Return the facts of key, marking the entry as used, or None if they are missing"
+        try:
+            with open(os.path.join(self.directory, key + ".json")) as facts:
+                facts = json.load(facts)
+        except (IOError, OSError, ValueError):
+            return None
+        with self.store as index:
+            if key in index:
+                index[key]["used"] = time.time()
+        return facts
+
+    def save(self, key, facts, signature):
+        " Save the facts of key and evict the least recently used entries"
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory)
+        path = os.path.join(self.directory, key + ".json")
+        temporary = "%s.%s.%s" % (path, os.getpid(), threading.current_thread().ident)
+        with os.fdopen(os.open(temporary, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w") as output:
+            json.dump(facts, output)
+        os.rename(temporary, path)
+
+        with self.store as index:
+            index[key] = dict(stored=time.time(), used=time.time(), signature=signature)
+            for evicted in sorted(index, key=lambda key: index[key]["used"])[:max(0, len(index) - self.size)]:
+                del index[evicted]
+                try:
+                    os.remove(os.path.join(self.directory, evicted + ".json"))
+                except OSError:
+                    pass
+
+    def revalidated(self, key):
+        " The configuration is unchanged, the facts are fresh for another ttl seconds"
+        with self.store as index:
+            if key in index:
+                index[key]["stored"] = index[key]["used"] = time.time()
+
+
+def build_query(select=None, filter=None, expand_subcollections=False):
+    " Return a dictionary of the OData query parameters used to project and filter the collection on the BIG_IP"
+    query = dict()
+    if select:
+        query["$select"] = ",".join(select)
+    if filter:
+        query["$filter"] = filter
+    if expand_subcollections:
+        query["expandSubcollections"] = "true"
+    return query
+
+
+def add_query(uri, parameters):
+    " Append the query parameters to the uri, the OData parameters ($top, $select...) are not URL encoded"
+    query = "&".join("%s=%s" % (key, value) for key, value in sorted(parameters.items()))
+    if "?" in uri:
+        return "%s&%s" % (uri, query)
+    return "%s?%s" % (uri, query)
+
 
 # ---------------------------------------------------------------------------
 # get_facts
 # ---------------------------------------------------------------------------
 
-def get_facts(F5, uri):
+def get_facts(F5, uri, page_size=None, query=None):
     """ 
         Issue a GET of the URI specified to the F5 appliance and return the result as facts.
         If the URI must have a slash as the first character, add it if missing
+        The items are appended to bigip_items as each page is received.
+        The query parameters, if any, are added to the URI. The bytes received are returned in payload_bytes.
 
         In Ansible 2.2 found name clashing
         http://stackoverflow.com/questions/40281706/cant-read-custom-facts-with-list-array-of-items
@@ -132,13 +638,224 @@ def get_facts(F5, uri):
                      
     if uri[0] != "/":
         uri = "/" + uri
-    
-    status, result["ansible_facts"]  = F5.genericGET(uri)
-    try:
-        result["ansible_facts"]["bigip_items"] = result["ansible_facts"].pop("items")   # replace key name of 'items' with 'bigip_items'
-    except:
+    if query:
+        uri = add_query(uri, query)
+
+    bigip_items = []
+    for item in F5.iter_items(uri, page_size=page_size):
+        bigip_items.append(item)
+
+    result["ansible_facts"] = F5.collection
+    result["payload_bytes"] = F5.payload_bytes
+    result["parse_time"] = F5.parse_time
+    if F5.status_code != 200:
+        return F5.status_code, result
+
+    if result["ansible_facts"].pop("items", False):        # replace key name of 'items' with 'bigip_items'
+        result["ansible_facts"]["bigip_items"] = bigip_items
+    else:
         result["ansible_facts"]["bigip_items"] = dict()
-    return status, result
+    return F5.status_code, result
+
+
+def spill_facts(F5, uri, path, page_size=None, query=None):
+    """
+        Write the items of the collection to path, one JSON object per line, as each page is received, rather than
+        returning them as facts. Return the facts of the collection, with the path, the number of items and a
+        summary of the count of each kind and partition in place of bigip_items. The file is replaced atomically.
+    """
+    result = {'ansible_facts': {}}
+    if uri[0] != "/":
+        uri = "/" + uri
+    if query:
+        uri = add_query(uri, query)
+
+    count = 0
+    summary = dict(kind=dict(), partition=dict())
+    temporary = "%s.%s.%s" % (path, os.getpid(), threading.current_thread().ident)
+    try:
+        with os.fdopen(os.open(temporary, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w") as output:
+            for item in F5.stream_items(uri, page_size=page_size):
+                output.write(json.dumps(item, separators=(",", ":")))
+                output.write("\n")
+                count += 1
+                for key in summary:
+                    value = item.get(key)
+                    if value is not None:
+                        summary[key][value] = summary[key].get(value, 0) + 1
+        if F5.status_code == 200:
+            os.rename(temporary, path)
+    finally:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+
+    result["ansible_facts"] = F5.collection
+    result["payload_bytes"] = F5.payload_bytes
+    if F5.status_code != 200:
+        return F5.status_code, result
+
+    result["ansible_facts"].pop("items", None)
+    result["ansible_facts"].update(bigip_items_file=path, bigip_items_count=count, bigip_items_summary=summary)
+    return F5.status_code, result
+
+
+def spill_file(directory, host, uri):
+    " Return the path of the file of a request of gather_matrix, named by host and URI"
+    return os.path.join(directory, re.sub(r"[^\w.-]+", "_", "%s%s" % (host, uri)).strip("_") + ".jsonl")
+
+
+def cached_facts(F5, cache, uri, page_size=None, query=None):
+    """
+        get_facts, using the facts in the FactCache while they are younger than its ttl, or when revalidated
+        the configuration is unchanged. The outcome, hit, revalidated or miss, is returned in cache.
+        The signature is only requested to revalidate an entry. On a miss, it is the digest of the items
+        fetched, the fields of which are added to a $select of the query and removed from the facts.
+    """
+    if uri[0] != "/":
+        uri = "/" + uri
+    key = cache.key(F5.appliance, F5.username, uri, query)
+    entry = cache.lookup(key)
+
+    if entry and time.time() - entry["stored"] < cache.ttl:
+        facts = cache.load(key)
+        if facts is not None:
+            return 200, dict(ansible_facts=facts, payload_bytes=0, parse_time=0.0, cache=cache.count("hit"))
+
+    if entry and entry["signature"]:                       # without a generation, the facts can not be revalidated
+        if cache.signature(F5, uri, query) == entry["signature"]:
+            facts = cache.load(key)
+            if facts is not None:
+                cache.revalidated(key)
+                return 200, dict(ansible_facts=facts, payload_bytes=F5.payload_bytes, parse_time=F5.parse_time,
+                                 cache=cache.count("revalidated"))
+
+    added = []
+    if query and query.get("$select"):
+        selected = query["$select"].split(",")
+        added = [field for field in FactCache.PROBE if field not in selected]
+        query = dict(query)
+        query["$select"] = ",".join(selected + added)
+    code, result = get_facts(F5, uri, page_size=page_size, query=query)
+    if code == 200:
+        facts = result["ansible_facts"]
+        items = facts["bigip_items"] if isinstance(facts["bigip_items"], list) else []
+        signature = cache.digest(items, facts)
+        for item in items:
+            for field in added:
+                item.pop(field, None)
+        cache.save(key, facts, signature)
+    result["cache"] = cache.count("miss")
+    return code, result
+
+# ---------------------------------------------------------------------------
+# gather_matrix
+# ---------------------------------------------------------------------------
+
+class Schedule(object):
+    """
+        The URIs remaining to be fetched from each host. take() returns the next (host, uri) of the hosts in
+        turn, round robin, from a host with fewer than host_concurrency requests in flight, waiting until
+        one is done if every host with URIs remaining is at its limit, and None when no URIs remain.
+    """
+    def __init__(self, hosts, uris, host_concurrency):
+        self.pending = [(host, deque(uris)) for host in hosts if uris]
+        self.in_flight = dict((host, 0) for host in hosts)
+        self.host_concurrency = max(1, host_concurrency)
+        self.condition = threading.Condition()
+
+    def take(self):
+        with self.condition:
+            while self.pending:
+                for index, (host, uris) in enumerate(self.pending):
+                    if self.in_flight[host] < self.host_concurrency:
+                        self.in_flight[host] += 1
+                        uri = uris.popleft()
+                        del self.pending[index]
+                        if uris:                           # to the back of the line
+                            self.pending.append((host, uris))
+                        return host, uri
+                self.condition.wait()
+            return None
+
+    def done(self, host):
+        with self.condition:
+            self.in_flight[host] -= 1
+            self.condition.notify_all()
+
+
+def gather_matrix(hosts, uris, username, password, page_size=None, query=None, concurrency=10, host_concurrency=2,
+                  token_cache=None, metrics=None, timeout=Client.TIMEOUT, retry=None, breaker=None, cache=None,
+                  spill=None, broker=None, governor=None):
+    """
+        Gather facts for every URI from every host, concurrently. At most concurrency requests are in
+        flight overall and host_concurrency to any one host. Requests to a host share one session, each
+        request uses its own Connection as the Connection saves the state of the request. A worker takes the
+        next URI of the hosts in turn, skipping a host which already has host_concurrency requests in flight,
+        so a worker never waits for one host while a request to another could be sent.
+
+        Return a dictionary keyed by host and URI of the status, elapsed time and facts of each request.
+        When spill, a directory, is specified the items of each request are written to a file in the directory.
+        When broker is specified, the sessions are those of the broker. When governor is specified, it also
+        limits the requests to each host, shared with every other fork.
+    """
+    if spill and not os.path.isdir(spill):
+        os.makedirs(spill)
+    sessions = dict()
+    for host in hosts:
+        sessions[host] = None if broker else pooled_session(host_concurrency, Connection.TRANSPORT)
+    schedule = Schedule(hosts, uris, host_concurrency)
+
+    def fetch(host, uri):
+        entry = dict()
+        F5 = Connection(host=host, username=username, password=password, session=sessions[host],
+                        token_cache=token_cache, metrics=metrics, timeout=timeout, retry=retry, breaker=breaker,
+                        broker=broker, governor=governor)
+        start = time.time()
+        try:
+            if spill:
+                code, response = spill_facts(F5, uri, spill_file(spill, host, uri), page_size=page_size, query=query)
+            elif cache:
+                code, response = cached_facts(F5, cache, uri, page_size=page_size, query=query)
+            else:
+                code, response = get_facts(F5, uri, page_size=page_size, query=query)
+        except ValueError as e:                            # the response was not JSON
+            code, response = F5.status_code, dict(ansible_facts=str(e))
+        entry["elapsed"] = time.time() - start
+        entry["status"] = code
+        if "cache" in response:
+            entry["cache"] = response["cache"]
+        if code == 200:
+            entry["payload_bytes"] = response["payload_bytes"]
+            entry.update(response["ansible_facts"])
+        else:
+            entry["msg"] = str(response["ansible_facts"])
+        return entry
+
+    def work(worker):
+        " Fetch URIs until none remain, return a list of (host, uri, entry)"
+        entries = []
+        while True:
+            request = schedule.take()
+            if request is None:
+                return entries
+            host, uri = request
+            try:
+                entries.append((host, uri, fetch(host, uri)))
+            finally:
+                schedule.done(host)
+
+    from multiprocessing.pool import ThreadPool
+    matrix = dict((host, dict()) for host in hosts)
+    workers = max(1, min(concurrency, len(hosts) * len(uris)))
+    pool = ThreadPool(workers)
+    try:
+        for entries in pool.imap_unordered(work, range(workers)):
+            for host, uri, entry in entries:
+                matrix[host][uri] = entry
+    finally:
+        pool.close()
+        pool.join()
+    return matrix
 
 # ---------------------------------------------------------------------------
 # MAIN
@@ -146,27 +863,86 @@ def get_facts(F5, uri):
 
 def main():
     "   "
+    from ansible.module_utils.basic import AnsibleModule
     module = AnsibleModule(
         argument_spec = dict(
-            host = dict(required=True),
+            host = dict(required=False),
+            hosts = dict(required=False, type='list'),
             username = dict(required=True),
             password  = dict(required=True, no_log=True),
-            uri  = dict(required=True),
-            debug = dict(required=False)
+            token_cache = dict(required=False, type='path'),
+            uri  = dict(required=False),
+            uris = dict(required=False, type='list'),
+            concurrency = dict(required=False, default=10, type='int'),
+            host_concurrency = dict(required=False, default=2, type='int'),
+            page_size = dict(required=False, type='int'),
+            select = dict(required=False, type='list'),
+            filter = dict(required=False),
+            expand_subcollections = dict(required=False, default=False, type='bool'),
+            connect_timeout = dict(required=False, default=10, type='float'),
+            read_timeout = dict(required=False, default=300, type='float'),
+            spill_path = dict(required=False, type='path'),
+            fact_cache = dict(required=False, type='path'),
+            cache_ttl = dict(required=False, default=60, type='int'),
+            cache_size = dict(required=False, default=100, type='int'),
+            debug = dict(required=False, default=False, type='bool'),
+            **common_argument_spec()
          ),
+        required_one_of=[
+            ['host', 'hosts'],
+            ['uri', 'uris']
+        ],
         check_invalid_arguments=False,
         add_file_common_args=True
     )
     
-    F5 = Connection(host=module.params["host"], username=module.params["username"], password=module.params["password"])
-    code, response = get_facts(F5, module.params["uri"])
+    query = build_query(select=module.params["select"], filter=module.params["filter"],
+                        expand_subcollections=module.params["expand_subcollections"])
+
+    token_cache = None
+    if module.params["token_cache"]:
+        token_cache = TokenCache(module.params["token_cache"])
+    options = client_options(module.params)                # metrics, retry, breaker, broker and governor
+    metrics = options["metrics"]
+    timeout = (module.params["connect_timeout"], module.params["read_timeout"])
+    cache = None
+    if module.params["fact_cache"]:
+        cache = FactCache(module.params["fact_cache"], ttl=module.params["cache_ttl"], size=module.params["cache_size"])
+    statistics = dict()
+    if cache:
+        statistics["cache"] = cache.stats
+
+    if module.params["hosts"] or module.params["uris"]:
+        hosts = module.params["hosts"] or [module.params["host"]]
+        uris = module.params["uris"] or [module.params["uri"]]
+        matrix = gather_matrix(hosts, uris, module.params["username"], module.params["password"],
+                               page_size=module.params["page_size"], query=query,
+                               concurrency=module.params["concurrency"],
+                               host_concurrency=module.params["host_concurrency"],
+                               token_cache=token_cache, timeout=timeout, cache=cache, spill=module.params["spill_path"],
+                               **options)
+        failed = [(host, uri) for host in matrix for uri in matrix[host] if matrix[host][uri]["status"] != 200]
+        if failed:
+            module.fail_json(msg="%s of %s requests failed" % (len(failed), len(hosts) * len(uris)),
+                             ansible_facts=dict(bigip_matrix=matrix), metrics=metrics.summary(), **statistics)
+        module.exit_json(ansible_facts=dict(bigip_matrix=matrix), metrics=metrics.summary(), **statistics)
+
+    F5 = Connection(host=module.params["host"], username=module.params["username"], password=module.params["password"],
+                    token_cache=token_cache, timeout=timeout, **options)
+    if module.params["spill_path"]:
+        code, response = spill_facts(F5, module.params["uri"], module.params["spill_path"], page_size=module.params["page_size"],
+                                     query=query)
+    elif cache:
+        code, response = cached_facts(F5, cache, module.params["uri"], page_size=module.params["page_size"], query=query)
+        response["cache"] = dict(cache.stats, outcome=response["cache"])
+    else:
+        code, response = get_facts(F5, module.params["uri"], page_size=module.params["page_size"], query=query)
 
     if code == 200:
-        module.exit_json(**response)
+        module.exit_json(metrics=metrics.summary(), **response)
     else:
-        module.fail_json(msg="status_code= %s %s" % (code, response))
+        module.fail_json(msg="status_code= %s %s" % (code, response), metrics=metrics.summary())
     
-from ansible.module_utils.basic import *
 
 if __name__ == '__main__':
     main()
@@ -25,6 +25,24 @@
      14 June   2016   |  3.5 - flake8 cosmetic changes
      31 August 2016   |  3.6 - added support for token authentication
      20 April  2017   |  3.7 - for Ansible 2.3 [WARNING]: Module did not set no_log for password
+     17 October 2026  |  3.8 - pooled keep-alive session, socket timeouts and connection reuse counters
+     17 October 2026  |  3.9 - batch mode, apply a list of items in one invocation with bounded concurrency
+     17 October 2026  |  4.0 - iControl REST transactions, validate and commit queued changes at once
+     17 October 2026  |  4.1 - token authentication with tokens cached on disk, headers are per instance
+     17 October 2026  |  4.2 - selectable create strategy, optimistic POST or prefetch of existing names
+     17 October 2026  |  4.3 - diff, compare with the existing object and PATCH only the fields which differ
+     17 October 2026  |  4.4 - per request timing and transport metrics, optional JSONL trace file
+     17 October 2026  |  4.5 - retries with jittered exponential backoff, deadline and circuit breaker per host
+     17 October 2026  |  4.6 - plan, order items by the objects they reference and apply each level concurrently
+     17 October 2026  |  4.7 - the REST client is in module_utils/icontrol_client.py, requests is imported when used
+     17 October 2026  |  4.8 - send requests through the connection broker, icontrol_broker, when it is running
+     17 October 2026  |  4.9 - adaptive governor of the rate and requests in flight to each host, shared by every fork
+     17 October 2026  |  5.0 - BIG_IP and the batch functions are in module_utils/icontrol_config.py, imported from ansible.module_utils
+     17 October 2026  |  5.1 - fail when the items of a plan depend on each other, rather than applying them out of order
+     17 October 2026  |  5.2 - fail with a message when an entry of items is not of the documented shape
+     17 October 2026  |  5.3 - round trips saved are counted against the GET and PATCH of the check strategy with diff
+     17 October 2026  |  5.4 - changed of a transaction is whether any item changed, none is opened when nothing changes
+     17 October 2026  |  5.5 - the client options and their documentation are shared, common_argument_spec
 """
 DOCUMENTATION = '''
 ---
@@ -44,10 +62,15 @@ description:
 
 notes:
     - iControl(tm) REST API User Guide Version 12.0
+    - a POST is not retried after a read timeout, as the BIG_IP may have created the object
 
 requirements:
     - none
 
+extends_documentation_fragment:
+    - icontrol_client
+    - icontrol_client.transport
+
 options:
     host:
         description:
@@ -65,10 +88,22 @@ options:
          description:
             - Login Token, if username and password are not defined
          required: false
+    token_cache:
+         description:
+            - path of a file where authentication tokens are cached, keyed by host and username
+            - when specified, a token is obtained using username and password, shared by concurrent and
+              subsequent module runs and refreshed before it expires, rather than using basic authentication
+         required: false
+    login_provider:
+         description:
+            - login provider used to obtain a token when token_cache is specified
+         required: false
+         default: tmos
     uri:
         description:
             - URI
-        required: true
+            - required unless every entry in items specifies its own uri
+        required: false
     method:
         description:
             - PATCH (update), DELETE, _POST_ or POST. POST is the default.
@@ -78,10 +113,84 @@ options:
             - string representation of JSON
             - e.g. '{"name":"NEW_WIDEIP","pools":[{"name":"NEW_POOL","partition":"Common","order":0,"ratio":1}]}'
         required: false
+    items:
+        description:
+            - list of objects to apply in a single invocation, using one session to the BIG_IP
+            - each entry is either a body (string or dictionary) applied to uri using method, or
+              a dictionary with keys uri, body and optionally method, or a list of [uri, body, method]
+        required: false
+    concurrency:
+        description:
+            - number of items applied in parallel when items is specified
+            - ignored when transaction is true, the order of the queued commands is the order of items
+        required: false
+        default: 1
+    strategy:
+        description:
+            - how a POST determines if the object exists and must be updated using PATCH instead
+            - check, issue a GET for the object before the POST or PATCH, two round trips per object
+            - optimistic, issue the POST and only when the BIG_IP reports the object exists (409) issue a PATCH,
+              one round trip to create an object. Not used with transaction, as queued requests are not
+              rejected until the commit, check is used instead.
+            - prefetch, GET the names in each collection of items once and decide locally, one round trip per
+              object plus one per collection
+        required: false
+        default: check
+        choices: [check, optimistic, prefetch]
+    diff:
+        description:
+            - compare the body with the existing object and PATCH only the fields which differ, or skip the PATCH
+              when nothing differs, so changed reflects an actual change
+            - partition prefixes of referenced objects (pool /Common/web and web), the case of booleans (True and
+              true, Enabled and enabled), the order of lists and properties which are absent on the BIG_IP and
+              requested with an empty value are considered equal, other text is compared exactly
+            - with method PATCH, the object is read with a GET before the PATCH
+        required: false
+        default: false
+    transaction:
+        description:
+            - queue the POST, PATCH and DELETE requests in an iControl REST transaction and commit them at once
+            - either all of the changes are applied or none are
+            - the transaction is opened by the first request queued, so when diff finds nothing to change no
+              transaction is opened and changed is false
+        required: false
+        default: false
+    validate:
+        description:
+            - validate the transaction on the BIG_IP before it is committed
+        required: false
+        default: true
+    plan:
+        description:
+            - order the items by the objects they reference, rather than applying them in the order specified.
+              A virtual references its pool, a pool its members' nodes and monitor, a pool member its pool and
+              node, a GTM pool member its server and a wide IP its pools. Items are grouped in levels, each level
+              only references objects of previous levels, and the items of each level are applied concurrently,
+              at most concurrency at a time. Items which reference an object which failed are not applied.
+            - with transaction, the items are queued in the order of the levels
+            - DELETE items are applied last, one at a time, in the order specified
+            - the module fails, applying none of the items, if items depend on each other
+        required: false
+        default: false
     debug:
         description:
-            - debug  switch, for future use.
+            - debug  switch, when true the timing of each request is included in metrics
         required: false
+    pool_size:
+        description:
+            - maximum number of keep-alive connections pooled to the BIG_IP
+        required: false
+        default: 10
+    connect_timeout:
+        description:
+            - seconds to wait when establishing a connection to the BIG_IP
+        required: false
+        default: 10
+    read_timeout:
+        description:
+            - seconds to wait for the BIG_IP to send a response
+        required: false
+        default: 300
 
 '''
 
@@ -114,6 +223,16 @@ EXAMPLES = '''
       username: admin
       password: "{{password}}"
 
+  - name: 31 Update LTM Node, authenticating with a cached token rather than basic authentication
+    icontrol_install_config:
+      uri: "/mgmt/tm/ltm/node/foo"
+      body: '{"description": "the quick brown fox jumped."}'
+      method: PATCH
+      host: "{{ltm.hostname}}"
+      username: admin
+      password: "{{password}}"
+      token_cache: "~/.ansible/f5_tokens.json"
+
   - name: 41 Delete LTM Node, body not specified with token
     icontrol_install_config:
       uri: "/mgmt/tm/ltm/node/bar"
@@ -146,286 +265,213 @@ EXAMPLES = '''
       username: admin
       password: "{{password}}"
 
-'''
-ANSIBLE_METADATA = {'metadata_version': '1.0',
-                    'status': ['preview'],
-                    'supported_by': 'community'}
-
-import json
-import requests
-import requests.packages.urllib3
-requests.packages.urllib3.disable_warnings()
-
-# ---------------------------------------------------------------------------
-# F5 icontrol REST Connection Class
-# ---------------------------------------------------------------------------
-
-
-class BIG_IP(object):
-    """
-      Connection class for Python to F5 BIG-IP iControl REST calls
-
-    """
-    HEADER = {"Content-Type": "application/json"}
-    TRANSPORT = "https://"
-
-    def __init__(self, host="192.0.2.1", username="admin", password="redacted", token=None, uri="/", method="POST", debug=False):
-        self.BIG_IP_host = host
-        self.username = username
-        self.password = password
-        self.token = self.configure_header(token)
-        self.uri = self.validate_uri(uri)
-        self.method = method
-        self.response = None
-        self.status_code = 0
-        self.changed = False
-        self.debug = debug
-
-        return
-
-    def configure_header(self, token):
-        BIG_IP.HEADER = {"Content-Type": "application/json","X-F5-Auth-Token": token}
-        return token
-
-    def validate_uri(self, uri):
-        " make certain the uri has a leading and trailing slash"
-
-        if uri[0] != "/":                                  # check leading slash
-            uri = "/" + uri
-
-        if uri[-1] != "/":                                 # check trailing slash
-            uri = uri + "/"
-
-        return uri
+  - name: 90 Create LTM Nodes in one invocation, four at a time
+    icontrol_install_config:
+      uri: "/mgmt/tm/ltm/node"
+      items: "{{spreadsheet}}"
+      concurrency: 4
+      host: "{{ltm.hostname}}"
+      username: admin
+      password: "{{password}}"
 
-    def genericDELETE(self):
-        """ Delete a resource from F5 BIG_IP, return True if deleted successfully, return False if
-            not. A return code of 200 does not populate the response, a 404 errors means the node
-            was not found, but the response is populated.
-            To delete a virtual server named foo, use https://192.0.2.1/mgmt/tm/ltm/virtual/foo
-        """
-        URI = "%s%s%s" % (BIG_IP.TRANSPORT, self.BIG_IP_host, self.uri)
-        try:
-            if self.token is None:
-                r = requests.delete(URI, auth=(self.username, self.password), headers=BIG_IP.HEADER, verify=False)
-            else:
-                r = requests.delete(URI, headers=BIG_IP.HEADER, verify=False)
-        except requests.ConnectionError as e:
-            self.status_code = 599
-            self.response = str(e)
-            return None
-        self.status_code = r.status_code
-        try:
-            self.response = r.json()                       # r.json() returns a dictionary
-        except ValueError:                                 # If you get a 200, throws a ValueError exception
-            self.response = None                           # there may not be a response
-
-        if r.status_code == 200:                           # a 200 means we successfully deleted
-            self.changed = True                            # we changed the state
-            return True
-        if r.status_code == 404:                           # a 404 error means the requested node was not found
-            return True                                    # because this is the desired state, return True
-        return False
-
-    def genericGET(self, uri=None):
-        """ Issue a GET request and return the results
-            We are using requests to issue a command similar to the following:
-              curl -k -u admin:redacted -X GET https://192.0.2.1/mgmt/tm/ltm/virtual
-        """
-        if not uri:
-            uri = self.uri
-
-        URI = "%s%s%s" % (BIG_IP.TRANSPORT, self.BIG_IP_host, uri)
-        try:
-            if self.token is None:
-                r = requests.get(URI, auth=(self.username, self.password), headers=BIG_IP.HEADER, verify=False)
-            else:
-                r = requests.get(URI, headers=BIG_IP.HEADER, verify=False)
-        except requests.ConnectionError as e:
-            self.status_code = 599
-            self.response = str(e)
-            return None
-        self.status_code = r.status_code
-        try:
-            self.response = r.json()                       # r.json() returns a dictionary
-        except ValueError:                                 # If you get a 404 error, throws a ValueError exception
-            self.response = None
-
-        if r.status_code == 200:
-            return True
-        return False
-
-    def genericPOST(self, body):
-        """
-            Use POST to create a new configuration object from a JSON body.
-        """
-        URI = "%s%s%s" % (BIG_IP.TRANSPORT, self.BIG_IP_host, self.uri)
-        try:
-            if self.token is None:
-                r = requests.post(URI, auth=(self.username, self.password), data=body, headers=BIG_IP.HEADER, verify=False)
-            else:
-                  r = requests.post(URI, data=body, headers=BIG_IP.HEADER, verify=False)
-        except requests.ConnectionError as e:
-            self.status_code = 599
-            self.response = str(e)
-            return None
-        self.status_code = r.status_code
-        try:
-            self.response = r.json()
-        except ValueError:
-            self.response = None
-
-        if r.status_code == 200:
-            self.changed = True
-            return True
-        return False
-
-    def genericPATCH(self, body):
-        """
-           PATCH to edit an existing configuration object with a JSON body.
-           Need to formulate the URL with the name as part of the URL and NAME must not be in the body
-        """
-        URI = "%s%s%s" % (BIG_IP.TRANSPORT, self.BIG_IP_host, self.uri)
-        try:
-            if self.token is None:
-                r = requests.patch(URI, auth=(self.username, self.password), data=body, headers=BIG_IP.HEADER, verify=False)
-            else:
-                r = requests.patch(URI, data=body, headers=BIG_IP.HEADER, verify=False)
-        except requests.ConnectionError as e:
-            self.status_code = 599
-            self.response = str(e)
-            return None
-        self.status_code = r.status_code
-        try:
-            self.response = r.json()
-        except ValueError:
-            self.response = None
-
-        if r.status_code == 200:
-            self.changed = True
-            return True
-        return False
-
-    def node_exists(self, body):
-        """ Return true or false if the node specified in the URL exists- status_code is a 404 if not found
-            Need to formulate a new URL by determining the name from the body and appending it to the URL
-        """
-        try:
-            body = json.loads(body)
-        except ValueError:
-            return None
+  - name: 91 Create a pool and add a member, each item specifies uri, body and method
+    icontrol_install_config:
+      items:
+        - uri: "/mgmt/tm/ltm/pool"
+          body: {"name": "NEW_POOL", "monitor": "/Common/http"}
+        - ["/mgmt/tm/ltm/pool/NEW_POOL/members", {"name": "foo:80"}, "POST"]
+      host: "{{ltm.hostname}}"
+      username: admin
+      password: "{{password}}"
 
-        try:
-            name = body["name"]
-        except KeyError:
-            return None
+  - name: 92 Create the nodes and pool in a single transaction
+    icontrol_install_config:
+      items:
+        - ["/mgmt/tm/ltm/node", {"name": "foo", "address": "192.0.2.65"}]
+        - ["/mgmt/tm/ltm/pool", {"name": "NEW_POOL", "members": [{"name": "foo:80"}]}]
+      transaction: true
+      host: "{{ltm.hostname}}"
+      username: admin
+      password: "{{password}}"
 
-        uri = self.uri + name                              # Now create a new URL with the uri and the name from the body.
-        return self.genericGET(uri=uri)
+  - name: 93 Create or update LTM Nodes, loading the existing names once rather than a GET per node
+    icontrol_install_config:
+      uri: "/mgmt/tm/ltm/node"
+      items: "{{spreadsheet}}"
+      strategy: prefetch
+      host: "{{ltm.hostname}}"
+      username: admin
+      password: "{{password}}"
 
-    def modify_url_and_body(self, body):
-        "Manipulate the URL and body to permit issueing a PATCH"
+  - name: 95 Create the objects of f5_wide_ip.yml, nodes then pool then members then virtual, in one task
+    icontrol_install_config:
+      items:
+        - ["/mgmt/tm/ltm/virtual", {"name": "NEW_VIP", "destination": "/Common/2.2.2.2:80", "pool": "/Common/NEW_POOL"}]
+        - ["/mgmt/tm/ltm/pool/NEW_POOL/members", {"name": "foo:80"}]
+        - ["/mgmt/tm/ltm/pool", {"name": "NEW_POOL", "monitor": "/Common/http"}]
+        - ["/mgmt/tm/ltm/node", {"name": "foo", "address": "192.0.2.65"}]
+        - ["/mgmt/tm/ltm/node", {"name": "bar", "address": "192.0.2.66"}]
+      plan: true
+      concurrency: 8
+      host: "{{ltm.hostname}}"
+      username: admin
+      password: "{{password}}"
 
-        try:
-            body = json.loads(body)                        # JSON string to dictiionary
-        except ValueError:
-            pass                                           # body assumed to be a dictionary
+  - name: 94 Update the description only if it differs, changed is false when the node already matches
+    icontrol_install_config:
+      uri: "/mgmt/tm/ltm/node"
+      body: '{"name": "foo", "address": "192.0.2.65", "description": "the quick brown fox jumped."}'
+      diff: true
+      host: "{{ltm.hostname}}"
+      username: admin
+      password: "{{password}}"
 
-        self.uri = self.uri + body['name']                 # add name to uri
-        del body['name']                                   # delete name from dictionary
-        body = json.dumps(body)                            # dictionary to JSON string
+'''
+ANSIBLE_METADATA = {'metadata_version': '1.0',
+                    'status': ['preview'],
+                    'supported_by': 'community'}
 
-        return body
+try:
+    from ansible.module_utils.icontrol_client import TokenCache, common_argument_spec, client_options
+    from ansible.module_utils.icontrol_config import (BIG_IP, FUNCTIONS, to_json, normalize_item, prefetch_names,
+                                                      install_function, apply_items, round_trip_summary, plan_levels,
+                                                      apply_plan, apply_transaction)
+except ImportError:                                        # outside Ansible, module_utils is in this directory
+    from module_utils.icontrol_client import TokenCache, common_argument_spec, client_options
+    from module_utils.icontrol_config import (BIG_IP, FUNCTIONS, to_json, normalize_item, prefetch_names,
+                                              install_function, apply_items, round_trip_summary, plan_levels,
+                                              apply_plan, apply_transaction)
 
 # ---------------------------------------------------------------------------
-# icontrol_install_config methods
+# MAIN
 # ---------------------------------------------------------------------------
 
 
-def install_config(F5, body):
-    """
-        If the node exists, attempt to issue PATCH, otherwise, issue POST. User has either specified
-        a POST or defaulted to POST.
-    """
-    if F5.node_exists(body):
-        body = F5.modify_url_and_body(body)
-        return F5.genericPATCH(body)
-    else:
-        return F5.genericPOST(body)
-
-
-def update_config(F5, body):
-    " Called with a PATCH method, attempt to update the configuration"
-    return F5.genericPATCH(body)
-
-
-def delete_config(F5, body):
-    " Attempt to delete the configuration specified by the URL, ignore the body"
-    return F5.genericDELETE()
-
-
-def POST_config(F5, body):
-    " POST command which does not fail back to PATCH if node exists"
-    return F5.genericPOST(body)
-
-
 def main():
     "   "
+    from ansible.module_utils.basic import AnsibleModule, env_fallback
+    argument_spec = {
+        'host': {'required': True, 'fallback': (env_fallback, ['F5_SERVER'])},
+        'username': {'type': 'str', 'fallback': (env_fallback, ['F5_USER'])},
+        'password': {'type': 'str', 'no_log': True, 'fallback': (env_fallback, ['F5_PASSWORD'])},
+        'token': {'type': 'str', 'no_log': True},
+        'token_cache': {'type': 'path'},
+        'login_provider': {'default': 'tmos', 'type': 'str'},
+        'uri': {'type': 'str'},
+        'body': {'default': {}, 'type': 'raw'},
+        'method': {'default': 'POST', 'type': 'str'},
+        'items': {'type': 'list'},
+        'concurrency': {'default': 1, 'type': 'int'},
+        'strategy': {'default': 'check', 'choices': ['check', 'optimistic', 'prefetch']},
+        'diff': {'default': False, 'type': 'bool'},
+        'transaction': {'default': False, 'type': 'bool'},
+        'validate': {'default': True, 'type': 'bool'},
+        'plan': {'default': False, 'type': 'bool'},
+        'debug': {'default': False, 'type': 'bool'},
+        'pool_size': {'default': BIG_IP.POOL_SIZE, 'type': 'int'},
+        'connect_timeout': {'default': BIG_IP.TIMEOUT[0], 'type': 'int'},
+        'read_timeout': {'default': BIG_IP.TIMEOUT[1], 'type': 'int'}
+    }
+    argument_spec.update(common_argument_spec())
     module = AnsibleModule(
-        argument_spec={
-            'host': {'required': True, 'fallback': (env_fallback, ['F5_SERVER'])},
-            'username': {'type': 'str', 'fallback': (env_fallback, ['F5_USER'])},
-            'password': {'type': 'str', 'no_log': True, 'fallback': (env_fallback, ['F5_PASSWORD'])},
-            'token': {'type': 'str'},
-            'uri': {'required': True, 'type': 'str'},
-            'body': {'default': {}, 'type': 'raw'},
-            'method': {'default': 'POST', 'type': 'str'},
-            'debug': {'default': False, 'type': 'bool'}
-        },
+        argument_spec=argument_spec,
         required_together=[
             ['username','password']
         ],
         required_one_of=[
-            ['username','token']
+            ['username','token'],
+            ['uri','items']
         ],
         check_invalid_arguments=False
     )
 
+    token_cache = None
+    if module.params["token_cache"]:
+        token_cache = TokenCache(module.params["token_cache"], login_provider=module.params["login_provider"])
+
     F5 = BIG_IP(host=module.params["host"],
                 username=module.params["username"],
                 password=module.params["password"],
                 token=module.params["token"],
-                uri=module.params["uri"],
+                uri=module.params["uri"] or "/",
                 method=module.params["method"].upper(),
-                debug=module.params["debug"])
+                debug=module.params["debug"],
+                pool_size=max(module.params["pool_size"], module.params["concurrency"]),
+                timeout=(module.params["connect_timeout"], module.params["read_timeout"]),
+                token_cache=token_cache,
+                diff=module.params["diff"],
+                **client_options(module.params))
+
+    method = module.params["method"].upper()
+    if module.params["items"]:
+        try:
+            items = [normalize_item(item, module.params["uri"], method) for item in module.params["items"]]
+        except ValueError as e:
+            module.fail_json(msg="Invalid items, %s" % e)
+    else:
+        items = [(module.params["uri"], to_json(module.params["body"]), method)]
 
-    # Case structure of the supported functions
-    functions = {"PATCH": update_config,
-                 "POST": install_config,
-                 "_POST_": POST_config,
-                 "DELETE": delete_config}
+    strategy = module.params["strategy"]
+    existing = None
+    if strategy == "prefetch" and module.params["items"]:
+        existing = prefetch_names(F5, items)
+    prefetch = F5.round_trips
+
+    if module.params["plan"]:
+        try:
+            plan_levels(items)
+        except ValueError as e:                            # a cycle, the items cannot be ordered
+            module.fail_json(msg="Plan failed, %s" % e)
+
+    if module.params["plan"] and module.params["transaction"]:
+        order = [index for level in plan_levels(items)[0] for index in level]
+        items = [items[index] for index in order]          # queued in the order of the levels
+
+    if module.params["transaction"]:
+        results, summary = apply_transaction(F5, items, validate=module.params["validate"],
+                                             strategy=strategy, existing=existing)
+        if any(result["failed"] for result in results) or (summary["queued"] and not summary["committed"]):
+            module.fail_json(msg="Transaction failed", results=results, transaction=summary, metrics=F5.metrics.summary())
+        module.exit_json(changed=any(result["changed"] for result in results), results=results, transaction=summary,
+                         connections=F5.connection_stats(),
+                         metrics=F5.metrics.summary(),
+                         round_trips=round_trip_summary(results, prefetch, F5.diff))
+
+    plan = None
+    if module.params["items"] and module.params["plan"]:
+        results, plan = apply_plan(F5, items, concurrency=module.params["concurrency"], strategy=strategy,
+                                   existing=existing)
+    elif module.params["items"]:
+        results = apply_items(F5, items, concurrency=module.params["concurrency"], strategy=strategy, existing=existing)
+    if module.params["items"]:
+        changed = any(result["changed"] for result in results)
+        failed = [result for result in results if result["failed"]]
+        if failed:
+            module.fail_json(msg="%s of %s items failed" % (len(failed), len(results)), changed=changed, results=results,
+                             plan=plan, metrics=F5.metrics.summary())
+        module.exit_json(changed=changed, results=results, plan=plan, connections=F5.connection_stats(),
+                         metrics=F5.metrics.summary(), round_trips=round_trip_summary(results, prefetch, F5.diff))
 
     try:
-        run_function = functions[module.params["method"].upper()]
+        run_function = FUNCTIONS[method]
     except KeyError:
         module.fail_json(msg="Invalid method")
 
-    body = module.params["body"]                           # body is a str when body: '{"name": "foo", "address": "192.0.2.63"}'
-    if isinstance(body, dict):                             # body is a dict when body: '{"name": "{{item.name}}"}'
-        body = json.dumps(body)
+    body = to_json(module.params["body"])                  # body is a str when body: '{"name": "foo", "address": "192.0.2.63"}'
+    if method == "POST":
+        run_function = install_function(strategy, F5.uri, body)
 
     ret_code = run_function(F5, body)
 
     if ret_code:
-        module.exit_json(changed=F5.changed, content=F5.response)
+        module.exit_json(changed=F5.changed, content=F5.response, changes=F5.changes, connections=F5.connection_stats(),
+                         metrics=F5.metrics.summary(),
+                         round_trips=round_trip_summary([dict(method=method, round_trips=F5.round_trips,
+                                                              changed=F5.changed)], diff=F5.diff))
     else:
-        module.fail_json(msg="%s %s" % (F5.status_code, F5.response))
+        module.fail_json(msg="%s %s" % (F5.status_code, F5.response), metrics=F5.metrics.summary())
     return
 
-try:
-    from ansible.module_utils.basic import *
-except ImportError:
-    pass                                                   # Also used outside Ansible framework
 
 if __name__ == '__main__':
     " Main program logic."
@@ -0,0 +1,883 @@
+#!/usr/bin/env python
+#
+"""
+     Copyright (c) 2026 World Wide Technology, Inc.
+     All rights reserved.
+
+     Revision history:
+     17 October 2026  |  1.0 - initial release, the REST client of icontrol_install_config and icontrol_gather_facts
+     17 October 2026  |  1.1 - send requests through the connection broker, icontrol_broker, when it is running
+     17 October 2026  |  1.2 - governor of the rate and requests in flight to each host, shared by every fork
+     17 October 2026  |  1.3 - a max_rate of 0 is no limit of the rate of the governor
+     17 October 2026  |  1.4 - the certificate is not verified even when REQUESTS_CA_BUNDLE or CURL_CA_BUNDLE is set
+     17 October 2026  |  1.5 - a body which is a file is sent through the broker, read into memory
+     17 October 2026  |  1.6 - the options shared by the modules, common_argument_spec and client_options
+
+     The iControl REST client shared by the modules in this repository: a pooled keep-alive session whose
+     requests are timed, token authentication with tokens cached on disk, retries and a circuit breaker.
+     Ansible includes this file with each module which imports it from ansible.module_utils, when it is in the
+     module_utils directory beside the playbook (or in the module_utils path of ansible.cfg).
+
+     Importing this file imports only the standard library. requests, which takes longer to import than
+     the rest of a module, is imported when the first session is created. When the requests are sent through
+     the connection broker, a session is not created, and requests is not imported.
+"""
+
+import os
+import json
+import errno
+import time
+import fcntl
+import random
+import socket
+import threading
+try:
+    from urllib.parse import urlsplit
+except ImportError:
+    from urlparse import urlsplit                          # Python 2
+
+# ---------------------------------------------------------------------------
+# Request instrumentation
+# ---------------------------------------------------------------------------
+
+TIMING = threading.local()                                 # connect time of the request in progress on this thread
+ADAPTER = []                                               # the TimedAdapter class, defined when first used
+
+
+def timed_adapter():
+    """ Return a pooling adapter class whose connections record the time taken to connect. The classes are
+        defined on first use, as they are subclasses of requests and urllib3 classes.
+    """
+    if ADAPTER:
+        return ADAPTER[0]
+
+    from requests.adapters import HTTPAdapter
+    from requests.packages.urllib3.connection import HTTPConnection, HTTPSConnection
+    from requests.packages.urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+    class TimedHTTPConnection(HTTPConnection):
+        " Record the time to establish a new connection, a reused connection does not call connect"
+        def connect(self):
+            start = time.time()
+            HTTPConnection.connect(self)
+            TIMING.connect = time.time() - start
+
+    class TimedHTTPSConnection(HTTPSConnection):
+        " Record the time to establish a new connection, including the TLS handshake"
+        def connect(self):
+            start = time.time()
+            HTTPSConnection.connect(self)
+            TIMING.connect = time.time() - start
+
+    class TimedHTTPConnectionPool(HTTPConnectionPool):
+        ConnectionCls = TimedHTTPConnection
+
+    class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+        ConnectionCls = TimedHTTPSConnection
+
+    class TimedAdapter(HTTPAdapter):
+        " A pooling adapter whose connections record the time taken to connect"
+        def init_poolmanager(self, *args, **kwargs):
+            HTTPAdapter.init_poolmanager(self, *args, **kwargs)
+            self.poolmanager.pool_classes_by_scheme = {"http": TimedHTTPConnectionPool, "https": TimedHTTPSConnectionPool}
+
+    ADAPTER.append(TimedAdapter)
+    return TimedAdapter
+
+
+def pooled_session(pool_size, transport="https://"):
+    """ Create a keep-alive session, connections to the BIG_IP are pooled and reused
+        across calls rather than paying for a TCP connection and TLS handshake on each request.
+        The certificate of the BIG_IP is not verified, so only that warning is disabled. verify is also
+        passed on each request, as requests replaces session.verify with REQUESTS_CA_BUNDLE or CURL_CA_BUNDLE
+        when either is set in the environment.
+    """
+    import requests
+    from requests.packages.urllib3.exceptions import InsecureRequestWarning
+    requests.packages.urllib3.disable_warnings(InsecureRequestWarning)
+
+    session = requests.Session()
+    session.verify = False
+    session.mount(transport, timed_adapter()(pool_connections=1, pool_maxsize=pool_size))
+    return session
+
+
+def header_size(first_line, headers):
+    " Approximate bytes of the request or status line and headers on the wire"
+    return len(first_line) + 2 + sum(len(key) + len(str(value)) + 4 for key, value in headers.items()) + 2
+
+
+def timed_request(session, method, URI, read=True, **kwargs):
+    """ Issue the request with the response streamed, so the time to the first byte (the BIG_IP processing
+        the request) and the time to download the body are measured separately. The body is read before
+        returning, releasing the connection to the pool, unless read is False; then the caller streams
+        the body and adds its download time and size to the timing.
+
+        Return a tuple of the response and a dictionary of the timing, the caller adds the parse time
+        and records it with Metrics.record.
+    """
+    TIMING.connect = None
+    start = time.time()
+    r = session.request(method, URI, stream=True, verify=False, **kwargs)
+    first_byte = time.time()
+    content = r.content if read else b""
+    done = time.time()
+
+    connect = TIMING.connect or 0.0
+    url = urlsplit(URI)
+    body = r.request.body or b""
+    entry = dict(timestamp=start, method=method, host=url.netloc, uri=url.path, status=r.status_code,
+                 reused=TIMING.connect is None,
+                 connect=round(connect, 6),
+                 ttfb=round(first_byte - start - connect, 6),
+                 download=round(done - first_byte, 6),
+                 parse=0.0,
+                 bytes_sent=header_size("%s %s HTTP/1.1" % (method, r.request.path_url), r.request.headers) + len(body),
+                 bytes_received=header_size("HTTP/1.1 %s %s" % (r.status_code, r.reason), r.headers) + len(content))
+    return r, entry
+
+
+class Metrics(object):
+    """
+      Timing and transport metrics of each request: time to connect (zero when the connection was reused),
+      time to the first byte of the response, time to download and parse the body, and bytes sent and received.
+      Shared by the instances spawned from a BIG_IP, and optionally appended to a JSONL trace file, so the
+      requests of every module run can be aggregated.
+    """
+    PHASES = ("connect", "ttfb", "download", "parse")
+
+    def __init__(self, trace_file=None, keep=False):
+        self.trace_file = trace_file
+        self.keep = keep                                   # keep each entry, to return them in the result
+        self.entries = []
+        self.totals = dict((phase, 0.0) for phase in Metrics.PHASES)
+        self.totals.update(requests=0, errors=0, retries=0, reused=0, bytes_sent=0, bytes_received=0, queued=0.0)
+        self.lock = threading.Lock()
+
+    def record(self, entry):
+        with self.lock:
+            self.totals["requests"] += 1
+            self.totals["queued"] += entry.get("queued", 0.0)    # waiting for the governor or the broker
+            if entry.get("error"):
+                self.totals["errors"] += 1
+            else:
+                for phase in Metrics.PHASES:
+                    self.totals[phase] += entry[phase]
+                self.totals["reused"] += entry["reused"]
+                self.totals["bytes_sent"] += entry["bytes_sent"]
+                self.totals["bytes_received"] += entry["bytes_received"]
+            if self.keep:
+                self.entries.append(entry)
+            if self.trace_file:
+                with open(os.path.expanduser(self.trace_file), "a") as trace:
+                    trace.write(json.dumps(dict(entry, pid=os.getpid())) + "\n")
+
+    def retried(self):
+        with self.lock:
+            self.totals["retries"] += 1
+
+    def record_error(self, method, URI, start, error):
+        " Record a request which did not receive a response"
+        url = urlsplit(URI)
+        self.record(dict(timestamp=start, method=method, host=url.netloc, uri=url.path, status=599,
+                         elapsed=round(time.time() - start, 6), error=str(error)))
+
+    def summary(self):
+        " Return the totals, and each request if they are kept, to be returned as the metrics of the module"
+        with self.lock:
+            summary = dict(self.totals)
+            for phase in Metrics.PHASES + ("queued",):
+                summary[phase] = round(summary[phase], 6)
+            if self.keep:
+                summary["entries"] = list(self.entries)
+        return summary
+
+# ---------------------------------------------------------------------------
+# Locked JSON file, shared by concurrent module runs
+# ---------------------------------------------------------------------------
+
+
+class LockedStore(object):
+    """
+      A dictionary stored as JSON in a file. The file is only read and written while holding an
+      exclusive lock, so forks running concurrently see each other's updates. Threads sharing the
+      store are serialized by a thread lock, as the lock file is held by the instance. The file is
+      only readable by the owner, as it may hold authentication tokens.
+
+        with store as data:
+            data["key"] = "value"                      # saved when the block exits
+    """
+    def __init__(self, path):
+        self.path = os.path.expanduser(path)
+        self.lock_fd = None
+        self.data = None
+        self.original = None
+        self.thread_lock = threading.Lock()
+
+    def __enter__(self):
+        self.thread_lock.acquire()
+        directory = os.path.dirname(self.path)
+        try:
+            if directory and not os.path.isdir(directory):
+                os.makedirs(directory)
+            self.lock_fd = os.open(self.path + ".lock", os.O_RDWR | os.O_CREAT, 0o600)
+        except (IOError, OSError):
+            self.thread_lock.release()
+            raise
+        fcntl.flock(self.lock_fd, fcntl.LOCK_EX)
+        try:
+            with open(self.path) as store:
+                self.original = store.read()
+            self.data = json.loads(self.original)
+        except (IOError, OSError, ValueError):             # missing or corrupt, start over
+            self.original = None
+            self.data = dict()
+        return self.data
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            if exc_type is None and json.dumps(self.data) != self.original:      # only write when modified
+                temporary = "%s.%s" % (self.path, os.getpid())
+                with os.fdopen(os.open(temporary, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w") as store:
+                    json.dump(self.data, store)
+                os.rename(temporary, self.path)            # replace atomically, readers never see a partial file
+        finally:
+            fcntl.flock(self.lock_fd, fcntl.LOCK_UN)
+            os.close(self.lock_fd)
+            self.lock_fd = None
+            self.thread_lock.release()
+        return False
+
+
+class TokenCache(object):
+    """
+      Authentication tokens (X-F5-Auth-Token) cached on disk, keyed by host and username. The connection broker
+      keeps its tokens in memory, in a store with the interface of LockedStore.
+
+      Basic authentication is checked by the BIG_IP through PAM on every request, a token is not.
+      The token is obtained from /mgmt/shared/authn/login and reused by every module run until it is
+      within REFRESH seconds of its timeout. The store is locked while logging in, so concurrent forks
+      wait for, and share, a single token rather than each logging in.
+    """
+    LOGIN_URI = "/mgmt/shared/authn/login"
+    REFRESH = 60                                           # seconds before the token expires to obtain a new one
+
+    def __init__(self, path, login_provider="tmos", store=None):
+        self.store = store or LockedStore(path)
+        self.login_provider = login_provider
+
+    def key(self, host, username):
+        return "%s@%s" % (username, host)
+
+    def get(self, session, url, host, username, password, timeout=None):
+        """ Return a valid token for username on host, logging in to url (transport and host) if
+            there is no cached token, or it is about to expire. Return None if the login failed.
+        """
+        with self.store as tokens:
+            entry = tokens.get(self.key(host, username))
+            if entry and entry["expires"] - TokenCache.REFRESH > time.time():
+                return entry["token"]
+
+            body = json.dumps({"username": username, "password": password, "loginProviderName": self.login_provider})
+            r = session.post(url + TokenCache.LOGIN_URI, data=body, headers=Client.HEADER, timeout=timeout, verify=False)
+            if r.status_code != 200:
+                tokens.pop(self.key(host, username), None)
+                return None
+
+            token = r.json()["token"]
+            tokens[self.key(host, username)] = dict(token=token["token"], expires=time.time() + int(token["timeout"]))
+            return token["token"]
+
+    def invalidate(self, host, username):
+        " Remove the token, e.g. it was rejected by the BIG_IP before it expired"
+        with self.store as tokens:
+            tokens.pop(self.key(host, username), None)
+
+# ---------------------------------------------------------------------------
+# Retries and circuit breaker
+# ---------------------------------------------------------------------------
+
+
+class Retry(object):
+    """
+      Retry a request when restjavad is unavailable (502, 503, 504) or the connection fails. The interval
+      between retries is random, between zero and backoff * 2 ** retry seconds (capped), so forks which
+      failed together do not retry together. No retry is attempted past the deadline of the operation.
+    """
+    STATUS = (502, 503, 504)
+    CAP = 30.0
+
+    def __init__(self, retries=3, backoff=0.5, deadline=None, status=STATUS):
+        self.retries = retries
+        self.backoff = backoff
+        self.deadline = deadline
+        self.status = status
+
+    def delay(self, retry):
+        return random.uniform(0, min(Retry.CAP, self.backoff * 2 ** retry))
+
+    def call(self, attempt, metrics=None):
+        """ Call attempt(), which returns a tuple of (result, retryable), until the result is not retryable
+            or the retries or the deadline are exhausted. Return the last result.
+        """
+        start = time.time()
+        retry = 0
+        while True:
+            result, retryable = attempt()
+            if not retryable or retry >= self.retries:
+                return result
+            delay = self.delay(retry)
+            if self.deadline and time.time() - start + delay > self.deadline:
+                return result
+            time.sleep(delay)
+            retry += 1
+            if metrics:
+                metrics.retried()
+
+
+class CircuitBreaker(object):
+    """
+      Remember, across module runs, the hosts which can not be reached. After threshold consecutive
+      connection failures the circuit is open and requests fail immediately rather than waiting for a
+      connect timeout. After cooldown seconds one request is allowed through, if it succeeds the circuit
+      closes, if it fails the circuit stays open for another cooldown.
+    """
+    def __init__(self, path, threshold=3, cooldown=60):
+        self.store = LockedStore(path)
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failing = set()                               # hosts with failures, only these need a success recorded
+
+    def allow(self, host):
+        " Return True if a request may be sent to host"
+        with self.store as hosts:
+            entry = hosts.get(host)
+            if not entry:
+                return True
+            self.failing.add(host)
+            if entry["failures"] < self.threshold:
+                return True
+            if time.time() - entry["opened"] >= self.cooldown:
+                entry["opened"] = time.time()              # half open, other forks wait for this request
+                return True
+            return False
+
+    def record(self, host, connected):
+        " Record the outcome of a request, connected is False if no response was received"
+        if connected and host not in self.failing:
+            return
+        with self.store as hosts:
+            if connected:
+                hosts.pop(host, None)
+                self.failing.discard(host)
+                return
+            entry = hosts.setdefault(host, dict(failures=0, opened=0))
+            entry["failures"] += 1
+            if entry["failures"] >= self.threshold:
+                entry["opened"] = time.time()
+            self.failing.add(host)
+
+# ---------------------------------------------------------------------------
+# Governor of the requests to each host, shared by concurrent module runs
+# ---------------------------------------------------------------------------
+
+
+class Governor(object):
+    """
+      Limit the requests to each host, by every fork and thread on this controller, so restjavad is not
+      pushed past the load it can sustain: a token bucket of max_rate requests per second (no bucket when
+      max_rate is 0), and at most limit requests in flight. The state of each host is a LockedStore, so every
+      fork shares it.
+
+      The limit adapts, additive increase and multiplicative decrease. Each request completed increases the
+      limit by 1 / limit, about one more request in flight per round trip, up to max_in_flight. A 502, 503 or
+      504, a read timeout, or a time to the first byte SPIKE times the baseline of the host (and at least FLOOR
+      seconds) halves it, at most once per DECREASE_INTERVAL, as the requests in flight at the time see the
+      same overload. As the limit is of the requests in flight, the rate follows the time restjavad takes;
+      max_rate is a fixed ceiling, it does not adapt.
+      The baseline is the time to the first byte when restjavad is not loaded, the lowest seen, rising slowly
+      so one fast response does not set it for good. The limits learned are kept, unless the host has not
+      been used for RESET seconds.
+    """
+    SPIKE = 2.0
+    FLOOR = 0.25                                           # seconds, a faster response is never a spike
+    DECREASE = 0.5
+    DECREASE_INTERVAL = 1.0
+    RESET = 300
+    ALPHA = 0.1                                            # weight of each response in the average latency
+    DRIFT = 0.01                                           # weight of a slower response in the baseline
+    POLL = 0.05                                            # minimum seconds between checks while waiting
+
+    def __init__(self, path, max_in_flight=10, max_rate=50.0):
+        self.store = LockedStore(path)
+        self.max_in_flight = max_in_flight
+        self.max_rate = max(0.0, float(max_rate or 0))
+
+    def state(self, hosts, host, now):
+        """ Return the state of host, with the tokens of the bucket added since it was last updated, and
+            without the slots of processes which have exited
+        """
+        entry = hosts.get(host)
+        if entry is None or now - entry["updated"] > Governor.RESET:
+            entry = hosts[host] = dict(limit=float(self.max_in_flight), tokens=self.max_rate, slots=dict(),
+                                       latency=None, baseline=None, decreased=0.0, updated=now)
+        entry["tokens"] = min(max(1.0, self.max_rate), entry["tokens"] + (now - entry["updated"]) * self.max_rate)
+        entry["updated"] = now
+        return entry
+
+    def acquire(self, host):
+        """ Wait until a request may be sent to host, return the slot of the request, to be released, and the
+            seconds waited
+        """
+        start = time.time()
+        slot = "%x" % random.getrandbits(64)
+        while True:
+            with self.store as hosts:
+                now = time.time()
+                entry = self.state(hosts, host, now)
+                if len(entry["slots"]) >= max(1, int(entry["limit"])):
+                    self.purge(entry)
+                if len(entry["slots"]) < max(1, int(entry["limit"])) and (entry["tokens"] >= 1.0 or not self.max_rate):
+                    entry["tokens"] = max(0.0, entry["tokens"] - 1.0)
+                    entry["slots"][slot] = os.getpid()
+                    return slot, time.time() - start
+                if entry["tokens"] < 1.0 and self.max_rate:
+                    wait = (1.0 - entry["tokens"]) / self.max_rate
+                else:                                      # a request in flight completes in about the average
+                    wait = max(Governor.POLL, entry["latency"] or 0.0)
+            time.sleep(random.uniform(0.5, 1.5) * min(wait, 1.0))
+
+    def purge(self, entry):
+        " Remove the slots of processes which exited without releasing them"
+        for slot, pid in list(entry["slots"].items()):
+            try:
+                os.kill(pid, 0)
+            except OSError as e:
+                if e.errno == errno.ESRCH:
+                    entry["slots"].pop(slot)
+
+    def release(self, host, slot, status, ttfb=None):
+        """ Release the slot of a request, adapting the limits of the host to the outcome: the status code, 599
+            for a read timeout or None if no response was received, and the time to the first byte
+        """
+        with self.store as hosts:
+            now = time.time()
+            entry = self.state(hosts, host, now)
+            entry["slots"].pop(slot, None)
+            if status is None:
+                return
+            baseline = entry["baseline"]
+            spike = ttfb is not None and baseline is not None and ttfb > max(Governor.FLOOR, Governor.SPIKE * baseline)
+            if status in Retry.STATUS or status == 599 or spike:
+                if now - entry["decreased"] >= Governor.DECREASE_INTERVAL:
+                    entry["limit"] = max(1.0, entry["limit"] * Governor.DECREASE)
+                    entry["decreased"] = now
+            else:
+                entry["limit"] = min(float(self.max_in_flight), entry["limit"] + 1.0 / entry["limit"])
+            if ttfb is not None and status not in Retry.STATUS:
+                average = entry["latency"]
+                entry["latency"] = ttfb if average is None else average + Governor.ALPHA * (ttfb - average)
+                if baseline is None or ttfb < baseline:
+                    entry["baseline"] = ttfb
+                else:
+                    entry["baseline"] = baseline + Governor.DRIFT * (ttfb - baseline)
+
+    def summary(self, host):
+        " Return the current limits of host, to be returned by the module"
+        with self.store as hosts:
+            entry = self.state(hosts, host, time.time())
+            return dict(limit=int(entry["limit"]), in_flight=len(entry["slots"]),
+                        latency=entry["latency"] and round(entry["latency"], 6),
+                        baseline=entry["baseline"] and round(entry["baseline"], 6))
+
+# ---------------------------------------------------------------------------
+# Connection broker client
+# ---------------------------------------------------------------------------
+
+
+class TransportError(IOError):
+    " No response was received, raised by the broker client in place of the ConnectionError of requests"
+
+
+class TransportReadTimeout(TransportError):
+    " The request was sent, but the response was not received within the read timeout"
+
+
+class BrokerUnavailable(TransportError):
+    " The broker is not listening, e.g. it exited when idle, the request was not sent"
+
+
+class Broker(object):
+    """
+      The client of the connection broker, icontrol_broker, a daemon listening on a Unix socket which holds
+      the keep-alive sessions and tokens of each BIG_IP. Each Ansible task is a new process, so without the
+      broker every task connects, negotiates TLS and authenticates again; through the broker a request is a
+      local round trip over a connection (and with a token) which is already established.
+
+      Each request is a connection to the socket. The request is a line of JSON followed by the body, the
+      response is a line of JSON, the status, headers and timing, followed by the body in frames, each the
+      length in hexadecimal and a newline followed by that many bytes, ending with a frame of length zero.
+    """
+    SOCKET = "~/.ansible/f5_broker.sock"
+
+    def __init__(self, path=SOCKET):
+        self.path = os.path.expanduser(path)
+
+    @classmethod
+    def find(cls, path=SOCKET):
+        " Return a Broker if the socket exists, otherwise None and requests are sent directly"
+        if path and os.path.exists(os.path.expanduser(path)):
+            return cls(path)
+        return None
+
+    def connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(self.path)
+        except (IOError, OSError) as e:
+            sock.close()
+            raise BrokerUnavailable("broker %s: %s" % (self.path, e))
+        return sock
+
+    def command(self, command):
+        " Send a command, stats or shutdown, to the broker and return its reply"
+        sock = self.connect()
+        try:
+            sock.sendall(json.dumps(dict(command=command)).encode("utf-8") + b"\n")
+            return json.loads(sock.makefile("rb").readline().decode("utf-8"))
+        finally:
+            sock.close()
+
+    def send(self, method, URI, body=None, headers=None, auth=None, timeout=None, read=True, login_provider="tmos"):
+        """ Send the request through the broker, which authenticates with a token obtained using auth, the
+            username and password, unless the headers include a token. Return the response and its timing, as
+            timed_request. When read is False, the body is left to the caller to stream.
+        """
+        if body is None:
+            body = b""
+        elif not isinstance(body, bytes):
+            body = body.encode("utf-8")
+        request = dict(method=method, url=URI, headers=headers, auth=auth, timeout=timeout, read=read,
+                       login_provider=login_provider, length=len(body))
+        sock = self.connect()
+        try:
+            sock.sendall(json.dumps(request).encode("utf-8") + b"\n" + body)
+            stream = sock.makefile("rb")
+            line = stream.readline()
+        except (IOError, OSError) as e:
+            sock.close()
+            raise TransportError("broker %s: %s" % (self.path, e))
+        if not line:
+            sock.close()
+            raise TransportError("broker %s closed the connection" % self.path)
+
+        reply = json.loads(line.decode("utf-8"))
+        if reply.get("error"):
+            sock.close()
+            if reply.get("read_timeout"):
+                raise TransportReadTimeout(reply["error"])
+            raise TransportError(reply["error"])
+        r = BrokerResponse(reply, stream, sock)
+        if read:
+            r.content
+        return r, reply["timing"]
+
+
+class BrokerResponse(object):
+    """
+      The response to a request sent through the broker, with the attributes and methods of requests.Response
+      used by the modules. The body is read from the socket as it is iterated, or all of it by content.
+    """
+    def __init__(self, reply, stream, sock):
+        self.status_code = reply["status"]
+        self.reason = reply["reason"]
+        self.headers = reply["headers"]
+        self.stream = stream
+        self.sock = sock
+        self.body = None
+
+    def iter_content(self, chunk_size=1):
+        " Generator of the frames of the body, chunk_size is determined by the broker"
+        if self.body is not None:
+            yield self.body
+            return
+        try:
+            while True:
+                length = self.stream.readline()
+                if not length:
+                    raise TransportError("broker closed the connection before the end of the body")
+                length = int(length, 16)
+                if length == 0:
+                    break
+                chunk = self.stream.read(length)
+                if len(chunk) != length:
+                    raise TransportError("broker closed the connection before the end of the body")
+                yield chunk
+        finally:
+            self.close()
+
+    @property
+    def content(self):
+        if self.body is None:
+            self.body = b"".join(self.iter_content())
+        return self.body
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8", "replace")
+
+    def json(self):
+        return json.loads(self.text)
+
+    def close(self):
+        if self.sock:
+            self.sock.close()
+            self.sock = None
+
+# ---------------------------------------------------------------------------
+# iControl REST client
+# ---------------------------------------------------------------------------
+
+
+class Client(object):
+    """
+      The REST client of a BIG_IP: the keep-alive session, credentials and token, timeouts, retry policy,
+      circuit breaker and metrics. request() issues a request and populates status_code and the parsed
+      response, exchange() returns the response itself, for the caller to parse or stream.
+
+      When a broker is specified, requests are sent through it, and a session is only created if the
+      broker exits. A body which is a file, a chunk of an upload, is read and sent through the broker. When a
+      governor is specified, each request waits until the governor of the host allows it.
+    """
+    HEADER = {"Content-Type": "application/json"}
+    TRANSPORT = "https://"
+    POOL_SIZE = 10                                         # maximum connections kept alive to the BIG_IP
+    TIMEOUT = (10, 300)                                    # (connect, read) socket timeouts in seconds
+
+    def __init__(self, host="192.0.2.1", username="admin", password="redacted", token=None, pool_size=POOL_SIZE,
+                 timeout=TIMEOUT, session=None, token_cache=None, metrics=None, retry=None, breaker=None, broker=None,
+                 governor=None):
+        self.host = host
+        self.username = username
+        self.password = password
+        self.transport = self.TRANSPORT
+        self.token_cache = token_cache                     # a TokenCache, used when a token is not specified
+        self.token = self.configure_header(token)
+        self.response = None
+        self.status_code = 0
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.broker = broker                               # a Broker, holding the sessions and tokens across forks
+        self.session = session
+        if session is None and broker is None:
+            self.session = self.create_session(pool_size)
+        self.round_trips = 0                               # requests sent to the BIG_IP by this instance
+        self.metrics = metrics or Metrics()
+        self.retry = retry or Retry()
+        self.breaker = breaker                             # a CircuitBreaker, shared by the module runs
+        self.governor = governor                           # a Governor, shared by the module runs
+
+    def configure_header(self, token):
+        " The headers belong to this instance, so a token is never sent on behalf of another instance"
+        self.header = dict(Client.HEADER)
+        if token:
+            self.header["X-F5-Auth-Token"] = token
+        return token
+
+    def authenticate(self):
+        " Obtain a token from the token cache, if there is one and a token was not specified"
+        if self.token or not self.token_cache or self.broker:
+            return                                         # the broker obtains and refreshes its own tokens
+        token = self.token_cache.get(self.session, "%s%s" % (self.transport, self.host),
+                                     self.host, self.username, self.password, timeout=self.timeout)
+        self.token = self.configure_header(token)
+
+    def create_session(self, pool_size):
+        " Create a keep-alive session, the connections of which are pooled and timed"
+        return pooled_session(pool_size, self.transport)
+
+    def connection_stats(self):
+        " Return the number of requests issued and how many used a new or a reused connection"
+        if self.session is None:                           # every request was sent through the broker
+            return dict(requests=0, new=0, reused=0)
+        adapter = self.session.get_adapter(self.transport)
+        stats = dict(requests=0, new=0, reused=0)
+        for key in adapter.poolmanager.pools.keys():
+            pool = adapter.poolmanager.pools[key]
+            stats["requests"] += pool.num_requests
+            stats["new"] += pool.num_connections
+        stats["reused"] = stats["requests"] - stats["new"]
+        return stats
+
+    def request(self, method, uri, body=None, headers=None):
+        """ Issue the request over the pooled session and populate status_code and response, retrying
+            as specified by the retry policy. Return the status code, or None if we were unable to connect.
+        """
+        response = self.exchange(method, uri, body, headers)
+        if isinstance(response, Exception):
+            self.status_code = 599
+            self.response = str(response)
+            return None
+
+        r, timing = response
+        self.status_code = r.status_code
+        start = time.time()
+        try:
+            self.response = r.json()                       # r.json() returns a dictionary
+        except ValueError:                                 # If you get a 200 on DELETE or a 404, throws a ValueError exception
+            self.response = None                           # there may not be a response
+        timing["parse"] = round(time.time() - start, 6)
+        if r.status_code not in self.retry.status:         # otherwise recorded by attempt
+            self.metrics.record(timing)
+        return r.status_code
+
+    def exchange(self, method, uri, body=None, headers=None, read=True):
+        """ Issue the request, retrying as specified by the retry policy, return a tuple of the response and
+            its timing, or the exception raised by the last attempt. Unless the status code is retryable,
+            the caller records the timing, adding the time to parse the body. When read is False, the body
+            is left to the caller to stream.
+        """
+        URI = "%s%s%s" % (self.transport, self.host, uri)
+        if self.breaker and not self.breaker.allow(self.host):
+            return TransportError("%s is unreachable, circuit breaker is open" % self.host)
+
+        response = self.retry.call(lambda: self.attempt(method, URI, body, headers, read), self.metrics)
+        if self.breaker:
+            self.breaker.record(self.host, not isinstance(response, Exception))
+        return response
+
+    def attempt(self, method, URI, body=None, headers=None, read=True):
+        """ Issue the request once, return a tuple of the response and its timing (or the exception) and
+            whether the request may be retried. A POST which timed out reading the response is not retried,
+            the object may have been created.
+        """
+        start = time.time()
+        try:
+            self.authenticate()
+            r, timing = self.send(method, URI, body, headers, read)
+            if r.status_code == 401 and self.token_cache and self.token:
+                r.content
+                self.metrics.record(timing)
+                self.token_cache.invalidate(self.host, self.username)
+                self.token = self.configure_header(None)   # the cached token was revoked, login again
+                self.authenticate()
+                r, timing = self.send(method, URI, body, headers, read)
+        except Exception as e:
+            errors, read_timeouts = self.transport_errors()
+            if not isinstance(e, errors):
+                raise
+            self.metrics.record_error(method, URI, start, e)
+            return e, not (method == "POST" and isinstance(e, read_timeouts))
+        if r.status_code in self.retry.status:
+            r.content                                      # read the body, so the connection is returned to the pool
+            self.metrics.record(timing)
+            return (r, timing), True
+        return (r, timing), False
+
+    def transport_errors(self):
+        """ Return the exceptions raised when no response was received, and those raised by a read timeout.
+            requests is only imported if a session was created.
+        """
+        if self.session is None:
+            return (TransportError,), (TransportReadTimeout,)
+        import requests
+        return (TransportError, requests.ConnectionError, requests.Timeout), (TransportReadTimeout, requests.ReadTimeout)
+
+    def login_provider(self):
+        return self.token_cache.login_provider if self.token_cache else "tmos"
+
+    def send(self, method, URI, body=None, headers=None, read=True):
+        """ Send the request using the token if there is one, otherwise basic authentication, adding the
+            headers specified, e.g. the Content-Range of a file transfer. Return the response and its timing.
+            When read is False, the body is left to the caller to stream.
+
+            With a governor, the request waits until the governor of the host allows it, the time waited is
+            added to queued in the timing, and the outcome of the request adapts the limits of the host.
+        """
+        self.round_trips += 1
+        if self.governor is None:
+            return self.transmit(method, URI, body, headers, read)
+
+        slot, queued = self.governor.acquire(self.host)
+        status = ttfb = None
+        try:
+            r, timing = self.transmit(method, URI, body, headers, read)
+            status, ttfb = r.status_code, timing["ttfb"]
+        except Exception as e:
+            if isinstance(e, self.transport_errors()[1]):
+                status = 599                               # a read timeout, the host is overloaded
+            raise
+        finally:
+            self.governor.release(self.host, slot, status, ttfb)
+        timing["queued"] = round(timing.get("queued", 0.0) + queued, 6)
+        return r, timing
+
+    def transmit(self, method, URI, body=None, headers=None, read=True):
+        " Send the request through the broker if there is one, otherwise over the session"
+        if self.token is None:
+            auth = (self.username, self.password)
+        else:
+            auth = None
+        if headers:
+            headers = dict(self.header, **headers)
+        else:
+            headers = self.header
+        if self.broker:
+            if hasattr(body, "read"):
+                body = body.read()                         # a chunk of a file upload, at most 1 MB
+            try:
+                return self.broker.send(method, URI, body, headers, auth=auth, timeout=self.timeout, read=read,
+                                        login_provider=self.login_provider())
+            except BrokerUnavailable:
+                self.broker = None                         # the broker has exited, send the requests directly
+        if self.session is None:
+            self.session = self.create_session(self.pool_size)
+        return timed_request(self.session, method, URI, read=read, auth=auth, data=body, headers=headers,
+                             timeout=self.timeout)
+
+# ---------------------------------------------------------------------------
+# Options shared by the modules, documented in doc_fragments/icontrol_client.py
+# ---------------------------------------------------------------------------
+
+
+def transport_argument_spec():
+    " Return the argument_spec of broker and trace_file, the icontrol_client.transport documentation fragment"
+    return dict(
+        broker=dict(required=False, default=Broker.SOCKET, type='path'),
+        trace_file=dict(required=False, type='path'))
+
+
+def common_argument_spec():
+    """ Return the argument_spec of the retries, circuit breaker, governor, broker and trace file, the
+        icontrol_client and icontrol_client.transport documentation fragments. A module adds its own options.
+    """
+    spec = dict(
+        retries=dict(required=False, default=3, type='int'),
+        backoff=dict(required=False, default=0.5, type='float'),
+        deadline=dict(required=False, type='float'),
+        circuit_breaker=dict(required=False, type='path'),
+        failure_threshold=dict(required=False, default=3, type='int'),
+        cooldown=dict(required=False, default=60, type='int'),
+        governor=dict(required=False, type='path'),
+        max_in_flight=dict(required=False, default=10, type='int'),
+        max_rate=dict(required=False, default=50, type='float'))
+    spec.update(transport_argument_spec())
+    return spec
+
+
+def client_options(params):
+    """ Return the keyword arguments of Client specified by the options of common_argument_spec: metrics,
+        retry, breaker, broker and governor. The timing of each request is kept when the module has a debug option.
+    """
+    breaker = None
+    if params["circuit_breaker"]:
+        breaker = CircuitBreaker(params["circuit_breaker"], threshold=params["failure_threshold"],
+                                 cooldown=params["cooldown"])
+    governor = None
+    if params["governor"]:
+        governor = Governor(params["governor"], max_in_flight=params["max_in_flight"], max_rate=params["max_rate"])
+    return dict(metrics=Metrics(trace_file=params["trace_file"], keep=bool(params.get("debug"))),
+                retry=Retry(retries=params["retries"], backoff=params["backoff"], deadline=params["deadline"]),
+                breaker=breaker,
+                broker=Broker.find(params["broker"]),
+                governor=governor)
@@ -0,0 +1,728 @@
+#!/usr/bin/env python
+#
+"""
+     Copyright (c) 2026 World Wide Technology, Inc.
+     All rights reserved.
+
+     Revision history:
+     17 October 2026  |  1.0 - initial release, BIG_IP and the batch functions of icontrol_install_config
+     17 October 2026  |  1.1 - plan_levels raises ValueError when the items depend on each other
+     17 October 2026  |  1.2 - normalize_item raises ValueError for an item of the wrong shape or method
+     17 October 2026  |  1.3 - the round trips of the check strategy include the GET before a PATCH with diff
+     17 October 2026  |  1.4 - only references ignore the partition and only booleans ignore case when compared
+     17 October 2026  |  1.5 - a transaction is opened by the first request queued, none when nothing changes
+
+     The configuration of a BIG_IP: BIG_IP, a Client which creates, modifies and deletes objects and queues
+     them in transactions, the comparison of the desired state with the existing object, and the strategies,
+     planner and transactions used to apply a batch of items. icontrol_install_config, icontrol_bulk_import,
+     icontrol_file_transfer and F5_sdk_LTM_node import it from ansible.module_utils, so it is included with
+     each module by Ansible.
+"""
+
+import re
+import json
+import time
+import threading
+try:
+    from ansible.module_utils.icontrol_client import Client
+except ImportError:                                        # outside Ansible, module_utils is in this directory
+    from module_utils.icontrol_client import Client
+
+try:
+    STRINGS = (str, unicode)
+except NameError:
+    STRINGS = (str,)                                       # Python 3
+
+# ---------------------------------------------------------------------------
+# F5 icontrol REST Connection Class
+# ---------------------------------------------------------------------------
+
+
+class Transaction(object):
+    """
+      An iControl REST transaction, opened by the first request queued in it, so no transaction is opened
+      when diff finds nothing to change. The instances spawned to queue the items share it.
+    """
+    def __init__(self):
+        self.id = None                                     # transId, once the transaction is open
+        self.queued = 0                                    # requests queued in the transaction
+        self.lock = threading.Lock()
+
+    def __str__(self):
+        return str(self.id)
+
+
+
+class BIG_IP(Client):
+    """
+      Connection class for Python to F5 BIG-IP iControl REST calls
+
+    """
+    TRANSACTION_URI = "/mgmt/tm/transaction/"
+    COORDINATION_HEADER = "X-F5-REST-Coordination-Id"
+
+    def __init__(self, host="192.0.2.1", username="admin", password="redacted", token=None, uri="/", method="POST", debug=False,
+                 pool_size=Client.POOL_SIZE, timeout=Client.TIMEOUT, session=None, token_cache=None, diff=False, metrics=None,
+                 retry=None, breaker=None, broker=None, governor=None):
+        Client.__init__(self, host=host, username=username, password=password, token=token, pool_size=pool_size,
+                        timeout=timeout, session=session, token_cache=token_cache, metrics=metrics, retry=retry,
+                        breaker=breaker, broker=broker, governor=governor)
+        self.uri = self.validate_uri(uri)
+        self.method = method
+        self.changed = False
+        self.debug = debug
+        self.transaction = None                            # a Transaction, when requests are being queued
+        self.commit_latency = None
+        self.diff = diff                                   # PATCH only the fields which differ from current
+        self.current = None                                # the existing object, when it has been read
+        self.changes = None                                # the fields sent in the PATCH, when diff is True
+
+        return
+
+    @property
+    def BIG_IP_host(self):
+        return self.host
+
+    def validate_uri(self, uri):
+        " make certain the uri has a leading and trailing slash"
+
+        if uri[0] != "/":                                  # check leading slash
+            uri = "/" + uri
+
+        if uri[-1] != "/":                                 # check trailing slash
+            uri = uri + "/"
+
+        return uri
+
+    def spawn(self, uri, method):
+        """ Return a new instance for another uri and method, sharing the session (and its connection pool)
+            and credentials of this instance. Each thread applying a batch item works on its own instance.
+        """
+        worker = BIG_IP(host=self.host, username=self.username, password=self.password, token=self.token,
+                        uri=uri, method=method, debug=self.debug, timeout=self.timeout, session=self.session,
+                        token_cache=self.token_cache, diff=self.diff, metrics=self.metrics,
+                        retry=self.retry, breaker=self.breaker, broker=self.broker, governor=self.governor)
+        worker.transport = self.transport
+        worker.transaction = self.transaction
+        return worker
+
+    def begin_transaction(self):
+        """ Subsequent POST, PATCH and DELETE requests are queued on the BIG_IP rather than committed to
+            mcpd one at a time. The transaction is opened by the first of them, see open_transaction.
+        """
+        self.transaction = Transaction()
+        return self.transaction
+
+    def open_transaction(self):
+        """ Open the transaction, unless it is already open, before a request is queued in it. Return True
+            if it is open, otherwise status_code and response are those of the request to open it.
+        """
+        transaction = self.transaction
+        with transaction.lock:
+            if transaction.id is None:
+                self.transaction = None                    # the request to open it is not queued
+                try:
+                    status_code = self.request("POST", BIG_IP.TRANSACTION_URI, "{}")
+                finally:
+                    self.transaction = transaction
+                if status_code != 200:
+                    return False
+                transaction.id = self.response["transId"]
+            transaction.queued += 1
+        return True
+
+    def request(self, method, uri, body=None, headers=None):
+        " Issue the request, opening the transaction first when the request is to be queued in it"
+        if self.transaction and method != "GET" and not self.open_transaction():
+            return self.status_code
+        return Client.request(self, method, uri, body, headers)
+
+    def commit_transaction(self, validate=True):
+        """ Commit the queued requests as a single change, optionally validating the transaction first.
+            The elapsed time of the commit is saved in commit_latency. Return True if the transaction completed.
+        """
+        uri = "%s%s" % (BIG_IP.TRANSACTION_URI, self.transaction)
+        self.transaction = None                            # requests to the transaction itself are not queued
+
+        if validate:
+            if self.request("PATCH", uri, json.dumps({"state": "VALIDATING", "validateOnly": True})) != 200:
+                return False
+
+        start = time.time()
+        status_code = self.request("PATCH", uri, json.dumps({"state": "VALIDATING"}))
+        self.commit_latency = time.time() - start
+        if status_code != 200:
+            return False
+
+        if self.response.get("state") == "COMPLETED":
+            self.changed = True
+            return True
+        return False
+
+    def abort_transaction(self):
+        " Delete the transaction and discard the requests queued in it"
+        uri = "%s%s" % (BIG_IP.TRANSACTION_URI, self.transaction)
+        self.transaction = None
+        return self.request("DELETE", uri) == 200
+
+    def send(self, method, URI, body=None, headers=None, read=True):
+        " Send the request, a change is queued in the transaction when there is one, reads are not queued"
+        if self.transaction and method != "GET":
+            headers = dict(headers or {})
+            headers[BIG_IP.COORDINATION_HEADER] = str(self.transaction)
+        return Client.send(self, method, URI, body, headers, read)
+
+    def genericDELETE(self):
+        """ Delete a resource from F5 BIG_IP, return True if deleted successfully, return False if
+            not. A return code of 200 does not populate the response, a 404 errors means the node
+            was not found, but the response is populated.
+            To delete a virtual server named foo, use https://192.0.2.1/mgmt/tm/ltm/virtual/foo
+        """
+        status_code = self.request("DELETE", self.uri)
+        if status_code is None:
+            return None
+
+        if status_code == 200:                             # a 200 means we successfully deleted
+            self.changed = True                            # we changed the state
+            return True
+        if status_code == 404:                             # a 404 error means the requested node was not found
+            return True                                    # because this is the desired state, return True
+        return False
+
+    def genericGET(self, uri=None):
+        """ Issue a GET request and return the results
+            We are using requests to issue a command similar to the following:
+              curl -k -u admin:redacted -X GET https://192.0.2.1/mgmt/tm/ltm/virtual
+        """
+        if not uri:
+            uri = self.uri
+
+        status_code = self.request("GET", uri)
+        if status_code is None:
+            return None
+
+        if status_code == 200:
+            return True
+        return False
+
+    def genericPOST(self, body):
+        """
+            Use POST to create a new configuration object from a JSON body.
+        """
+        status_code = self.request("POST", self.uri, body)
+        if status_code is None:
+            return None
+
+        if status_code == 200:
+            self.changed = True
+            return True
+        return False
+
+    def genericPATCH(self, body):
+        """
+           PATCH to edit an existing configuration object with a JSON body.
+           Need to formulate the URL with the name as part of the URL and NAME must not be in the body
+        """
+        status_code = self.request("PATCH", self.uri, body)
+        if status_code is None:
+            return None
+
+        if status_code == 200:
+            self.changed = True
+            return True
+        return False
+
+    def node_exists(self, body):
+        """ Return true or false if the node specified in the URL exists- status_code is a 404 if not found
+            Need to formulate a new URL by determining the name from the body and appending it to the URL
+        """
+        try:
+            body = json.loads(body)
+        except ValueError:
+            return None
+
+        try:
+            name = body["name"]
+        except KeyError:
+            return None
+
+        uri = self.uri + name                              # Now create a new URL with the uri and the name from the body.
+        if self.genericGET(uri=uri):
+            self.current = self.response                   # keep the existing object to compare with the body
+            return True
+        return False
+
+    def modify_url_and_body(self, body):
+        "Manipulate the URL and body to permit issueing a PATCH"
+
+        try:
+            body = json.loads(body)                        # JSON string to dictiionary
+        except ValueError:
+            pass                                           # body assumed to be a dictionary
+
+        self.uri = self.uri + body['name']                 # add name to uri
+        del body['name']                                   # delete name from dictionary
+        body = json.dumps(body)                            # dictionary to JSON string
+
+        return body
+
+    def minimal_body(self, body):
+        """ Compare the JSON body (without name) with the existing object, return the JSON body of only
+            the fields which differ, or None if there is nothing to change.
+        """
+        self.changes = differences(json.loads(body), self.current)
+        if not self.changes:
+            return None
+        return json.dumps(self.changes)
+
+# ---------------------------------------------------------------------------
+# Desired state comparison
+# ---------------------------------------------------------------------------
+
+EMPTY = (None, "", "none", [], {})                         # values equivalent to the property being absent
+BOOLEANS = ("true", "false", "yes", "no", "enabled", "disabled")  # compared without regard to case
+
+# properties which refer to other objects, by a name with or without the partition
+REFERENCES_BY_NAME = ("defaultsFrom", "destination", "fallbackPersistence", "members", "monitor", "name", "persist",
+                      "pool", "pools", "profiles", "rules", "vlans")
+
+
+def strip_partition(value, partition):
+    " /Common/http and http refer to the same object in the Common partition"
+    prefix = "/%s/" % partition
+    if value.startswith(prefix):
+        return value[len(prefix):]
+    return value
+
+
+def sort_key(value):
+    " Lists are compared without regard to order, lists of objects are ordered by name"
+    if isinstance(value, dict):
+        return str(value.get("name", json.dumps(value, sort_keys=True)))
+    return json.dumps(value, sort_keys=True)
+
+
+def equivalent(desired, current, partition="Common", key=None):
+    """ Return True if the desired value of the property key is satisfied by the current value on the BIG_IP.
+        A desired dictionary need only be a subset of the current one, as the BIG_IP returns every property.
+        The partition is ignored only in the names of referenced objects, and case only in booleans.
+    """
+    if isinstance(desired, dict) and isinstance(current, dict):
+        partition = current.get("partition", partition)
+        for name, value in desired.items():
+            if name not in current:
+                if value in EMPTY:
+                    continue
+                return False
+            if not equivalent(value, current[name], partition, name):
+                return False
+        return True
+
+    if isinstance(desired, list) and isinstance(current, list):
+        if len(desired) != len(current):
+            return False
+        for want, have in zip(sorted(desired, key=sort_key), sorted(current, key=sort_key)):
+            if not equivalent(want, have, partition, key):
+                return False
+        return True
+
+    if desired == current:
+        return True
+    if isinstance(desired, (list, dict)) or isinstance(current, (list, dict)):
+        return False
+    desired = str(desired)                                 # 80 and "80"
+    current = str(current)
+    if key in REFERENCES_BY_NAME:
+        desired = strip_partition(desired, partition)
+        current = strip_partition(current, partition)
+    if desired.lower() in BOOLEANS:
+        return desired.lower() == current.lower()          # True and "true", "Enabled" and "enabled"
+    return desired == current
+
+
+def differences(desired, current):
+    " Return a dictionary of the top level properties of desired which differ from the current object"
+    partition = current.get("partition", "Common")
+    changes = dict()
+    for key, value in desired.items():
+        if key not in current:
+            if value not in EMPTY:
+                changes[key] = value
+        elif not equivalent(value, current[key], partition, key):
+            changes[key] = value
+    return changes
+
+# ---------------------------------------------------------------------------
+# icontrol_install_config methods
+# ---------------------------------------------------------------------------
+
+
+def install_config(F5, body):
+    """
+        If the node exists, attempt to issue PATCH, otherwise, issue POST. User has either specified
+        a POST or defaulted to POST.
+    """
+    if F5.node_exists(body):
+        return patch_config(F5, body)
+    else:
+        return F5.genericPOST(body)
+
+
+def optimistic_config(F5, body):
+    """
+        Issue a POST, only if the BIG_IP responds that the object already exists (409) issue a PATCH.
+        Creating an object costs one round trip rather than two.
+    """
+    if F5.genericPOST(body):
+        return True
+    if F5.status_code == 409:
+        if F5.diff:
+            F5.node_exists(body)                           # read the object to compare with the body
+        return patch_config(F5, body)
+    return False
+
+
+def patch_config(F5, body):
+    """ The object is known to exist, modify the URL and body and issue a PATCH. When diff is specified
+        and the existing object has been read, PATCH only the fields which differ, if any.
+    """
+    body = F5.modify_url_and_body(body)
+    if F5.diff and F5.current is not None:
+        body = F5.minimal_body(body)
+        if body is None:                                   # nothing to change, changed remains False
+            F5.response = F5.current
+            return True
+    return F5.genericPATCH(body)
+
+
+def update_config(F5, body):
+    " Called with a PATCH method, attempt to update the configuration"
+    if F5.diff and F5.genericGET():
+        F5.current = F5.response
+        body = F5.minimal_body(body)
+        if body is None:
+            return True
+    return F5.genericPATCH(body)
+
+
+def delete_config(F5, body):
+    " Attempt to delete the configuration specified by the URL, ignore the body"
+    return F5.genericDELETE()
+
+
+def POST_config(F5, body):
+    " POST command which does not fail back to PATCH if node exists"
+    return F5.genericPOST(body)
+
+
+# Case structure of the supported functions
+FUNCTIONS = {"PATCH": update_config,
+             "POST": install_config,
+             "_POST_": POST_config,
+             "DELETE": delete_config}
+
+
+def to_json(body):
+    " body is a str when body: '{\"name\": \"foo\"}' and a dict when specified as YAML, return a str"
+    if isinstance(body, dict):
+        return json.dumps(body)
+    return body
+
+
+def normalize_item(item, uri, method):
+    """ Return a tuple of (uri, body, method) for an entry of the items list. An entry is either a body,
+        applied to the uri and method of the module, a dictionary with keys of uri, body and method, or
+        a list of [uri, body] or [uri, body, method]. Raises ValueError if the entry is none of these.
+    """
+    if isinstance(item, dict) and "uri" in item:
+        return item["uri"], to_json(item.get("body", {})), item_method(item.get("method", method))
+    if isinstance(item, (list, tuple)):
+        if len(item) not in (2, 3):
+            raise ValueError("item %s is not a list of [uri, body] or [uri, body, method]" % (item,))
+        if len(item) == 2:
+            return item[0], to_json(item[1]), method
+        return item[0], to_json(item[1]), item_method(item[2])
+    return uri, to_json(item), method
+
+
+def item_method(method):
+    " Return the method of an item in upper case, raises ValueError if it is not a string"
+    if not isinstance(method, STRINGS):
+        raise ValueError("method %r of an item is not a string" % (method,))
+    return method.upper()
+
+
+def object_name(body):
+    " Return the name of the object in a JSON body, or None"
+    try:
+        return json.loads(body).get("name")
+    except (ValueError, TypeError, AttributeError):
+        return None
+
+
+def prefetch_names(F5, items):
+    """ Issue one GET for each collection which is the target of a POST, selecting only the name of each
+        object, or every property when diff is specified. Return a dictionary, keyed by uri, of the objects
+        in that collection keyed by name and full path.
+        A collection which could not be read is omitted, the objects in it are checked individually.
+    """
+    existing = dict()
+    for uri in set(F5.validate_uri(uri) for uri, body, method in items if uri and method == "POST"):
+        if F5.diff:
+            found = F5.genericGET(uri=uri)
+        else:
+            found = F5.genericGET(uri="%s?$select=name,fullPath" % uri)
+        if found:
+            objects = dict()
+            for obj in F5.response.get("items", []):
+                objects[obj.get("name")] = obj
+                objects[obj.get("fullPath")] = obj
+            existing[uri] = objects
+    return existing
+
+
+def install_function(strategy, uri, body, existing=None):
+    " Return the function used to apply a POST of body to uri using the strategy"
+    if strategy == "optimistic":
+        return optimistic_config
+    if strategy == "prefetch" and existing and uri in existing:
+        if object_name(body) in existing[uri]:
+            return patch_config
+        return optimistic_config                           # created since the prefetch, fall back to PATCH on a 409
+    return install_config
+
+
+def apply_item(F5, item, strategy="check", existing=None):
+    " Apply one (uri, body, method) on an instance spawned from F5, return a dictionary of the result"
+    uri, body, method = item
+    result = dict(uri=uri, method=method, changed=False, failed=True, round_trips=0)
+    try:
+        run_function = FUNCTIONS[method]
+    except KeyError:
+        result["msg"] = "Invalid method"
+        return result
+    if not uri:
+        result["msg"] = "uri not specified"
+        return result
+
+    worker = F5.spawn(uri, method)
+    if method == "POST":
+        run_function = install_function(strategy, worker.uri, body, existing)
+        if run_function is patch_config:
+            worker.current = existing[worker.uri][object_name(body)]
+    ret_code = run_function(worker, body)
+    result.update(uri=worker.uri, changed=worker.changed, failed=not ret_code,
+                  status_code=worker.status_code, content=worker.response, round_trips=worker.round_trips)
+    if worker.diff:
+        result["changes"] = worker.changes
+    return result
+
+
+def apply_items(F5, items, concurrency=1, strategy="check", existing=None):
+    """ Apply a list of (uri, body, method) tuples using the session of F5, at most concurrency at a time.
+        Results are returned in the same order as the items.
+        For the prefetch strategy, existing is the dictionary returned by prefetch_names.
+    """
+    if concurrency <= 1:
+        return [apply_item(F5, item, strategy, existing) for item in items]
+
+    from multiprocessing.pool import ThreadPool            # imported only when items are applied concurrently
+    pool = ThreadPool(concurrency)
+    try:
+        return pool.map(lambda item: apply_item(F5, item, strategy, existing), items)
+    finally:
+        pool.close()
+        pool.join()
+
+
+def round_trip_summary(results, prefetch=0, diff=False):
+    """ Return the round trips used to apply the items, and how many were saved compared to the check
+        strategy. It issues a GET before each POST, and before each PATCH when diff is specified, then no
+        POST or PATCH when diff finds nothing to change.
+    """
+    used = prefetch + sum(result["round_trips"] for result in results)
+    check = 0
+    for result in results:
+        if "msg" in result:
+            continue
+        if result["method"] == "POST" or (diff and result["method"] == "PATCH"):
+            check += 1                                     # the GET of the object
+            if diff and not (result.get("changed") or result.get("failed")):
+                continue
+        check += 1
+    return dict(total=used, saved=check - used)
+
+
+# ---------------------------------------------------------------------------
+# Dependency planner
+# ---------------------------------------------------------------------------
+
+SUBCOLLECTION = re.compile(r"^(/mgmt/tm/.+)/([^/]+)/members$")
+
+# (collection of the object, property, collection of the referenced objects, name of the referenced object)
+REFERENCES = (
+    ("/mgmt/tm/ltm/virtual", "pool", "/mgmt/tm/ltm/pool", None),
+    ("/mgmt/tm/ltm/pool", "monitor", "/mgmt/tm/ltm/monitor", None),
+    ("/mgmt/tm/ltm/pool", "members", "/mgmt/tm/ltm/node", lambda name: name.rsplit(":", 1)[0]),
+    ("/mgmt/tm/gtm/pool", "members", "/mgmt/tm/gtm/server", lambda name: name.split(":", 1)[0]),
+    ("/mgmt/tm/gtm/wideip", "pools", "/mgmt/tm/gtm/pool", None),
+)
+
+
+def bare_name(name):
+    " /Common/foo, ~Common~foo and foo name the object foo"
+    return name.replace("~", "/").rstrip("/").split("/")[-1]
+
+
+def identity(uri, body, method):
+    """ Return the (collection, name) of the object of an item, or None. A POST names the object in the body,
+        other methods in the uri. The members of a pool are a collection of their own.
+    """
+    uri = uri.rstrip("/")
+    if method in ("POST", "_POST_"):
+        name = object_name(body)
+        return (uri, bare_name(name)) if name else None
+    collection, _, name = uri.rpartition("/")
+    return (collection, bare_name(name)) if collection and name else None
+
+
+def references(uri, body, method):
+    " Return a list of (collection, name) of the objects referenced by an item"
+    try:
+        body = json.loads(body) if body else dict()
+    except ValueError:
+        body = dict()
+    if not isinstance(body, dict):
+        return []
+
+    uri = uri.rstrip("/")
+    if method not in ("POST", "_POST_"):
+        uri = uri.rpartition("/")[0]                       # the collection of the object
+    referenced = []
+    member = SUBCOLLECTION.match(uri)
+    if member:                                             # a member references its pool, and as pool members do
+        uri = member.group(1)
+        referenced.append((uri, bare_name(member.group(2))))
+        body = dict(members=[body])
+
+    for collection, key, target, name_of in REFERENCES:
+        if not uri.startswith(collection) or not body.get(key):
+            continue
+        values = body[key] if isinstance(body[key], list) else str(body[key]).split(" and ")
+        for value in values:
+            name = value.get("name") if isinstance(value, dict) else value
+            if name:
+                name = name.strip()
+                referenced.append((target, bare_name(name_of(name) if name_of else name)))
+    return referenced
+
+
+def plan_levels(items):
+    """ Return a list of levels, each a list of indexes of items, such that the items of a level only reference
+        objects created or modified by items of previous levels. An item which modifies an object specified by
+        a previous item follows it. References to objects which are not in the items are ignored. DELETE items
+        are each a level of their own, last, in the order specified. Also return the dependencies of each item.
+        Raise ValueError if items depend on each other, they cannot be ordered.
+    """
+    objects = dict()                                       # name: [(collection, index)] of the objects of the items
+    depends = dict()
+    deletes = []
+    for index, (uri, body, method) in enumerate(items):
+        depends[index] = set()
+        if method == "DELETE":
+            deletes.append(index)
+            continue
+        key = identity(uri, body, method)
+        if key:
+            for collection, earlier in objects.get(key[1], []):
+                if collection == key[0]:
+                    depends[index].add(earlier)            # the same object, specified again
+            objects.setdefault(key[1], []).append((key[0], index))
+
+    for index, (uri, body, method) in enumerate(items):
+        if method == "DELETE":
+            continue
+        for target, name in references(uri, body, method):
+            for collection, other in objects.get(name, []):
+                if collection.startswith(target) and other != index:
+                    depends[index].add(other)
+
+    level = dict()
+    remaining = [index for index in range(len(items)) if index not in deletes]
+    while remaining:
+        ready = [index for index in remaining if all(other in level for other in depends[index])]
+        if not ready:
+            raise ValueError("items %s depend on each other" % ", ".join(str(index) for index in cycle(remaining, depends)))
+        for index in ready:
+            level[index] = 1 + max([level[other] for other in depends[index] if other in level] or [-1])
+        remaining = [index for index in remaining if index not in level]
+
+    levels = [[] for _ in range(1 + max(level.values() or [-1]))]
+    for index in sorted(level):
+        levels[level[index]].append(index)
+    return levels + [[index] for index in deletes], depends
+
+
+def cycle(remaining, depends):
+    " Return the items of remaining in a cycle, less those which only depend on the cycle"
+    remaining = set(remaining)
+    while True:
+        needed = set(other for index in remaining for other in depends[index])
+        if remaining <= needed:
+            return sorted(remaining)
+        remaining &= needed
+
+
+def apply_plan(F5, items, concurrency=1, strategy="check", existing=None):
+    """ Apply the items level by level, the items of each level concurrently. An item which references an object
+        of an item which failed is not applied. Return the results in the order of the items, and a summary of
+        the plan, the number of items and elapsed time of each level.
+    """
+    levels, depends = plan_levels(items)
+    results = [None] * len(items)
+    summary = dict(levels=len(levels), widths=[len(level) for level in levels], elapsed=[])
+    for level in levels:
+        start = time.time()
+        ready = []
+        for index in level:
+            failed = [other for other in depends[index] if results[other]["failed"]]
+            if failed:
+                uri, body, method = items[index]
+                results[index] = dict(uri=uri, method=method, changed=False, failed=True, round_trips=0,
+                                      msg="not applied, item %s failed" % ", ".join(str(other) for other in failed))
+            else:
+                ready.append(index)
+        for index, result in zip(ready, apply_items(F5, [items[index] for index in ready], concurrency=concurrency,
+                                                    strategy=strategy, existing=existing)):
+            results[index] = result
+        summary["elapsed"].append(round(time.time() - start, 3))
+    return results, summary
+
+
+def apply_transaction(F5, items, validate=True, strategy="check", existing=None):
+    """ Queue the items in a transaction and commit them at once. The items are queued in order, as the
+        BIG_IP evaluates the commands in the order they were added. If any item cannot be queued, the
+        transaction is discarded. When no request was queued, as diff found nothing to change, no
+        transaction is opened or committed. Return a tuple of (results, summary of the transaction).
+    """
+    summary = dict(committed=False, validated=validate, commit_latency=None, queued=0)
+    transaction = F5.begin_transaction()
+    if strategy == "optimistic":                           # a queued POST is never rejected with a 409
+        strategy = "check"
+    results = apply_items(F5, items, strategy=strategy, existing=existing)
+    summary.update(id=transaction.id, queued=transaction.queued)
+    if any(result["failed"] for result in results):
+        if transaction.id is not None:
+            F5.abort_transaction()
+        F5.transaction = None
+        summary["msg"] = "transaction discarded, not all items could be queued"
+        return results, summary
+    if transaction.id is None:
+        F5.transaction = None
+        return results, summary
+
+    summary["committed"] = F5.commit_transaction(validate=validate)
+    summary["commit_latency"] = F5.commit_latency
+    if not summary["committed"]:
+        summary["msg"] = "%s %s" % (F5.status_code, F5.response)
+    return results, summary
@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+#
+"""
+     Copyright (c) 2026 World Wide Technology, Inc.
+     All rights reserved.
+
+     Revision history:
+     17 October 2026  |  1.0 - initial release
+
+     Tests of the reconciliation of nodes by F5_sdk_LTM_node.py, with the REST backend, against
+     benchmarks/mock_icontrol.py.
+
+     usage:
+       python -m pytest tests
+"""
+
+import os
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+import mock_icontrol
+from F5_sdk_LTM_node import REST_LTM
+from module_utils.icontrol_config import BIG_IP
+
+DESCRIPTION = "updated by F5_sdk_LTM_node"
+
+
+class Device(BIG_IP):
+    TRANSPORT = "http://"                                  # the mock is served without TLS
+
+
+class TestReconcile(unittest.TestCase):
+
+    def setUp(self):
+        self.bigip = mock_icontrol.MockBigIP()
+        self.server = mock_icontrol.serve(self.bigip)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def reconcile(self, nodes, state="present"):
+        device = Device(host="127.0.0.1:%s" % self.server.server_port, username="admin", password="admin")
+        ltm = REST_LTM(device, None, "Common")
+        results = ltm.reconcile_nodes(nodes, state, description=DESCRIPTION)
+        self.assertFalse(ltm.failure(), ltm.get_response())
+        return results
+
+    def node(self, name):
+        return self.bigip.collections["/mgmt/tm/ltm/node"][name]
+
+    def test_create(self):
+        self.reconcile([{"name": "a", "address": "192.0.2.1"},
+                        {"name": "b", "address": "192.0.2.2", "description": "web server"}])
+        self.assertEqual(self.node("a")["description"], DESCRIPTION)
+        self.assertEqual(self.node("b")["description"], "web server")
+
+    def test_description_case(self):
+        self.reconcile([{"name": "b", "address": "192.0.2.2", "description": "web server"}])
+        results = self.reconcile([{"name": "b", "address": "192.0.2.2", "description": "Web Server"}])
+        self.assertEqual(results[0]["action"], "update")
+        self.assertEqual(self.node("b")["description"], "Web Server")
+
+    def test_partition(self):
+        results = self.reconcile([{"name": "c", "address": "192.0.2.3", "partition": "Tenant"},
+                                  {"name": "d", "address": "192.0.2.4"}])
+        self.assertEqual([result["action"] for result in results], ["create", "create"])
+        self.assertEqual(self.node("c")["partition"], "Tenant")
+        results = self.reconcile([{"name": "c", "address": "192.0.2.3", "partition": "Tenant"}], state="absent")
+        self.assertEqual(results[0]["action"], "delete")
+        self.assertNotIn("c", self.bigip.collections["/mgmt/tm/ltm/node"])
+
+    def test_invalid_partition(self):
+        device = Device(host="127.0.0.1:%s" % self.server.server_port, username="admin", password="admin")
+        ltm = REST_LTM(device, None, "Common")
+        self.assertEqual(ltm.reconcile_nodes([{"name": "e", "address": "192.0.2.5", "partition": "/Common"}], "present"), [])
+        self.assertTrue(ltm.failure())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+#
+"""
+     Copyright (c) 2026 World Wide Technology, Inc.
+     All rights reserved.
+
+     Revision history:
+     17 October 2026  |  1.0 - initial release
+
+     Tests of the reload of bigip_check.py against benchmarks/mock_icontrol.py, which keeps answering
+     for a moment after the reboot command, as a BIG_IP does while it shuts down.
+
+     usage:
+       python -m pytest tests
+"""
+
+import os
+import sys
+import time
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+import mock_icontrol
+from bigip_check import check_device
+from module_utils.icontrol_client import Client, Retry
+
+
+class Device(Client):
+    TRANSPORT = "http://"                                  # the mock is served without TLS
+
+
+class TestReload(unittest.TestCase):
+
+    def setUp(self):
+        self.bigip = mock_icontrol.MockBigIP(boot_time=0.6, reboot_delay=0.4)
+        self.server = mock_icontrol.serve(self.bigip)
+        self.device = Device(host="127.0.0.1:%s" % self.server.server_port, username="admin", password="admin",
+                             retry=Retry(deadline=0.2))    # as main, retries end before the next poll
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_ready_after_reboot(self):
+        result = check_device(self.device, reload=True, timeout=10, interval=0.2, min_interval=0.05)
+        self.assertTrue(result["ready"], result.get("msg"))
+        self.assertGreaterEqual(time.time(), self.bigip.rebooted + self.bigip.reboot_delay + self.bigip.boot_time)
+        self.assertGreaterEqual(result["reload_elapsed"], self.bigip.reboot_delay)
+
+    def test_reboot_not_begun(self):
+        self.bigip.reboot_delay = 60
+        result = check_device(self.device, reload=True, timeout=0.5, interval=0.2, min_interval=0.05)
+        self.assertFalse(result["ready"])
+        self.assertEqual(result["msg"], "Device did not begin to reload")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+#
+"""
+     Copyright (c) 2026 World Wide Technology, Inc.
+     All rights reserved.
+
+     Revision history:
+     17 October 2026  |  1.0 - initial release
+
+     Tests of module_utils/icontrol_client.py against benchmarks/mock_icontrol.py served over HTTPS,
+     using a self-signed certificate created by openssl.
+
+     usage:
+       python -m pytest tests
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+import mock_icontrol
+from module_utils.icontrol_client import Client, TokenCache
+
+
+def self_signed(directory):
+    " Create a self-signed certificate and key in the directory, return their paths"
+    certfile = os.path.join(directory, "cert.pem")
+    keyfile = os.path.join(directory, "key.pem")
+    subprocess.check_call(["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+                           "-subj", "/CN=127.0.0.1", "-keyout", keyfile, "-out", certfile],
+                          stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    return certfile, keyfile
+
+
+@unittest.skipUnless(shutil.which("openssl"), "openssl is required to create a certificate")
+class TestCABundle(unittest.TestCase):
+    " The certificate of the BIG_IP is not verified, even when the environment names a CA bundle"
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        certfile, keyfile = self_signed(self.directory)
+        self.server = mock_icontrol.serve(mock_icontrol.MockBigIP(), certfile=certfile, keyfile=keyfile)
+        self.host = "127.0.0.1:%s" % self.server.server_port
+        self.environ = dict(os.environ)
+        bundle = self_signed(tempfile.mkdtemp(dir=self.directory))[0]
+        os.environ["REQUESTS_CA_BUNDLE"] = bundle          # a bundle which does not sign the certificate
+        os.environ["CURL_CA_BUNDLE"] = bundle
+
+    def tearDown(self):
+        os.environ.clear()
+        os.environ.update(self.environ)
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.directory)
+
+    def test_request(self):
+        bigip = Client(host=self.host, username="admin", password="admin")
+        self.assertEqual(bigip.request("GET", "/mgmt/tm/ltm/node"), 200)
+
+    def test_token(self):
+        cache = TokenCache(os.path.join(self.directory, "tokens"))
+        bigip = Client(host=self.host, username="admin", password="admin", token_cache=cache)
+        bigip.authenticate()
+        self.assertTrue(bigip.token)
+        self.assertEqual(bigip.request("GET", "/mgmt/tm/ltm/node"), 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
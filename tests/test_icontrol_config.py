@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+#
+"""
+     Copyright (c) 2026 World Wide Technology, Inc.
+     All rights reserved.
+
+     Revision history:
+     17 October 2026  |  1.0 - initial release
+     17 October 2026  |  1.1 - tests of normalize_item, round_trip_summary and differences
+
+     Tests of the items, comparison and dependency planner of module_utils/icontrol_config.py, no BIG_IP is required.
+
+     usage:
+       python -m pytest tests
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from module_utils.icontrol_config import plan_levels, apply_plan, normalize_item, round_trip_summary, differences
+
+# A member b:80 of pool a, and a member a of pool b:80, each references the other
+CYCLE = [("/mgmt/tm/ltm/pool/a/members", '{"name": "b:80"}', "POST"),
+         ("/mgmt/tm/ltm/pool/b:80/members", '{"name": "a"}', "POST"),
+         ("/mgmt/tm/ltm/virtual", '{"name": "v", "pool": "a"}', "POST")]
+
+
+class Unreachable(object):
+    " A BIG_IP which fails the test if any item is applied"
+    def spawn(self, uri, method):
+        raise AssertionError("%s %s applied" % (method, uri))
+
+
+class TestItems(unittest.TestCase):
+
+    def test_shapes(self):
+        uri = "/mgmt/tm/ltm/node"
+        self.assertEqual(normalize_item({"name": "n"}, uri, "POST"), (uri, '{"name": "n"}', "POST"))
+        self.assertEqual(normalize_item([uri, {"name": "n"}], None, "POST"), (uri, '{"name": "n"}', "POST"))
+        self.assertEqual(normalize_item([uri, None, "delete"], None, "POST"), (uri, None, "DELETE"))
+        self.assertEqual(normalize_item({"uri": uri, "method": "patch"}, None, "POST"), (uri, "{}", "PATCH"))
+
+    def test_invalid(self):
+        for item in ([], ["/mgmt/tm/ltm/node"], ["/mgmt/tm/ltm/node", {}, "POST", 1],
+                     ["/mgmt/tm/ltm/node", {}, 1], {"uri": "/mgmt/tm/ltm/node", "method": None}):
+            with self.assertRaises(ValueError):
+                normalize_item(item, None, "POST")
+
+
+class TestDifferences(unittest.TestCase):
+
+    CURRENT = {"name": "web", "partition": "Common", "description": "web server", "pool": "/Common/p", "port": 80,
+               "enabled": True, "state": "enabled", "rules": ["/Common/r1", "/Common/r2"],
+               "profiles": [{"name": "tcp", "partition": "Common"}, {"name": "http", "partition": "Common"}]}
+
+    def test_equal(self):
+        desired = {"pool": "p", "port": "80", "enabled": "true", "state": "Enabled", "rules": ["r2", "/Common/r1"],
+                   "profiles": [{"name": "/Common/http"}, {"name": "tcp"}], "fallbackPersistence": ""}
+        self.assertEqual(differences(desired, self.CURRENT), {})
+
+    def test_case_of_text(self):
+        desired = {"description": "Web Server"}
+        self.assertEqual(differences(desired, self.CURRENT), desired)
+
+    def test_partition_of_text(self):
+        current = dict(self.CURRENT, description="x")
+        desired = {"description": "/Common/x"}
+        self.assertEqual(differences(desired, current), desired)
+
+    def test_changed(self):
+        desired = {"pool": "/Other/p", "rules": ["r1"], "state": "disabled", "connectionLimit": 10}
+        self.assertEqual(differences(desired, self.CURRENT), desired)
+
+
+class TestRoundTrips(unittest.TestCase):
+
+    def test_check(self):
+        results = [dict(method="POST", round_trips=2, changed=True), dict(method="PATCH", round_trips=1, changed=True)]
+        self.assertEqual(round_trip_summary(results), dict(total=3, saved=0))
+
+    def test_diff(self):
+        " update_config issues a GET and a PATCH only if a field differs"
+        results = [dict(method="PATCH", round_trips=2, changed=True), dict(method="PATCH", round_trips=1, changed=False),
+                   dict(method="POST", round_trips=1, changed=False)]
+        self.assertEqual(round_trip_summary(results, diff=True), dict(total=4, saved=0))
+        self.assertEqual(round_trip_summary(results, prefetch=1, diff=True), dict(total=5, saved=-1))
+
+
+class TestPlan(unittest.TestCase):
+
+    def test_levels(self):
+        items = [("/mgmt/tm/ltm/virtual", '{"name": "v", "pool": "p"}', "POST"),
+                 ("/mgmt/tm/ltm/pool", '{"name": "p", "members": ["n:80"]}', "POST"),
+                 ("/mgmt/tm/ltm/node", '{"name": "n", "address": "192.0.2.1"}', "POST"),
+                 ("/mgmt/tm/ltm/node/old", None, "DELETE")]
+        levels, depends = plan_levels(items)
+        self.assertEqual(levels, [[2], [1], [0], [3]])
+        self.assertEqual(depends[0], set([1]))
+
+    def test_cycle(self):
+        with self.assertRaises(ValueError) as raised:
+            plan_levels(CYCLE)
+        self.assertEqual(str(raised.exception), "items 0, 1 depend on each other")
+
+    def test_cycle_not_applied(self):
+        with self.assertRaises(ValueError):
+            apply_plan(Unreachable(), CYCLE)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+#
+"""
+     Copyright (c) 2026 World Wide Technology, Inc.
+     All rights reserved.
+
+     Revision history:
+     17 October 2026  |  1.0 - initial release
+     17 October 2026  |  1.1 - the requests of the fact cache, against benchmarks/mock_icontrol.py
+
+     Tests of the schedule of the requests and the fact cache of icontrol_gather_facts.py, no BIG_IP is required.
+
+     usage:
+       python -m pytest tests
+"""
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+import mock_icontrol
+from icontrol_gather_facts import Schedule, Connection, FactCache, cached_facts
+
+
+class Device(Connection):
+    TRANSPORT = "http://"                                  # the mock is served without TLS
+
+
+class TestSchedule(unittest.TestCase):
+
+    def test_round_robin(self):
+        schedule = Schedule(["a", "b"], ["x", "y"], 2)
+        self.assertEqual([schedule.take() for _ in range(4)], [("a", "x"), ("b", "x"), ("a", "y"), ("b", "y")])
+        self.assertEqual(schedule.take(), None)
+
+    def test_busy_host_skipped(self):
+        schedule = Schedule(["a", "b"], ["x", "y", "z"], 1)
+        self.assertEqual(schedule.take(), ("a", "x"))
+        self.assertEqual(schedule.take(), ("b", "x"))
+        schedule.done("b")
+        self.assertEqual(schedule.take(), ("b", "y"))      # a is still busy
+        schedule.done("a")
+        self.assertEqual(schedule.take(), ("a", "y"))
+
+
+class TestFactCache(unittest.TestCase):
+    " Pages of 3 of 7 nodes, each collection read costs 3 requests"
+
+    def setUp(self):
+        self.bigip = mock_icontrol.MockBigIP(page_limit=3)
+        self.server = mock_icontrol.serve(self.bigip)
+        self.directory = tempfile.mkdtemp()
+        self.cache = FactCache(os.path.join(self.directory, "facts"), ttl=0)
+        device = self.device()
+        for number in range(7):
+            device.request("POST", "/mgmt/tm/ltm/node", json.dumps({"name": "n%d" % number,
+                                                                    "address": "192.0.2.%d" % number}))
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.directory)
+
+    def device(self):
+        return Device(host="127.0.0.1:%s" % self.server.server_port, username="admin", password="admin")
+
+    def facts(self, query=None):
+        " Return the outcome of cached_facts, the requests it issued and the items"
+        requests = self.bigip.requests
+        code, result = cached_facts(self.device(), self.cache, "/mgmt/tm/ltm/node", query=query)
+        self.assertEqual(code, 200)
+        return result["cache"], self.bigip.requests - requests, result["ansible_facts"]["bigip_items"]
+
+    def test_requests(self):
+        self.assertEqual(self.facts()[:2], ("miss", 3))    # no signature is requested without an entry
+        self.assertEqual(self.facts()[:2], ("revalidated", 3))
+        self.device().request("PATCH", "/mgmt/tm/ltm/node/n1", json.dumps({"description": "x"}))
+        self.assertEqual(self.facts()[:2], ("miss", 6))
+
+    def test_select(self):
+        query = {"$select": "name,address"}
+        outcome, requests, items = self.facts(query)
+        self.assertEqual(sorted(items[0]), ["address", "name"])
+        self.assertEqual(self.facts(query)[:2], ("revalidated", 3))
+
+
+if __name__ == '__main__':
+    unittest.main()